@@ -4,7 +4,7 @@ import base64
 import time
 import threading
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text
+from sqlalchemy import create_engine, event, make_url, Column, Integer, String, DateTime, Text
 from sqlalchemy.ext.declarative import declarative_base
 from contextlib import contextmanager
 from sqlalchemy.orm import sessionmaker, scoped_session
@@ -14,6 +14,11 @@ import openai
 from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
 
+try:
+    import orjson
+except ImportError:  # optional C-accelerated JSON; stdlib json is the fallback
+    orjson = None
+
 # Load environment variables (prefer .env but do not override existing shell vars)
 load_dotenv(override=False)
 
@@ -51,11 +56,54 @@ FALLBACK_DB_URI = env_first(
     f"sqlite:///{(PROJECT_ROOT / 'd_ai_trader.sqlite3')}"
 )
 
+# Rows pulled per network round-trip by fetchmany()/server-side cursor iteration
+DB_FETCH_ARRAYSIZE = int(env_first("DB_FETCH_ARRAYSIZE", "500"))
+
+
+def _set_fetch_arraysize(conn, cursor, statement, parameters, context, executemany):
+    """Let batched fetches pull DB_FETCH_ARRAYSIZE rows per trip instead of the driver's 1."""
+    cursor.arraysize = DB_FETCH_ARRAYSIZE
+    if hasattr(cursor, "itersize"):
+        # psycopg2 named (server-side) cursors iterate in itersize chunks
+        cursor.itersize = DB_FETCH_ARRAYSIZE
+
+
+# Postgres connection pool, sized for the dashboard's threaded Flask server plus
+# the agents' background threads. LIFO checkout keeps the warmest connections busy
+# and lets idle extras age out via pool_recycle.
+DB_POOL_OPTIONS = {
+    "pool_size": int(env_first("DB_POOL_SIZE", "20")),
+    "max_overflow": int(env_first("DB_MAX_OVERFLOW", "30")),
+    "pool_timeout": float(env_first("DB_POOL_TIMEOUT", "5")),
+    "pool_recycle": int(env_first("DB_POOL_RECYCLE", "1800")),
+    "pool_use_lifo": True,
+}
+
+# psycopg2 only: besides the default multi-VALUES INSERT batching, send
+# executemany() UPDATE/DELETE statements through execute_batch pages rather than
+# one round trip per parameter set.
+DB_PSYCOPG2_OPTIONS = {
+    "executemany_mode": "values_plus_batch",
+}
+if orjson is not None:
+    # The dialect registers this as each connection's json/jsonb typecaster, so
+    # JSONB columns (summaries.data, trade_decisions.data, ...) decode via orjson.
+    DB_PSYCOPG2_OPTIONS["json_deserializer"] = orjson.loads
+
+
 def _create_engine():
     """Create the primary engine, falling back to SQLite if Postgres is unavailable."""
     if DEFAULT_DB_URI:
         try:
-            primary_engine = create_engine(DEFAULT_DB_URI, pool_pre_ping=True)
+            engine_options = {}
+            if DEFAULT_DB_URI.startswith("postgresql"):
+                engine_options.update(DB_POOL_OPTIONS)
+                # A bare postgresql:// URI resolves to psycopg2 or psycopg depending
+                # on the SQLAlchemy release, so ask the dialect.
+                if make_url(DEFAULT_DB_URI).get_dialect().driver == "psycopg2":
+                    engine_options.update(DB_PSYCOPG2_OPTIONS)
+            primary_engine = create_engine(DEFAULT_DB_URI, pool_pre_ping=True, **engine_options)
+            event.listen(primary_engine, "before_cursor_execute", _set_fetch_arraysize)
             # Force an early connection so failures happen on startup instead of mid-run
             with primary_engine.connect() as conn:
                 conn.execute(text("SELECT 1"))
@@ -65,6 +113,7 @@ def _create_engine():
             print(f"⚠️  Failed to connect to primary database '{DEFAULT_DB_URI}': {exc}")
             print(f"   ➜ Falling back to local SQLite database at {FALLBACK_DB_URI}")
     fallback_engine = create_engine(FALLBACK_DB_URI, pool_pre_ping=True)
+    event.listen(fallback_engine, "before_cursor_execute", _set_fetch_arraysize)
     print(f"🗄️  Using fallback database: {FALLBACK_DB_URI}")
     return fallback_engine
 
@@ -32,7 +32,7 @@ import logging
 import threading
 from datetime import datetime, timedelta
 import pytz
-from sqlalchemy import text
+from sqlalchemy import text, bindparam, String, DateTime
 from config import engine, PromptManager, session, openai, get_trading_mode, get_current_config_hash
 from feedback_agent import TradeOutcomeTracker
 from trading_interface import trading_interface
@@ -80,6 +80,9 @@ SUMMARIZER_START_TIME = "08:25"
 SUMMARIZER_END_TIME = "17:25"
 WEEKEND_SUMMARIZER_TIME = "15:00"  # 3pm ET
 
+# Rows fetched per server-side cursor round-trip when draining the summary backlog
+SUMMARY_STREAM_BATCH_SIZE = int(os.environ.get('DAI_SUMMARY_BATCH_SIZE', '500'))
+
 _MANUAL_DECIDER_SKIP_DEADLINE = None
 _MANUAL_DECIDER_SKIP_LOCK = threading.Lock()
 
@@ -108,14 +111,102 @@ class DAITraderOrchestrator:
     def __init__(self):
         self.prompt_manager = PromptManager(client=openai, session=session)
         self.last_processed_summary_id = None
+        self._prepare_statements()
         self.initialize_database()
         self._market_open_run_date = None
         self._startup_cycle_completed = False
-        self._startup_date_et = datetime.now(EASTERN_TIMEZONE).date()
-        self._startup_time_et = datetime.now(EASTERN_TIMEZONE)
+        self._startup_time_et = self._now_eastern()
+        self._startup_date_et = self._startup_time_et.date()
         self._cadence_minutes = int(os.environ.get('DAI_CADENCE_MINUTES', '180'))
         self._next_cadence_run_et = None
+        # (date, config_hash) -> True once feedback is known to have completed that day
+        self._feedback_ran_for = {}
         
+    def _prepare_statements(self):
+        """Build the hot-path SQL once so every call reuses the same compiled statement"""
+        self._stmt_unprocessed = text("""
+            SELECT s.id, s.agent, s.timestamp, s.run_id, s.data
+            FROM summaries s
+            LEFT JOIN processed_summaries ps ON s.id = ps.summary_id AND ps.processed_by = 'decider'
+            WHERE ps.summary_id IS NULL AND s.config_hash = :config_hash
+            ORDER BY s.timestamp ASC
+        """).bindparams(bindparam('config_hash', type_=String))
+        self._stmt_latest_unprocessed_run_id = text("""
+            SELECT s.run_id
+            FROM summaries s
+            LEFT JOIN processed_summaries ps ON s.id = ps.summary_id AND ps.processed_by = 'decider'
+            WHERE ps.summary_id IS NULL AND s.config_hash = :config_hash AND s.run_id IS NOT NULL
+            ORDER BY s.timestamp DESC NULLS LAST
+            LIMIT 1
+        """).bindparams(bindparam('config_hash', type_=String))
+        self._stmt_latest_run_id = text("""
+            SELECT run_id 
+            FROM summaries 
+            WHERE config_hash = :config_hash
+            ORDER BY timestamp DESC 
+            LIMIT 1
+        """).bindparams(bindparam('config_hash', type_=String))
+        self._stmt_run_summaries = text("""
+            SELECT s.id, s.agent, s.timestamp, s.run_id, s.data
+            FROM summaries s
+            WHERE s.run_id = :run_id
+              AND s.config_hash = :config_hash
+            ORDER BY s.timestamp DESC
+        """).bindparams(bindparam('run_id', type_=String), bindparam('config_hash', type_=String))
+        self._stmt_mark_processed = text("""
+            INSERT INTO processed_summaries (summary_id, processed_by, run_id)
+            VALUES (:summary_id, :processed_by, :run_id)
+            ON CONFLICT (summary_id, processed_by) DO NOTHING
+        """).bindparams(bindparam('processed_by', type_=String), bindparam('run_id', type_=String))
+        self._stmt_run_start = text("""
+            INSERT INTO system_runs (run_type, details)
+            VALUES (:run_type, :details)
+        """).bindparams(bindparam('run_type', type_=String), bindparam('details', type_=String))
+        self._stmt_run_finish = text("""
+            UPDATE system_runs 
+            SET end_time = CURRENT_TIMESTAMP, status = :status
+            WHERE run_type = :run_type AND details->>'run_id' = :run_id
+        """).bindparams(
+            bindparam('status', type_=String),
+            bindparam('run_type', type_=String),
+            bindparam('run_id', type_=String),
+        )
+        self._stmt_feedback_ran_today = text("""
+            SELECT COUNT(*) as count
+            FROM system_runs 
+            WHERE run_type = 'feedback' 
+            AND start_time >= CURRENT_DATE
+            AND status = 'completed'
+            AND details->>'config_hash' = :config_hash
+        """).bindparams(bindparam('config_hash', type_=String))
+        self._stmt_active_config_hashes = text("""
+            SELECT DISTINCT config_hash
+            FROM (
+                -- Configs with trade decisions
+                SELECT config_hash FROM trade_decisions 
+                WHERE timestamp >= :cutoff AND config_hash IS NOT NULL
+                
+                UNION ALL
+                
+                -- Configs with recent summaries (shows active usage)
+                SELECT config_hash FROM summaries 
+                WHERE timestamp >= :cutoff AND config_hash IS NOT NULL
+                
+                UNION ALL
+                
+                -- Configs that were recently used (from run_configurations)
+                SELECT config_hash FROM run_configurations 
+                WHERE last_used >= :cutoff
+            ) AS active_configs
+            ORDER BY config_hash
+        """).bindparams(bindparam('cutoff', type_=DateTime))
+        self._stmt_summarizer_ran_today = text("""
+            SELECT COUNT(*) AS count
+            FROM system_runs
+            WHERE run_type = 'summarizer'
+              AND start_time >= CURRENT_DATE
+        """)
+    
     def initialize_database(self):
         """Initialize database tables for tracking processed summaries"""
         with engine.begin() as conn:
@@ -128,6 +219,20 @@ class DAITraderOrchestrator:
                     run_id TEXT
                 )
             """))
+            # One marker per (summary, agent) so retried runs can re-mark freely;
+            # drop duplicates left by earlier retries before the index first lands
+            if conn.execute(text("SELECT to_regclass('uq_processed_summaries')")).scalar() is None:
+                conn.execute(text("""
+                    DELETE FROM processed_summaries a
+                    USING processed_summaries b
+                    WHERE a.summary_id = b.summary_id
+                      AND a.processed_by = b.processed_by
+                      AND a.id > b.id
+                """))
+            conn.execute(text("""
+                CREATE UNIQUE INDEX IF NOT EXISTS uq_processed_summaries
+                ON processed_summaries(summary_id, processed_by)
+            """))
             
             conn.execute(text("""
                 CREATE TABLE IF NOT EXISTS system_runs (
@@ -140,15 +245,17 @@ class DAITraderOrchestrator:
                 )
             """))
     
+    def _now_eastern(self):
+        """Current time in US/Eastern; the single clock read used by every schedule gate"""
+        return MarketClock.now_eastern()
+    
     def is_market_open(self):
         """Check if the market is currently open (M-F, 9:30am-4pm ET)"""
         return MarketClock.is_market_open()
     
     def is_summarizer_time(self):
         """Check if it's time to run summarizers"""
-        # Get current time in local tz, convert to Eastern for time checks
-        now_local = datetime.now(LOCAL_TIMEZONE)
-        now_eastern = now_local.astimezone(EASTERN_TIMEZONE)
+        now_eastern = self._now_eastern()
         
         # Weekday summarizer hours (8:25am-5:25pm ET)
         if now_eastern.weekday() < 5:  # Monday to Friday
@@ -171,8 +278,7 @@ class DAITraderOrchestrator:
     
     def is_feedback_time(self):
         """Check if it's time to run feedback (weekly: Thursday night, post-close)."""
-        now_local = datetime.now(LOCAL_TIMEZONE)
-        now_eastern = now_local.astimezone(EASTERN_TIMEZONE)
+        now_eastern = self._now_eastern()
         
         # Weekly cadence: Thursday nights after close
         if now_eastern.weekday() != 3:  # 0=Mon, 3=Thu
@@ -191,40 +297,75 @@ class DAITraderOrchestrator:
         """Check if feedback agent already ran today for this configuration"""
         try:
             from config import engine, get_current_config_hash
-            from sqlalchemy import text
             
             config_hash = get_current_config_hash()
+            cache_key = (datetime.now().date(), config_hash)
+            if self._feedback_ran_for.get(cache_key):
+                return True
             
             with engine.connect() as conn:
-                result = conn.execute(text("""
-                    SELECT COUNT(*) as count
-                    FROM system_runs 
-                    WHERE run_type = 'feedback' 
-                    AND start_time >= CURRENT_DATE
-                    AND status = 'completed'
-                    AND details->>'config_hash' = :config_hash
-                """), {"config_hash": config_hash}).fetchone()
+                result = conn.execute(self._stmt_feedback_ran_today, {"config_hash": config_hash}).fetchone()
                 
+                if result.count > 0:
+                    self._feedback_ran_for[cache_key] = True
                 return result.count > 0
         except Exception as e:
             logger.warning(f"Could not check if feedback ran today: {e}")
             return False  # If we can't check, allow it to run
     
-    def get_unprocessed_summaries(self):
-        """Get all summaries that haven't been processed by the decider yet"""
+    def iter_unprocessed_summary_batches(self, batch_size=SUMMARY_STREAM_BATCH_SIZE):
+        """Yield unprocessed summaries (oldest first) in chunks of ``batch_size``.
+
+        Rows come from a server-side cursor, so a large backlog (e.g. after an
+        outage) is never pulled into memory all at once.
+        """
         from config import get_current_config_hash
         config_hash = get_current_config_hash()
         
         with engine.connect() as conn:
             # Get all summaries that haven't been processed (filtered by config_hash)
-            result = conn.execute(text("""
-                SELECT s.id, s.agent, s.timestamp, s.run_id, s.data
-                FROM summaries s
-                LEFT JOIN processed_summaries ps ON s.id = ps.summary_id AND ps.processed_by = 'decider'
-                WHERE ps.summary_id IS NULL AND s.config_hash = :config_hash
-                ORDER BY s.timestamp ASC
-            """), {"config_hash": config_hash})
-            return [row._mapping for row in result]
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+                self._stmt_unprocessed, {"config_hash": config_hash}
+            )
+            for partition in result.mappings().partitions():
+                yield partition
+    
+    def get_unprocessed_summaries(self):
+        """Get all summaries that haven't been processed by the decider yet"""
+        summaries = []
+        for batch in self.iter_unprocessed_summary_batches():
+            summaries.extend(batch)
+        return summaries
+    
+    def _collect_latest_unprocessed_run(self):
+        """
+        Drain the unprocessed backlog, keeping only the latest summarizer run in memory.
+        
+        The target run is the run_id of the newest unprocessed summary that has one;
+        when no summary carries a run_id, every unprocessed summary is returned.
+        Returns ``(summaries, superseded_ids)``: the ids of older runs' summaries are
+        only collected here, and the caller marks them processed together with the
+        target run once the decider has succeeded.
+        """
+        from config import get_current_config_hash
+        with engine.connect() as conn:
+            target_row = conn.execute(
+                self._stmt_latest_unprocessed_run_id, {"config_hash": get_current_config_hash()}
+            ).fetchone()
+        target_run_id = target_row.run_id if target_row else None
+        
+        summaries = []
+        superseded_ids = []
+        for batch in self.iter_unprocessed_summary_batches():
+            for summary in batch:
+                if target_run_id is None or summary.get('run_id') == target_run_id:
+                    summaries.append(summary)
+                else:
+                    superseded_ids.append(summary['id'])
+        
+        if superseded_ids:
+            logger.info(f"Skipping {len(superseded_ids)} unprocessed summaries from superseded runs")
+        return summaries, superseded_ids
     
     def get_recent_summaries(self, hours_back=6):
         """Get summaries from the latest run (processed or not)"""
@@ -233,13 +374,7 @@ class DAITraderOrchestrator:
         
         with engine.connect() as conn:
             # First, get the latest run_id
-            latest_run_result = conn.execute(text("""
-                SELECT run_id 
-                FROM summaries 
-                WHERE config_hash = :config_hash
-                ORDER BY timestamp DESC 
-                LIMIT 1
-            """), {"config_hash": config_hash})
+            latest_run_result = conn.execute(self._stmt_latest_run_id, {"config_hash": config_hash})
             
             latest_run_row = latest_run_result.fetchone()
             if not latest_run_row:
@@ -248,27 +383,19 @@ class DAITraderOrchestrator:
             latest_run_id = latest_run_row.run_id
             
             # Get all summaries from the latest run
-            result = conn.execute(text("""
-                SELECT s.id, s.agent, s.timestamp, s.run_id, s.data
-                FROM summaries s
-                WHERE s.run_id = :run_id
-                  AND s.config_hash = :config_hash
-                ORDER BY s.timestamp DESC
-            """), {"run_id": latest_run_id, "config_hash": config_hash})
-            return [row._mapping for row in result]
+            result = conn.execute(self._stmt_run_summaries, {"run_id": latest_run_id, "config_hash": config_hash})
+            return result.mappings().all()
     
     def mark_summaries_processed(self, summary_ids, processed_by):
-        """Mark summaries as processed"""
+        """Mark summaries as processed (idempotent: already-marked rows are skipped)"""
+        if not summary_ids:
+            return
+        run_id = datetime.now().strftime("%Y%m%dT%H%M%S")
         with engine.begin() as conn:
-            for summary_id in summary_ids:
-                conn.execute(text("""
-                    INSERT INTO processed_summaries (summary_id, processed_by, run_id)
-                    VALUES (:summary_id, :processed_by, :run_id)
-                """), {
-                    "summary_id": summary_id,
-                    "processed_by": processed_by,
-                    "run_id": datetime.now().strftime("%Y%m%dT%H%M%S")
-                })
+            conn.execute(self._stmt_mark_processed, [
+                {"summary_id": summary_id, "processed_by": processed_by, "run_id": run_id}
+                for summary_id in summary_ids
+            ])
     
     def run_summarizer_agents(self):
         """Run the summarizer agents"""
@@ -280,10 +407,8 @@ class DAITraderOrchestrator:
         try:
             # Record run start
             with engine.begin() as conn:
-                conn.execute(text("""
-                    INSERT INTO system_runs (run_type, details)
-                    VALUES ('summarizer', :details)
-                """), {
+                conn.execute(self._stmt_run_start, {
+                    "run_type": "summarizer",
                     "details": json.dumps({"run_id": internal_run_id, "timestamp": datetime.now().isoformat()})
                 })
             
@@ -297,21 +422,17 @@ class DAITraderOrchestrator:
             
             # Update run status
             with engine.begin() as conn:
-                conn.execute(text("""
-                    UPDATE system_runs 
-                    SET end_time = CURRENT_TIMESTAMP, status = 'completed'
-                    WHERE run_type = 'summarizer' AND details->>'run_id' = :run_id
-                """), {"run_id": internal_run_id})
+                conn.execute(self._stmt_run_finish, {
+                    "status": "completed", "run_type": "summarizer", "run_id": internal_run_id
+                })
                 
         except Exception as e:
             logger.error(f"Error running summarizer agents: {e}")
             # Update run status to failed
             with engine.begin() as conn:
-                conn.execute(text("""
-                    UPDATE system_runs 
-                    SET end_time = CURRENT_TIMESTAMP, status = 'failed'
-                    WHERE run_type = 'summarizer' AND details->>'run_id' = :run_id
-                """), {"run_id": internal_run_id})
+                conn.execute(self._stmt_run_finish, {
+                    "status": "failed", "run_type": "summarizer", "run_id": internal_run_id
+                })
     
     def run_decider_agent(self, force=False):
         """
@@ -341,15 +462,13 @@ class DAITraderOrchestrator:
 
             # Record run start
             with engine.begin() as conn:
-                conn.execute(text("""
-                    INSERT INTO system_runs (run_type, details)
-                    VALUES ('decider', :details)
-                """), {
+                conn.execute(self._stmt_run_start, {
+                    "run_type": "decider",
                     "details": json.dumps({"run_id": run_id, "timestamp": datetime.now().isoformat()})
                 })
             
-            # Get unprocessed summaries
-            unprocessed_summaries = self.get_unprocessed_summaries()
+            # Get unprocessed summaries (streamed; only the newest run is kept)
+            unprocessed_summaries, superseded_ids = self._collect_latest_unprocessed_run()
             
             if not unprocessed_summaries:
                 logger.info("No unprocessed summaries found for decider - using latest run summaries")
@@ -415,9 +534,7 @@ class DAITraderOrchestrator:
                 decisions = decider.ask_decision_agent(summaries, target_run_id, holdings, run_context=run_context)
                 logger.info(f"✅ Decider AI returned {len(decisions) if isinstance(decisions, list) else 1} decisions")
             except Exception as e:
-                logger.error(f"❌ Decider AI call failed: {e}")
-                import traceback
-                logger.error(f"Traceback:\n{traceback.format_exc()}")
+                logger.exception("❌ Decider AI call failed: %s", e)
                 # Use empty decisions list if AI fails
                 decisions = []
             
@@ -434,32 +551,26 @@ class DAITraderOrchestrator:
                 # this branch is genuinely "nothing to act on", not necessarily a failure.
                 logger.info("ℹ️  No actionable decisions this cycle (no trades and no cash rationale).")
             
-            # Mark summaries as processed
-            summary_ids = [s['id'] for s in summaries]
+            # Mark summaries as processed, along with the superseded runs skipped above
+            summary_ids = [s['id'] for s in summaries] + superseded_ids
             self.mark_summaries_processed(summary_ids, 'decider')
             
             logger.info(f"Decider agent completed successfully: {run_id}")
             
             # Update run status
             with engine.begin() as conn:
-                conn.execute(text("""
-                    UPDATE system_runs 
-                    SET end_time = CURRENT_TIMESTAMP, status = 'completed'
-                    WHERE run_type = 'decider' AND details->>'run_id' = :run_id
-                """), {"run_id": run_id})
+                conn.execute(self._stmt_run_finish, {
+                    "status": "completed", "run_type": "decider", "run_id": run_id
+                })
             return True
                 
         except Exception as e:
-            logger.error(f"Error running decider agent: {e}")
-            import traceback
-            logger.error(f"Full traceback:\n{traceback.format_exc()}")
+            logger.exception("Error running decider agent: %s", e)
             # Update run status to failed
             with engine.begin() as conn:
-                conn.execute(text("""
-                    UPDATE system_runs 
-                    SET end_time = CURRENT_TIMESTAMP, status = 'failed'
-                    WHERE run_type = 'decider' AND details->>'run_id' = :run_id
-                """), {"run_id": run_id})
+                conn.execute(self._stmt_run_finish, {
+                    "status": "failed", "run_type": "decider", "run_id": run_id
+                })
             return False
     
     def run_feedback_agent(self):
@@ -481,85 +592,71 @@ class DAITraderOrchestrator:
             
         logger.info(f"Found {len(active_configs)} active config hashes: {active_configs}")
         
+        # One config at a time: the feedback path still has process-global
+        # config reads (prompt writes, API usage attribution), so configs
+        # analyzed concurrently could leak into each other.
         for config_hash in active_configs:
-            try:
-                logger.info(f"Running feedback analysis for config {config_hash}")
-                
-                # Record run start for this config
-                with engine.begin() as conn:
-                    conn.execute(text("""
-                        INSERT INTO system_runs (run_type, details)
-                        VALUES ('feedback', :details)
-                    """), {
-                        "details": json.dumps({
-                            "run_id": f"{run_id}_{config_hash[:8]}", 
-                            "timestamp": datetime.now().isoformat(),
-                            "config_hash": config_hash
-                        })
-                    })
-                
-                # Run the feedback analysis for this specific config
-                # WITHOUT changing the global configuration hash
-                feedback_tracker = TradeOutcomeTracker()
-                result = feedback_tracker.analyze_recent_outcomes_for_config(config_hash)
-                
-                if result:
-                    logger.info(f"Feedback analysis completed for config {config_hash}")
-                else:
-                    logger.info(f"No feedback analysis needed for config {config_hash}")
-                
-                # Update run status to completed
-                with engine.begin() as conn:
-                    conn.execute(text("""
-                        UPDATE system_runs 
-                        SET end_time = CURRENT_TIMESTAMP, status = 'completed'
-                        WHERE run_type = 'feedback' AND details->>'run_id' = :run_id
-                    """), {"run_id": f"{run_id}_{config_hash[:8]}"})
-                    
-            except Exception as e:
-                logger.error(f"Error running feedback for config {config_hash}: {e}")
-                # Update run status to failed
-                with engine.begin() as conn:
-                    conn.execute(text("""
-                        UPDATE system_runs 
-                        SET end_time = CURRENT_TIMESTAMP, status = 'failed'
-                        WHERE run_type = 'feedback' AND details->>'run_id' = :run_id
-                    """), {"run_id": f"{run_id}_{config_hash[:8]}"})
+            self._run_feedback_for_config(run_id, config_hash)
         
         # RESTORE the original configuration hash
         os.environ['CURRENT_CONFIG_HASH'] = original_config_hash
         logger.info(f"Restored original configuration hash: {original_config_hash}")
         logger.info(f"Feedback agent run completed for all configs: {run_id}")
     
+    def _run_feedback_for_config(self, run_id, config_hash):
+        """Run feedback analysis for one config hash and record its system_runs row"""
+        config_run_id = f"{run_id}_{config_hash[:8]}"
+        try:
+            logger.info(f"Running feedback analysis for config {config_hash}")
+            
+            # Record run start for this config
+            with engine.begin() as conn:
+                conn.execute(self._stmt_run_start, {
+                    "run_type": "feedback",
+                    "details": json.dumps({
+                        "run_id": config_run_id, 
+                        "timestamp": datetime.now().isoformat(),
+                        "config_hash": config_hash
+                    })
+                })
+            
+            # Run the feedback analysis for this specific config
+            # WITHOUT changing the global configuration hash
+            feedback_tracker = TradeOutcomeTracker()
+            result = feedback_tracker.analyze_recent_outcomes_for_config(config_hash)
+            
+            if result:
+                logger.info(f"Feedback analysis completed for config {config_hash}")
+            else:
+                logger.info(f"No feedback analysis needed for config {config_hash}")
+            
+            # Update run status to completed
+            with engine.begin() as conn:
+                conn.execute(self._stmt_run_finish, {
+                    "status": "completed", "run_type": "feedback", "run_id": config_run_id
+                })
+            self._feedback_ran_for[(datetime.now().date(), config_hash)] = True
+                
+        except Exception as e:
+            logger.error(f"Error running feedback for config {config_hash}: {e}")
+            # Update run status to failed
+            with engine.begin() as conn:
+                conn.execute(self._stmt_run_finish, {
+                    "status": "failed", "run_type": "feedback", "run_id": config_run_id
+                })
+    
     def _get_active_config_hashes(self):
         """Get config hashes that have had recent activity (decisions OR summaries)"""
         try:
+            # Cutoff is bound as a plain timestamp so each branch can range-scan its
+            # (timestamp, config_hash) index instead of evaluating NOW() per row
+            cutoff = datetime.now() - timedelta(days=2)
             with engine.connect() as conn:
                 # Get config hashes that have had ANY activity in the last 2 days
                 # This includes trade decisions, summaries, or just being actively used
-                result = conn.execute(text("""
-                    SELECT DISTINCT config_hash
-                    FROM (
-                        -- Configs with trade decisions
-                        SELECT config_hash FROM trade_decisions 
-                        WHERE timestamp >= NOW() - INTERVAL '2 days' AND config_hash IS NOT NULL
-                        
-                        UNION
-                        
-                        -- Configs with recent summaries (shows active usage)
-                        SELECT config_hash FROM summaries 
-                        WHERE timestamp >= NOW() - INTERVAL '2 days' AND config_hash IS NOT NULL
-                        
-                        UNION
-                        
-                        -- Configs that were recently used (from run_configurations)
-                        SELECT config_hash FROM run_configurations 
-                        WHERE last_used >= NOW() - INTERVAL '2 days'
-                    ) AS active_configs
-                    ORDER BY config_hash
-                """))
+                result = conn.execute(self._stmt_active_config_hashes, {"cutoff": cutoff})
                 
-                return [row.config_hash for row in result]
+                return [row[0] for row in result.all()]
         except Exception as e:
             logger.error(f"Error getting active config hashes: {e}")
             return []
@@ -574,9 +671,7 @@ class DAITraderOrchestrator:
             else:
                 logger.info("Skipping summarizer job - outside of scheduled time")
         except Exception as e:
-            logger.error(f"❌ Scheduled summarizer job failed: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception("❌ Scheduled summarizer job failed: %s", e)
     
     def scheduled_decider_job(self):
         """
@@ -592,9 +687,7 @@ class DAITraderOrchestrator:
             else:
                 logger.warning("⚠️  Scheduled decider job failed earlier in the log output.")
         except Exception as e:
-            logger.error(f"❌ Scheduled decider job failed: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception("❌ Scheduled decider job failed: %s", e)
     
     def run_outcome_backfill(self):
         """Attribute realized P&L to activated prompt versions (Phase-4 critic
@@ -607,9 +700,7 @@ class DAITraderOrchestrator:
             backfill_outcomes(dry_run=False)
             logger.info("✅ Outcome backfill completed")
         except Exception as e:
-            logger.error(f"⚠️  Outcome backfill failed (non-fatal): {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception("⚠️  Outcome backfill failed (non-fatal): %s", e)
 
     def scheduled_feedback_job(self):
         """Scheduled job for feedback agent + prompt-version outcome backfill"""
@@ -624,14 +715,12 @@ class DAITraderOrchestrator:
             else:
                 logger.info("Skipping feedback job - outside of scheduled time")
         except Exception as e:
-            logger.error(f"❌ Scheduled feedback job failed: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception("❌ Scheduled feedback job failed: %s", e)
     
     def scheduled_summarizer_and_decider_job(self):
         """Sequential job: Run summarizers first, then decider with collected summaries"""
         try:
-            now_eastern = datetime.now(LOCAL_TIMEZONE).astimezone(EASTERN_TIMEZONE)
+            now_eastern = self._now_eastern()
             market_open_et = now_eastern.replace(hour=9, minute=30, second=0, microsecond=0)
             if now_eastern.date() != self._startup_date_et and now_eastern < market_open_et:
                 logger.info("⏳ Skipping scheduled cycle before market open on non-startup day.")
@@ -662,9 +751,7 @@ class DAITraderOrchestrator:
                 logger.info("Skipping job - outside of summarizer time")
                 
         except Exception as e:
-            logger.error(f"❌ Sequential job failed: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception("❌ Sequential job failed: %s", e)
     
     def market_open_job(self):
         """
@@ -672,8 +759,7 @@ class DAITraderOrchestrator:
         Runs summarizers at 9:30 AM ET, then waits until exactly 9:30:05 AM ET to execute trades.
         """
         try:
-            now_local = datetime.now(LOCAL_TIMEZONE)
-            now_eastern = now_local.astimezone(EASTERN_TIMEZONE)
+            now_eastern = self._now_eastern()
             today_et = now_eastern.date()
             
             # Only run on weekdays
@@ -694,7 +780,7 @@ class DAITraderOrchestrator:
             logger.info("✅ Market-open analysis complete")
             
             # Step 2: Wait until exactly 9:30:05 AM ET
-            now_eastern = datetime.now(LOCAL_TIMEZONE).astimezone(EASTERN_TIMEZONE)
+            now_eastern = self._now_eastern()
             market_open_time = now_eastern.replace(hour=9, minute=30, second=5, microsecond=0)
             
             if now_eastern < market_open_time:
@@ -703,7 +789,7 @@ class DAITraderOrchestrator:
                 time.sleep(wait_seconds)
             
             # Step 3: Execute trades at market open
-            now_eastern = datetime.now(LOCAL_TIMEZONE).astimezone(EASTERN_TIMEZONE)
+            now_eastern = self._now_eastern()
             logger.info(f"🚀 EXECUTING OPENING TRADES at {now_eastern.strftime('%I:%M:%S %p ET')}")
             executed = self.run_decider_agent(force=True)
             if executed:
@@ -714,13 +800,11 @@ class DAITraderOrchestrator:
             self._startup_cycle_completed = True
             
         except Exception as e:
-            logger.error(f"❌ Market open job failed: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception("❌ Market open job failed: %s", e)
     
     def _run_market_open_catchup_if_needed(self):
         """If the orchestrator starts after 9:30 ET, immediately run the market-open sequence once."""
-        now_eastern = datetime.now(EASTERN_TIMEZONE)
+        now_eastern = self._now_eastern()
         if now_eastern.weekday() >= 5:
             return
         market_open_et = now_eastern.replace(hour=9, minute=30, second=0, microsecond=0)
@@ -732,12 +816,7 @@ class DAITraderOrchestrator:
         """Return True if a summarizer run was recorded today (any process)."""
         try:
             with engine.connect() as conn:
-                result = conn.execute(text("""
-                    SELECT COUNT(*) AS count
-                    FROM system_runs
-                    WHERE run_type = 'summarizer'
-                      AND start_time >= CURRENT_DATE
-                """)).fetchone()
+                result = conn.execute(self._stmt_summarizer_ran_today).fetchone()
                 return (result and result.count and int(result.count) > 0)
         except Exception as exc:
             logger.warning(f"Unable to check summarizer runs today: {exc}")
@@ -745,7 +824,7 @@ class DAITraderOrchestrator:
 
     def _ensure_cadence_anchor(self):
         """Set or reset the next cadence run time based on day and cadence rules."""
-        now_et = datetime.now(EASTERN_TIMEZONE)
+        now_et = self._now_eastern()
         # Switch anchor depending on whether it's the startup day
         if now_et.date() == self._startup_time_et.date():
             anchor = self._startup_time_et + timedelta(minutes=self._cadence_minutes)
@@ -762,7 +841,7 @@ class DAITraderOrchestrator:
         self._ensure_cadence_anchor()
         if self._next_cadence_run_et is None:
             return
-        now_et = datetime.now(EASTERN_TIMEZONE)
+        now_et = self._now_eastern()
         if now_et < self._next_cadence_run_et:
             return
         # Run once per tick; if more than one cadence interval elapsed, catch up one interval at a time
@@ -817,7 +896,7 @@ class DAITraderOrchestrator:
         cadence_minutes = self._cadence_minutes
         
         skip_cycle = os.getenv("DAI_SKIP_STARTUP_CYCLE", "0").lower() in {"1", "true", "yes"}
-        now_et = datetime.now(EASTERN_TIMEZONE)
+        now_et = self._now_eastern()
         market_open_et = now_et.replace(hour=9, minute=30, second=0, microsecond=0)
         if skip_cycle:
             logger.info("⏸️  Startup cycle skipped (DAI_SKIP_STARTUP_CYCLE is set).")
@@ -841,9 +920,7 @@ class DAITraderOrchestrator:
                 # Anchor cadence after the startup run to avoid double-running immediately
                 self._next_cadence_run_et = self._startup_time_et + timedelta(minutes=self._cadence_minutes)
             except Exception as exc:
-                logger.error(f"❌ Startup cycle failed: {exc}")
-                import traceback
-                logger.error(traceback.format_exc())
+                logger.exception("❌ Startup cycle failed: %s", exc)
 
         logger.info("")
         logger.info("="*60)
@@ -873,7 +950,10 @@ class DAITraderOrchestrator:
         try:
             while True:
                 schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                # Wake when the next job is due (at most a minute away) rather
+                # than a fixed 60s after the last pass, so jobs don't drift late.
+                idle = schedule.idle_seconds()
+                time.sleep(60 if idle is None else min(60, max(0, idle)))
                 
         except KeyboardInterrupt:
             logger.info("Shutting down D-AI-Trader automation system")
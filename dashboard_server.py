@@ -11,7 +11,9 @@ except Exception:
     pass
 # --- end bootstrap ---
 
-from flask import Flask, render_template, jsonify, request
+from collections.abc import Mapping
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from config import (
@@ -24,6 +26,8 @@ from config import (
     get_prompt_version_config,
     get_trading_mode,
     get_current_config_hash,
+    load_model_pricing,
+    compute_api_cost,
     SCHWAB_ACCOUNT_HASH,
     IS_MARGIN_ACCOUNT,
 )
@@ -36,6 +40,7 @@ import importlib
 import difflib
 import initialize_prompts as default_prompts_module
 from prompt_manager import (
+    get_active_prompt_emergency_patch,
     initialize_config_prompts,
     set_active_prompt_version,
     undo_last_prompt_activation,
@@ -50,28 +55,113 @@ from decider_agent import (
     store_momentum_snapshot,
     SUMMARY_MAX_CHARS,
 )
+import functools
+import gc
+import hashlib
 import json
+import logging
+import re
 import pandas as pd
+import pytz
 import threading
 import time
+import traceback
 import uuid
 import yfinance as yf
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from feedback_agent import TradeOutcomeTracker
 from schwab_client import schwab_client
 import subprocess
 import sys
 import os
-from update_prices import get_current_price_robust
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from jinja2 import FileSystemBytecodeCache
+from update_prices import get_current_prices_bulk
 from d_ai_trader import (
     DAITraderOrchestrator,
     mark_manual_decider_window,
 )
 
+try:
+    import orjson
+except ImportError:  # optional C-accelerated JSON; stdlib json is the fallback
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _json_dumps(obj):
+    """Serialize to a JSON str (DB columns expect text), via orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 # Configuration
 REFRESH_INTERVAL_MINUTES = 10
+JINJA_BYTECODE_CACHE_DIR = os.environ.get(
+    "DAI_JINJA_CACHE_DIR", os.path.join(tempfile.gettempdir(), "dai_jinja_cache")
+)
 app = Flask(__name__)
 
+
+class _DashboardJSONProvider(DefaultJSONProvider):
+    """jsonify() through orjson when installed; matches Flask's key sorting and
+    datetime format and also serializes SQLAlchemy RowMappings."""
+
+    if orjson is not None:
+        _options = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Mapping):
+            return dict(o)
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or "indent" in kwargs:
+            # Debug-mode pretty printing keeps the stdlib encoder.
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._options).decode()
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's UTF-8 bytes straight to the response instead of
+        # decoding to str only for Werkzeug to encode it again.
+        if orjson is None or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(
+                obj, default=self.default, option=self._options | orjson.OPT_APPEND_NEWLINE
+            )
+        except orjson.JSONEncodeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def loads(self, s, **kwargs):
+        return _json_loads(s)
+
+
+app.json = _DashboardJSONProvider(app)
+
+if not app.debug:
+    # Persist compiled templates across restarts and skip per-render mtime checks.
+    # Must be set before app.jinja_env is first touched (it is created lazily).
+    os.makedirs(JINJA_BYTECODE_CACHE_DIR, exist_ok=True)
+    app.jinja_options = {
+        **app.jinja_options,
+        "auto_reload": False,
+        "cache_size": 400,
+        "bytecode_cache": FileSystemBytecodeCache(directory=JINJA_BYTECODE_CACHE_DIR),
+    }
+
 # Manual "Run All" concurrency guard and state tracking
 _manual_run_lock = threading.Lock()
 _manual_run_state = {
@@ -95,6 +185,187 @@ except ImportError:
     SCHWAB_ENABLED = False
     print("Warning: Trading interface not available, Schwab features disabled")
 
+# Short-lived cache of successful Schwab snapshots for the dashboard so a burst
+# of page loads does not fan out into one Schwab API round trip each.
+SCHWAB_SNAPSHOT_CACHE_TTL = float(os.environ.get("DAI_SCHWAB_SNAPSHOT_TTL", "30"))
+_schwab_snapshot_cache = {}
+_schwab_snapshot_cache_lock = threading.Lock()
+
+
+def _get_cached_schwab_snapshot():
+    """Return (snapshot, fresh) for the dashboard, reusing a recent successful sync.
+
+    ``fresh`` is False when the snapshot came from the cache, letting callers
+    skip side effects (history writes) they already did for that snapshot.
+    """
+    key = SCHWAB_ACCOUNT_HASH
+    now = time.monotonic()
+    with _schwab_snapshot_cache_lock:
+        cached = _schwab_snapshot_cache.get(key)
+        if cached and now - cached[0] < SCHWAB_SNAPSHOT_CACHE_TTL:
+            return cached[1], False
+
+    snapshot = trading_interface.sync_schwab_positions()
+    if snapshot.get("status") == "success":
+        with _schwab_snapshot_cache_lock:
+            _schwab_snapshot_cache[key] = (time.monotonic(), snapshot)
+    return snapshot, True
+
+
+# Config hashes whose holdings table / CASH row fetch_holdings() has already
+# initialized in this process; the dashboard only needs that side effect once.
+_initialized_holdings_configs = set()
+_holdings_init_lock = threading.Lock()
+
+
+def _ensure_holdings_initialized(config_hash):
+    """Run fetch_holdings() once per config hash to create the table and seed CASH."""
+    if config_hash in _initialized_holdings_configs:
+        return
+    with _holdings_init_lock:
+        if config_hash not in _initialized_holdings_configs:
+            fetch_holdings()
+            _initialized_holdings_configs.add(config_hash)
+
+
+# Background pool for network calls the dashboard overlaps with its DB reads.
+SCHWAB_SYNC_TIMEOUT = float(os.environ.get("DAI_SCHWAB_SYNC_TIMEOUT", "30"))
+_dashboard_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dashboard")
+
+# Rendered "/" pages shared across visitors for a few seconds; the page only
+# changes when holdings, prices or prompts change.
+DASHBOARD_PAGE_CACHE_TTL = float(os.environ.get("DAI_DASHBOARD_CACHE_TTL", "15"))
+_dashboard_page_cache = {}
+_dashboard_page_cache_lock = threading.Lock()
+
+
+def _invalidate_dashboard_cache():
+    """Drop cached dashboard pages after holdings/prompts are changed in-process."""
+    with _dashboard_page_cache_lock:
+        _dashboard_page_cache.clear()
+    with _poll_cache_lock:
+        _poll_cache.clear()
+    _invalidate_history_cache()
+
+
+# Results of the endpoints the dashboard JS polls every few seconds. Concurrent
+# pollers for the same key share one query: the first caller loads, the rest
+# wait on its Event and read the cached result. Keys include client-supplied
+# values (e.g. /api/history?ticker=), so the cache is bounded: expired entries
+# are pruned on insert and the least recently used key goes past the cap.
+POLL_CACHE_TTL = float(os.environ.get("DAI_POLL_CACHE_TTL", "2"))
+POLL_CACHE_MAX_ENTRIES = int(os.environ.get("DAI_POLL_CACHE_MAX_ENTRIES", "256"))
+_poll_cache = {}
+_poll_inflight = {}
+_poll_cache_lock = threading.Lock()
+
+
+def _get_polled_result(key, loader):
+    """Return loader() for key, reusing a result younger than POLL_CACHE_TTL."""
+    while True:
+        with _poll_cache_lock:
+            cached = _poll_cache.get(key)
+            if cached and time.monotonic() - cached[0] < POLL_CACHE_TTL:
+                _poll_cache[key] = _poll_cache.pop(key)
+                return cached[1]
+            event = _poll_inflight.get(key)
+            leader = event is None
+            if leader:
+                event = _poll_inflight[key] = threading.Event()
+
+        if not leader:
+            # Re-check once the in-flight load finishes (or fails and frees the slot)
+            event.wait()
+            continue
+
+        try:
+            value = loader()
+            with _poll_cache_lock:
+                _store_polled_result(key, value)
+            return value
+        finally:
+            with _poll_cache_lock:
+                _poll_inflight.pop(key, None)
+            event.set()
+
+
+def _store_polled_result(key, value):
+    """Insert into _poll_cache (caller holds the lock), pruning expired and LRU entries."""
+    now = time.monotonic()
+    for stale_key in [k for k, (ts, _) in _poll_cache.items() if now - ts >= POLL_CACHE_TTL]:
+        del _poll_cache[stale_key]
+    _poll_cache.pop(key, None)
+    _poll_cache[key] = (now, value)
+    while len(_poll_cache) > POLL_CACHE_MAX_ENTRIES:
+        del _poll_cache[next(iter(_poll_cache))]
+
+
+# Serialized /api/portfolio-history and /api/portfolio-performance bodies per
+# config hash. Snapshots land every few minutes; in-process writers invalidate
+# right away and the TTL bounds staleness from the agents' own snapshot writes.
+# A body is only stored if no invalidation happened while it was being built,
+# and only while it stays under HISTORY_CACHE_MAX_ROWS; longer histories just
+# stream through with bounded memory.
+HISTORY_CACHE_TTL = float(os.environ.get("DAI_HISTORY_CACHE_TTL", "60"))
+HISTORY_CACHE_MAX_ROWS = int(os.environ.get("DAI_HISTORY_CACHE_MAX_ROWS", "5000"))
+_history_cache = {}
+_history_cache_generation = 0
+_history_cache_lock = threading.Lock()
+
+
+def _invalidate_history_cache():
+    """Drop cached portfolio history bodies after a snapshot is written in-process."""
+    global _history_cache_generation
+    with _history_cache_lock:
+        _history_cache.clear()
+        _history_cache_generation += 1
+
+
+# Active prompt bundles / versions per config hash. Prompts change on the
+# minute scale (agent runs, evolution applies), so a short TTL bounds staleness
+# from other processes while in-process edits invalidate immediately.
+PROMPT_CACHE_TTL = float(os.environ.get("DAI_DASHBOARD_PROMPT_CACHE_TTL", "30"))
+_prompt_cache = {}
+_prompt_cache_lock = threading.Lock()
+
+
+def _get_cached_prompt_data(kind, config_hash, loader):
+    """Return loader() for (kind, config_hash), reusing a result younger than PROMPT_CACHE_TTL."""
+    key = (kind, config_hash)
+    now = time.monotonic()
+    with _prompt_cache_lock:
+        cached = _prompt_cache.get(key)
+        if cached and now - cached[0] < PROMPT_CACHE_TTL:
+            return cached[1]
+
+    value = loader()
+    with _prompt_cache_lock:
+        _prompt_cache[key] = (time.monotonic(), value)
+    return value
+
+
+def _invalidate_prompt_caches():
+    """Drop cached prompt data (and the pages embedding it) after a prompt or feedback change."""
+    with _prompt_cache_lock:
+        _prompt_cache.clear()
+    _invalidate_dashboard_cache()
+
+
+# TradeOutcomeTracker() runs its CREATE TABLE IF NOT EXISTS DDL on every
+# construction and keeps no per-instance state, so one shared instance is enough.
+_tracker_lock = threading.Lock()
+_tracker_singleton = None
+
+
+def _get_tracker():
+    """Return the process-wide TradeOutcomeTracker, creating it on first use."""
+    global _tracker_singleton
+    if _tracker_singleton is None:
+        with _tracker_lock:
+            if _tracker_singleton is None:
+                _tracker_singleton = TradeOutcomeTracker()
+    return _tracker_singleton
+
 
 def _refresh_holdings_with_quotes(holdings):
     """
@@ -123,7 +394,7 @@ def _refresh_holdings_with_quotes(holdings):
                 row["gain_loss"] = row["current_value"] - cost_basis
                 updated = True
         except Exception as exc:
-            print(f"⚠️  Unable to refresh quote for {symbol}: {exc}")
+            logger.warning("Unable to refresh quote for %s: %s", symbol, exc)
     return updated
 
 
@@ -325,7 +596,7 @@ def _normalize_feedback_value(value):
         if not trimmed:
             return ""
         try:
-            parsed = json.loads(trimmed)
+            parsed = _json_loads(trimmed)
             return _normalize_feedback_value(parsed)
         except (json.JSONDecodeError, TypeError):
             return trimmed
@@ -335,6 +606,25 @@ def _normalize_feedback_value(value):
         return json.dumps(value, indent=2, ensure_ascii=False)
     return str(value)
 
+_PROMPT_PLACEHOLDER_RE = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_prompt_template(template):
+    """Split a prompt template into (literal, placeholder-or-None) pairs.
+
+    Prompt templates are stable across requests, so the split is cached and
+    each render is a single join over the pieces.
+    """
+    pieces = []
+    pos = 0
+    for match in _PROMPT_PLACEHOLDER_RE.finditer(template):
+        pieces.append((template[pos:match.start()], match.group(1)))
+        pos = match.end()
+    pieces.append((template[pos:], None))
+    return tuple(pieces)
+
+
 def _render_prompt_text(template, replacements):
     """Render a prompt template by substituting only known {placeholder} tokens.
 
@@ -347,24 +637,34 @@ def _render_prompt_text(template, replacements):
     """
     if not template:
         return None
-    rendered = template
-    for key, value in (replacements or {}).items():
-        rendered = rendered.replace("{" + str(key) + "}", str(value))
-    return rendered
+    replacements = replacements or {}
+    parts = []
+    for literal, key in _parse_prompt_template(template):
+        parts.append(literal)
+        if key is not None:
+            if key in replacements:
+                parts.append(str(replacements[key]))
+            else:
+                parts.append("{" + key + "}")
+    return "".join(parts)
+
+# Every agent name _get_active_prompts_bundle may fall back to, fetched in one go.
+_PROMPT_BUNDLE_AGENTS = ["SummarizerAgent", "summarizer", "DeciderAgent", "decider", "FeedbackAgent"]
+
+
+def _collect_prompt_payload(active_prompts, agent_candidates, key, replacements=None):
+    """Build a structured payload for the active prompt of a given agent.
 
-def _collect_prompt_payload(tracker, agent_candidates, key, replacements=None):
-    """Build a structured payload for the active prompt of a given agent."""
+    ``active_prompts`` is the dict returned by TradeOutcomeTracker.get_active_prompts;
+    the first candidate name with a prompt wins.
+    """
     replacements = replacements or {}
     if isinstance(agent_candidates, str):
         agent_candidates = [agent_candidates]
 
     prompt = None
     for candidate in agent_candidates:
-        try:
-            prompt = tracker.get_active_prompt(candidate)
-        except Exception as exc:
-            print(f"Error loading prompt for {candidate}: {exc}")
-            prompt = None
+        prompt = active_prompts.get(candidate)
         if prompt:
             break
 
@@ -402,9 +702,10 @@ def _format_percentage(value, multiplier=1.0):
     except (TypeError, ValueError):
         return "N/A"
 
-def _build_prompt_context_samples(latest_feedback=None):
+def _build_prompt_context_samples(latest_feedback=None, config_hash=None):
     """Create representative context strings for prompt previews."""
-    config_hash = get_current_config_hash()
+    if config_hash is None:
+        config_hash = get_current_config_hash()
     holdings_rows = []
     summary_rows = []
 
@@ -415,8 +716,10 @@ def _build_prompt_context_samples(latest_feedback=None):
             WHERE is_active = TRUE AND config_hash = :config_hash
         """), {"config_hash": config_hash}).fetchall()
 
+        # data::jsonb normalizes legacy TEXT columns so psycopg2 always hands
+        # back a decoded dict.
         summary_rows = conn.execute(text("""
-            SELECT agent, data, timestamp
+            SELECT agent, data::jsonb AS data, timestamp
             FROM summaries
             WHERE config_hash = :config_hash
             ORDER BY timestamp DESC
@@ -443,11 +746,6 @@ def _build_prompt_context_samples(latest_feedback=None):
     summary_entries = []
     for row in summary_rows:
         entry_data = row.data
-        if isinstance(entry_data, str):
-            try:
-                entry_data = json.loads(entry_data)
-            except (json.JSONDecodeError, TypeError):
-                entry_data = {}
         summary_payload = entry_data.get("summary") if isinstance(entry_data, dict) else {}
         if not isinstance(summary_payload, dict):
             summary_payload = {}
@@ -498,14 +796,14 @@ def _parse_summary_row(row):
     data = row.data
     if isinstance(data, str):
         try:
-            data = json.loads(data)
+            data = _json_loads(data)
         except (json.JSONDecodeError, TypeError):
             data = {}
 
     summary_content = data.get("summary") if isinstance(data, dict) else {}
     if isinstance(summary_content, str):
         try:
-            summary_content = json.loads(summary_content)
+            summary_content = _json_loads(summary_content)
         except (json.JSONDecodeError, TypeError):
             summary_content = {"headlines": [], "insights": summary_content}
 
@@ -619,16 +917,16 @@ def generate_summary_analyzer_report(limit=10, force_refresh=False):
                 LIMIT 1
             """), {"config_hash": config_hash, "run_id": run_id}).fetchone()
     except Exception as snapshot_err:
-        print(f"⚠️  Momentum snapshot lookup failed: {snapshot_err}")
+        logger.warning("Momentum snapshot lookup failed: %s", snapshot_err)
 
     if snapshot and not force_refresh:
         snapshot_loaded = True
         try:
-            company_entities = json.loads(snapshot.companies_json) if snapshot.companies_json else []
+            company_entities = _json_loads(snapshot.companies_json) if snapshot.companies_json else []
         except Exception:
             company_entities = []
         try:
-            momentum_data = json.loads(snapshot.momentum_data) if snapshot.momentum_data else []
+            momentum_data = _json_loads(snapshot.momentum_data) if snapshot.momentum_data else []
         except Exception:
             momentum_data = []
         momentum_summary = snapshot.momentum_summary or ""
@@ -694,8 +992,54 @@ def generate_summary_analyzer_report(limit=10, force_refresh=False):
 _SYNC_PLACEHOLDER_REASONS = {"Schwab synced position", "📡 Synced from Schwab"}
 
 
-def _sync_holdings_with_database(config_hash, holdings, cash_balance):
-    """Replace holdings in the database with the live Schwab snapshot.
+@contextmanager
+def _transaction(conn=None):
+    """Yield ``conn`` when the caller already holds one, else a fresh engine.begin().
+
+    A shared connection gets a SAVEPOINT so a failed write rolls back on its own
+    instead of aborting the caller's whole transaction.
+    """
+    if conn is not None:
+        with conn.begin_nested():
+            yield conn
+    else:
+        with engine.begin() as new_conn:
+            yield new_conn
+
+
+_SQL_SELECT_HOLDING_PROVENANCE = text("""
+    SELECT ticker, reason, purchase_timestamp FROM holdings
+    WHERE config_hash = :config_hash AND is_active = TRUE AND ticker != 'CASH'
+""")
+_SQL_UPSERT_HOLDING = text("""
+    INSERT INTO holdings (config_hash, ticker, shares, purchase_price, current_price,
+                          purchase_timestamp, current_price_timestamp, total_value, current_value,
+                          gain_loss, reason, is_active)
+    VALUES (:config_hash, :ticker, :shares, :purchase_price, :current_price,
+            :purchase_ts, :ts, :total_value, :current_value, :gain_loss, :reason, TRUE)
+    ON CONFLICT (config_hash, ticker) DO UPDATE SET
+        shares = EXCLUDED.shares,
+        purchase_price = EXCLUDED.purchase_price,
+        current_price = EXCLUDED.current_price,
+        purchase_timestamp = EXCLUDED.purchase_timestamp,
+        current_price_timestamp = EXCLUDED.current_price_timestamp,
+        total_value = EXCLUDED.total_value,
+        current_value = EXCLUDED.current_value,
+        gain_loss = EXCLUDED.gain_loss,
+        reason = EXCLUDED.reason,
+        is_active = TRUE
+""")
+_SQL_TOMBSTONE_HOLDINGS = text("""
+    UPDATE holdings
+    SET is_active = FALSE, shares = 0, current_value = 0, gain_loss = 0,
+        current_price_timestamp = :ts
+    WHERE config_hash = :config_hash AND is_active = TRUE
+      AND ticker <> ALL(:keep)
+""")
+
+
+def _sync_holdings_with_database(config_hash, holdings, cash_balance, conn=None):
+    """Upsert holdings in the database from the live Schwab snapshot.
 
     Preserves each existing position's real buy thesis + entry timestamp
     (mirrors sync_schwab_positions) — only genuinely new/inherited positions
@@ -703,30 +1047,28 @@ def _sync_holdings_with_database(config_hash, holdings, cash_balance):
     decider treat its own fresh entries as anonymous inventory and churn them.
     """
     now = datetime.utcnow()
-    print(f"🗃️ Syncing holdings for {config_hash}: positions={len(holdings)} cash={cash_balance:.2f}")
-    with engine.begin() as conn:
+    logger.info("Syncing holdings for %s: positions=%d cash=%.2f", config_hash, len(holdings), cash_balance)
+    with _transaction(conn) as conn:
         prior_provenance = {}
         try:
-            for _r in conn.execute(text("""
-                SELECT ticker, reason, purchase_timestamp FROM holdings
-                WHERE config_hash = :config_hash AND is_active = TRUE AND ticker != 'CASH'
-            """), {"config_hash": config_hash}):
+            for _r in conn.execute(_SQL_SELECT_HOLDING_PROVENANCE, {"config_hash": config_hash}):
                 prior_provenance[_r.ticker] = (_r.reason, _r.purchase_timestamp)
         except Exception:
             prior_provenance = {}
-        conn.execute(text("DELETE FROM holdings WHERE config_hash = :config_hash"), {"config_hash": config_hash})
-
-        # Cash row
-        conn.execute(text("""
-            INSERT INTO holdings (config_hash, ticker, shares, purchase_price, current_price,
-                                  purchase_timestamp, current_price_timestamp, total_value, current_value,
-                                  gain_loss, reason, is_active)
-            VALUES (:config_hash, 'CASH', 1, :cash, :cash, :ts, :ts, :cash, :cash, 0, 'Schwab cash balance', TRUE)
-        """), {
+        # Cash row first, then every position — upserted in one executemany.
+        rows = [{
             "config_hash": config_hash,
-            "cash": cash_balance,
+            "ticker": "CASH",
+            "shares": 1,
+            "purchase_price": cash_balance,
+            "current_price": cash_balance,
+            "total_value": cash_balance,
+            "current_value": cash_balance,
+            "gain_loss": 0,
+            "reason": "Schwab cash balance",
+            "purchase_ts": now,
             "ts": now
-        })
+        }]
 
         for row in holdings:
             shares = float(row.get("shares") or 0)
@@ -749,13 +1091,7 @@ def _sync_holdings_with_database(config_hash, holdings, cash_balance):
             reason = incoming_reason or (prev_reason if has_real_provenance else "Schwab synced position")
             purchase_ts = prev_ts if (has_real_provenance and prev_ts) else now
 
-            conn.execute(text("""
-                INSERT INTO holdings (config_hash, ticker, shares, purchase_price, current_price,
-                                      purchase_timestamp, current_price_timestamp, total_value, current_value,
-                                      gain_loss, reason, is_active)
-                VALUES (:config_hash, :ticker, :shares, :purchase_price, :current_price,
-                        :purchase_ts, :ts, :total_value, :current_value, :gain_loss, :reason, TRUE)
-            """), {
+            rows.append({
                 "config_hash": config_hash,
                 "ticker": ticker,
                 "shares": shares,
@@ -769,37 +1105,49 @@ def _sync_holdings_with_database(config_hash, holdings, cash_balance):
                 "ts": now
             })
 
+        conn.execute(_SQL_UPSERT_HOLDING, rows)
 
-def _record_live_portfolio_snapshot(config_hash, total_portfolio_value, cash_balance,
-                                    total_invested, total_profit_loss, holdings):
-    """Persist live Schwab portfolio snapshot for charting/history."""
-    percentage_gain = (total_profit_loss / total_invested * 100) if total_invested else 0
-    holdings_snapshot = json.dumps([
-        {"ticker": h.get("ticker"), "current_value": h.get("current_value", 0)}
-        for h in holdings
-    ])
+        # Tombstone positions Schwab no longer reports instead of deleting them,
+        # matching how the decider closes out sold holdings.
+        conn.execute(_SQL_TOMBSTONE_HOLDINGS, {
+            "config_hash": config_hash,
+            "keep": [row["ticker"] for row in rows],
+            "ts": now
+        })
 
-    with engine.begin() as conn:
-        latest = conn.execute(text("""
+
+# Live snapshots skip the insert when the latest row for the config has the
+# same value (within a cent) and is under 5 minutes old — one round trip.
+_SQL_INSERT_PORTFOLIO_HISTORY_IF_CHANGED = text("""
+    INSERT INTO portfolio_history
+    (total_portfolio_value, cash_balance, total_invested,
+     total_profit_loss, percentage_gain, holdings_snapshot, config_hash)
+    SELECT :total_portfolio_value, :cash_balance, :total_invested,
+           :total_profit_loss, :percentage_gain, CAST(:holdings_snapshot AS JSONB), :config_hash
+    WHERE NOT EXISTS (
+        SELECT 1 FROM (
             SELECT timestamp, total_portfolio_value
             FROM portfolio_history
             WHERE config_hash = :config_hash
             ORDER BY timestamp DESC LIMIT 1
-        """), {"config_hash": config_hash}).fetchone()
+        ) latest
+        WHERE ABS(latest.total_portfolio_value - :total_portfolio_value) < 0.01
+          AND latest.timestamp > (now() AT TIME ZONE 'UTC') - INTERVAL '5 minutes'
+    )
+""")
 
-        if latest:
-            last_time = latest.timestamp
-            last_value = float(latest.total_portfolio_value)
-            if abs(last_value - total_portfolio_value) < 0.01 and (datetime.utcnow() - last_time) < timedelta(minutes=5):
-                return
 
-        conn.execute(text("""
-            INSERT INTO portfolio_history
-            (total_portfolio_value, cash_balance, total_invested,
-             total_profit_loss, percentage_gain, holdings_snapshot, config_hash)
-            VALUES (:total_portfolio_value, :cash_balance, :total_invested,
-                    :total_profit_loss, :percentage_gain, :holdings_snapshot, :config_hash)
-        """), {
+def _record_live_portfolio_snapshot(config_hash, total_portfolio_value, cash_balance,
+                                    total_invested, total_profit_loss, holdings, conn=None):
+    """Persist live Schwab portfolio snapshot for charting/history."""
+    percentage_gain = (total_profit_loss / total_invested * 100) if total_invested else 0
+    holdings_snapshot = _json_dumps([
+        {"ticker": h.get("ticker"), "current_value": h.get("current_value", 0)}
+        for h in holdings
+    ])
+
+    with _transaction(conn) as conn:
+        conn.execute(_SQL_INSERT_PORTFOLIO_HISTORY_IF_CHANGED, {
             "total_portfolio_value": total_portfolio_value,
             "cash_balance": cash_balance,
             "total_invested": total_invested,
@@ -808,6 +1156,7 @@ def _record_live_portfolio_snapshot(config_hash, total_portfolio_value, cash_bal
             "holdings_snapshot": holdings_snapshot,
             "config_hash": config_hash
         })
+    _invalidate_history_cache()
 
 
 def _fetch_latest_momentum_snapshot(config_hash):
@@ -840,48 +1189,61 @@ def _fetch_latest_momentum_snapshot(config_hash):
                 LIMIT 1
             """), {"config_hash": config_hash}).fetchone()
     except Exception as exc:
-        print(f"⚠️  Momentum snapshot lookup failed: {exc}")
+        logger.warning("Momentum snapshot lookup failed: %s", exc)
         snapshot = None
     return snapshot
 
 
-def _get_live_portfolio_baseline(config_hash, current_value):
+_SQL_CREATE_LIVE_BASELINES = text("""
+    CREATE TABLE IF NOT EXISTS live_portfolio_baselines (
+        config_hash TEXT PRIMARY KEY,
+        baseline_value FLOAT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+""")
+_SQL_SELECT_LIVE_BASELINE = text("""
+    SELECT baseline_value FROM live_portfolio_baselines
+    WHERE config_hash = :config_hash
+""")
+_SQL_INSERT_LIVE_BASELINE = text("""
+    INSERT INTO live_portfolio_baselines (config_hash, baseline_value)
+    VALUES (:config_hash, :baseline_value)
+""")
+
+
+def _get_live_portfolio_baseline(config_hash, current_value, conn=None):
     """Return baseline portfolio value for given config, creating if missing."""
     if not config_hash:
         return current_value
 
-    with engine.begin() as conn:
-        conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS live_portfolio_baselines (
-                config_hash TEXT PRIMARY KEY,
-                baseline_value FLOAT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """))
+    with _transaction(conn) as conn:
+        conn.execute(_SQL_CREATE_LIVE_BASELINES)
 
-        baseline_row = conn.execute(text("""
-            SELECT baseline_value FROM live_portfolio_baselines
-            WHERE config_hash = :config_hash
-        """), {"config_hash": config_hash}).fetchone()
+        baseline_row = conn.execute(_SQL_SELECT_LIVE_BASELINE, {"config_hash": config_hash}).fetchone()
 
         if baseline_row:
             return float(baseline_row.baseline_value)
 
-        conn.execute(text("""
-            INSERT INTO live_portfolio_baselines (config_hash, baseline_value)
-            VALUES (:config_hash, :baseline_value)
-        """), {"config_hash": config_hash, "baseline_value": current_value})
+        conn.execute(_SQL_INSERT_LIVE_BASELINE, {"config_hash": config_hash, "baseline_value": current_value})
 
         return float(current_value)
 
 def _get_active_prompts_bundle():
     """Fetch active prompt data for all primary agents with current feedback applied."""
-    tracker = TradeOutcomeTracker()
+    config_hash = get_current_config_hash()
+    return _get_cached_prompt_data(
+        "bundle", config_hash, lambda: _load_active_prompts_bundle(config_hash)
+    )
+
+
+def _load_active_prompts_bundle(config_hash):
+    """Build the uncached prompt bundle for _get_active_prompts_bundle()."""
+    tracker = _get_tracker()
     latest_feedback = tracker.get_latest_feedback() or {}
-    context_samples = _build_prompt_context_samples(latest_feedback)
+    context_samples = _build_prompt_context_samples(latest_feedback, config_hash=config_hash)
 
     momentum_recap_text = "Momentum recap unavailable."
-    snapshot = _fetch_latest_momentum_snapshot(get_current_config_hash())
+    snapshot = _fetch_latest_momentum_snapshot(config_hash)
     if snapshot and snapshot.momentum_recap:
         momentum_recap_text = snapshot.momentum_recap
 
@@ -905,8 +1267,14 @@ def _get_active_prompts_bundle():
         "decider_feedback": decider_feedback_text or "No recent performance feedback available."
     }
 
+    try:
+        active_prompts = tracker.get_active_prompts(_PROMPT_BUNDLE_AGENTS)
+    except Exception as exc:
+        logger.warning("Error loading active prompts: %s", exc)
+        active_prompts = {}
+
     summarizer_payload = _collect_prompt_payload(
-        tracker,
+        active_prompts,
         ["SummarizerAgent", "summarizer"],
         "SummarizerAgent",
         replacements={
@@ -915,14 +1283,14 @@ def _get_active_prompts_bundle():
     )
 
     decider_payload = _collect_prompt_payload(
-        tracker,
+        active_prompts,
         ["DeciderAgent", "decider"],
         "DeciderAgent",
         replacements=dict(replacements_common)
     )
 
     feedback_payload = _collect_prompt_payload(
-        tracker,
+        active_prompts,
         ["FeedbackAgent"],
         "FeedbackAgent",
         replacements=dict(replacements_common)
@@ -960,67 +1328,156 @@ def create_portfolio_history_table():
                 config_hash VARCHAR(50)
             )
         """))
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_ph_hash_ts
+            ON portfolio_history(config_hash, timestamp DESC)
+        """))
+        # holdings is created lazily by decider_agent.fetch_holdings().
+        if conn.execute(text("SELECT to_regclass('holdings')")).scalar():
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_holdings_hash_active
+                ON holdings(config_hash) WHERE is_active
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_holdings_ticker
+                ON holdings(ticker)
+            """))
+        # /summaries and /trades filter on has_error; both tables are created
+        # lazily (main.py / decider_agent.py) and the Schwab launchers skip
+        # init_database.py, so make sure the flags and their indexes exist here too.
+        if conn.execute(text("SELECT to_regclass('summaries')")).scalar():
+            conn.execute(text("""
+                ALTER TABLE summaries ADD COLUMN IF NOT EXISTS has_error BOOLEAN
+                GENERATED ALWAYS AS (COALESCE(data::text LIKE '%API error, no response%', FALSE)) STORED
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_summaries_cfg_id_ok
+                ON summaries(config_hash, id DESC)
+                WHERE NOT has_error
+            """))
+        if conn.execute(text("SELECT to_regclass('trade_decisions')")).scalar():
+            conn.execute(text("""
+                ALTER TABLE trade_decisions ADD COLUMN IF NOT EXISTS has_error BOOLEAN
+                GENERATED ALWAYS AS (COALESCE(
+                    data::text LIKE '%Max retries reached%'
+                    OR data::text LIKE '%API error, no response%', FALSE)) STORED
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_trade_decisions_cfg_id_ok
+                ON trade_decisions(config_hash, id DESC)
+                WHERE NOT has_error
+            """))
+
+
+# Window aggregates appended to an active-holdings SELECT so the portfolio
+# totals come back with the rows instead of being re-summed in Python.
+_HOLDINGS_TOTALS_COLUMNS = """
+    COALESCE(SUM(current_value) FILTER (WHERE ticker = 'CASH') OVER (), 0) AS totals_cash,
+    COALESCE(SUM(current_value) FILTER (WHERE ticker <> 'CASH') OVER (), 0) AS totals_equity_value,
+    COALESCE(SUM(total_value) FILTER (WHERE ticker <> 'CASH') OVER (), 0) AS totals_invested,
+    COALESCE(SUM(gain_loss) FILTER (WHERE ticker <> 'CASH') OVER (), 0) AS totals_pnl
+"""
+_HOLDINGS_TOTALS_KEYS = ("cash", "equity_value", "invested", "pnl")
+
+
+def _holdings_totals(rows):
+    """Return the totals dict from rows selected with _HOLDINGS_TOTALS_COLUMNS.
+
+    Every row carries the same window totals, so only the first is read.
+    """
+    totals = {key: 0.0 for key in _HOLDINGS_TOTALS_KEYS}
+    if rows:
+        first = rows[0]
+        for key in _HOLDINGS_TOTALS_KEYS:
+            totals[key] = float(getattr(first, f"totals_{key}") or 0)
+    return totals
+
+
+def _sum_position_totals(positions):
+    """Return (equity_value, invested, pnl) for non-CASH position dicts in one pass.
+
+    Python-side counterpart of _HOLDINGS_TOTALS_COLUMNS for holdings that do
+    not come from the database (e.g. the live Schwab snapshot).
+    """
+    equity_value = invested = pnl = 0.0
+    for position in positions:
+        if position.get("ticker") == "CASH":
+            continue
+        equity_value += position["current_value"]
+        invested += position["total_value"]
+        pnl += position["gain_loss"]
+    return equity_value, invested, pnl
+
+
+# Totals, the JSONB holdings snapshot, the transient-drop guard and the insert
+# all run in Postgres; the final row reports what was (or wasn't) recorded.
+_SQL_RECORD_PORTFOLIO_SNAPSHOT = text("""
+    WITH totals AS (
+        SELECT
+            COALESCE(SUM(current_value) FILTER (WHERE ticker = 'CASH'), 0) AS cash_balance,
+            COALESCE(SUM(current_value) FILTER (WHERE ticker <> 'CASH'), 0) AS equity_value,
+            COALESCE(SUM(total_value) FILTER (WHERE ticker <> 'CASH'), 0) AS total_invested,
+            COALESCE(SUM(gain_loss) FILTER (WHERE ticker <> 'CASH'), 0) AS total_profit_loss,
+            COALESCE(jsonb_agg(jsonb_build_object(
+                'ticker', ticker, 'shares', shares, 'purchase_price', purchase_price,
+                'current_price', current_price, 'total_value', total_value,
+                'current_value', current_value, 'gain_loss', gain_loss
+            )), '[]'::jsonb) AS holdings_snapshot
+        FROM holdings
+        WHERE is_active = TRUE AND config_hash = :config_hash
+    ),
+    latest AS (
+        SELECT timestamp, total_portfolio_value
+        FROM portfolio_history
+        WHERE config_hash = :config_hash
+        ORDER BY timestamp DESC LIMIT 1
+    ),
+    inserted AS (
+        INSERT INTO portfolio_history
+        (total_portfolio_value, cash_balance, total_invested,
+         total_profit_loss, percentage_gain, holdings_snapshot, config_hash)
+        SELECT equity_value + cash_balance, cash_balance, total_invested, total_profit_loss,
+               CASE WHEN total_invested > 0 THEN total_profit_loss / total_invested * 100 ELSE 0 END,
+               holdings_snapshot, :config_hash
+        FROM totals
+        WHERE NOT EXISTS (
+            SELECT 1 FROM latest
+            WHERE latest.total_portfolio_value <> 0
+              AND latest.timestamp > :recent_cutoff
+              AND totals.equity_value + totals.cash_balance < 0.75 * latest.total_portfolio_value
+        )
+        RETURNING id
+    )
+    SELECT totals.equity_value + totals.cash_balance AS total_portfolio_value,
+           latest.total_portfolio_value AS last_value,
+           latest.timestamp AS last_timestamp,
+           EXISTS (SELECT 1 FROM inserted) AS recorded
+    FROM totals LEFT JOIN latest ON TRUE
+""")
+
 
 def record_portfolio_snapshot():
     """Record current portfolio state for historical tracking"""
     config_hash = get_current_config_hash()
+    # Guard against transient artifacts: this writer only sees the holdings
+    # table, which mid-cycle can hold a partial view (e.g. the CASH row
+    # temporarily carrying a working figure). A >25% single-step collapse
+    # within an hour is an artifact, not a market move — skip it; the next
+    # Schwab-anchored snapshot records the true value.
     with engine.begin() as conn:
-        # Get current holdings
-        result = conn.execute(text("""
-            SELECT ticker, shares, purchase_price, current_price, 
-                   total_value, current_value, gain_loss
-            FROM holdings
-            WHERE is_active = TRUE AND config_hash = :config_hash
-        """), {"config_hash": config_hash}).fetchall()
-        
-        holdings = [dict(row._mapping) for row in result]
-        
-        # Calculate portfolio metrics
-        cash_balance = next((h["current_value"] for h in holdings if h["ticker"] == "CASH"), 0)
-        stock_holdings = [h for h in holdings if h["ticker"] != "CASH"]
-        
-        total_current_value = sum(h["current_value"] for h in stock_holdings)
-        total_invested = sum(h["total_value"] for h in stock_holdings)
-        total_profit_loss = sum(h["gain_loss"] for h in stock_holdings)
-        total_portfolio_value = total_current_value + cash_balance
-        
-        percentage_gain = (total_profit_loss / total_invested * 100) if total_invested > 0 else 0
-
-        # Guard against transient artifacts: this writer only sees the holdings
-        # table, which mid-cycle can hold a partial view (e.g. the CASH row
-        # temporarily carrying a working figure). A >25% single-step collapse
-        # within an hour is an artifact, not a market move — skip it; the next
-        # Schwab-anchored snapshot records the true value.
-        last = conn.execute(text("""
-            SELECT timestamp, total_portfolio_value FROM portfolio_history
-            WHERE config_hash = :config_hash ORDER BY timestamp DESC LIMIT 1
-        """), {"config_hash": config_hash}).fetchone()
-        if last and last.total_portfolio_value:
-            recent = (datetime.utcnow() - last.timestamp) < timedelta(hours=1)
-            if recent and total_portfolio_value < 0.75 * float(last.total_portfolio_value):
-                print(
-                    f"⚠️ Skipping portfolio snapshot: {total_portfolio_value:.2f} is a >25% "
-                    f"drop vs {float(last.total_portfolio_value):.2f} recorded "
-                    f"{last.timestamp} — transient holdings state, not a market move"
-                )
-                return
-
-        # Record snapshot
-        conn.execute(text("""
-            INSERT INTO portfolio_history
-            (total_portfolio_value, cash_balance, total_invested, 
-             total_profit_loss, percentage_gain, holdings_snapshot, config_hash)
-            VALUES (:total_portfolio_value, :cash_balance, :total_invested, 
-                    :total_profit_loss, :percentage_gain, :holdings_snapshot, :config_hash)
-        """), {
-            "total_portfolio_value": total_portfolio_value,
-            "cash_balance": cash_balance,
-            "total_invested": total_invested,
-            "total_profit_loss": total_profit_loss,
-            "percentage_gain": percentage_gain,
-            "holdings_snapshot": json.dumps(holdings),
-            "config_hash": config_hash
-        })
+        outcome = conn.execute(_SQL_RECORD_PORTFOLIO_SNAPSHOT, {
+            "config_hash": config_hash,
+            "recent_cutoff": datetime.utcnow() - timedelta(hours=1),
+        }).one()
+
+    if not outcome.recorded:
+        logger.warning(
+            "Skipping portfolio snapshot: %.2f is a >25%% drop vs %.2f recorded %s"
+            " — transient holdings state, not a market move",
+            float(outcome.total_portfolio_value), float(outcome.last_value), outcome.last_timestamp,
+        )
+        return
+    _invalidate_history_cache()
 
 # Initialize portfolio history table
 create_portfolio_history_table()
@@ -1028,31 +1485,84 @@ create_portfolio_history_table()
 
 @app.route("/")
 def dashboard():
-    # Import and ensure portfolio initialization
-    from decider_agent import fetch_holdings
-    
-    # This will trigger initialization if needed
-    holdings_data = fetch_holdings()
-    
+    cache_key = (get_current_config_hash(), SCHWAB_ENABLED)
+    with _dashboard_page_cache_lock:
+        cached = _dashboard_page_cache.get(cache_key)
+    if cached and time.monotonic() - cached[0] < DASHBOARD_PAGE_CACHE_TTL:
+        _, page, etag = cached
+    else:
+        page = _render_dashboard()
+        # Hashed once per render; revalidating browsers get a bodyless 304.
+        etag = hashlib.sha1(page.encode("utf-8")).hexdigest()
+        with _dashboard_page_cache_lock:
+            _dashboard_page_cache[cache_key] = (time.monotonic(), page, etag)
+
+    response = app.response_class(page, mimetype="text/html")
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+_SQL_SELECT_DASHBOARD_HOLDINGS = text(f"""
+    SELECT ticker, shares, purchase_price, current_price, purchase_timestamp, current_timestamp,
+           total_value, current_value, gain_loss, reason,
+           {_HOLDINGS_TOTALS_COLUMNS}
+    FROM holdings
+    WHERE is_active = TRUE AND config_hash = :config_hash
+    ORDER BY CASE WHEN ticker = 'CASH' THEN 1 ELSE 0 END, ticker
+""")
+_SQL_SELECT_ACTIVE_PROVENANCE = text("""
+    SELECT ticker, reason, purchase_timestamp FROM holdings
+    WHERE config_hash = :config_hash AND is_active = TRUE
+""")
+_SQL_DASHBOARD_BASELINE_AND_MODELS = text("""
+    SELECT
+        (SELECT row_to_json(b) FROM (
+            SELECT total_portfolio_value, cash_balance, total_invested,
+                   total_profit_loss, percentage_gain
+            FROM portfolio_history
+            WHERE config_hash = :config_hash
+            ORDER BY timestamp ASC
+            LIMIT 1
+        ) b) AS baseline,
+        (SELECT json_agg(json_build_object(
+                    'model_name', model_name,
+                    'started_at', COALESCE(to_char(started_at, 'Mon DD'), '?'),
+                    'ended_at', COALESCE(to_char(ended_at, 'Mon DD'), 'present')
+                ) ORDER BY started_at ASC)
+         FROM model_transitions
+         WHERE config_hash = :config_hash) AS model_history
+""")
+
+
+def _render_dashboard():
     config_hash = get_current_config_hash()
-    with engine.connect() as conn:
-        result = conn.execute(text("""
-            SELECT ticker, shares, purchase_price, current_price, purchase_timestamp, current_timestamp,
-                   total_value, current_value, gain_loss, reason
-            FROM holdings
-            WHERE is_active = TRUE AND config_hash = :config_hash
-            ORDER BY CASE WHEN ticker = 'CASH' THEN 1 ELSE 0 END, ticker
-        """), {"config_hash": config_hash}).fetchall()
+    trading_mode = get_trading_mode()
+
+    # Start the Schwab sync (network-bound) now so it overlaps the DB reads below.
+    schwab_future = None
+    if (
+        os.getenv("DAI_SCHWAB_LIVE_VIEW", "0") in {"1", "true", "True"}
+        or trading_mode == "live"
+        or getattr(trading_interface, "schwab_enabled", False)
+    ):
+        schwab_future = _dashboard_executor.submit(_get_cached_schwab_snapshot)
+
+    _ensure_holdings_initialized(config_hash)
+
+    # One transaction for the whole page: reads plus the live baseline/snapshot
+    # writes, each of which runs in its own savepoint (see _transaction).
+    with engine.begin() as conn:
+        result = conn.execute(_SQL_SELECT_DASHBOARD_HOLDINGS, {"config_hash": config_hash}).fetchall()
 
-        holdings = [dict(row._mapping) for row in result]
+        # Rows go to the template as-is (it only uses attribute access).
+        holdings = result
+        totals = _holdings_totals(result)
 
         # Calculate portfolio metrics (default: local DB holdings)
-        cash_balance = next((h["current_value"] for h in holdings if h["ticker"] == "CASH"), 0)
-        stock_holdings = [h for h in holdings if h["ticker"] != "CASH"]
-        
-        total_current_value = sum(h["current_value"] for h in stock_holdings)
-        total_invested = sum(h["total_value"] for h in stock_holdings)
-        total_profit_loss = sum(h["gain_loss"] for h in stock_holdings)
+        cash_balance = totals["cash"]
+        total_current_value = totals["equity_value"]
+        total_invested = totals["invested"]
+        total_profit_loss = totals["pnl"]
         # cash_balance from holdings CASH row may only reflect available trading funds;
         # Schwab path below will override with actual account value
         total_portfolio_value = total_current_value + cash_balance
@@ -1068,13 +1578,9 @@ def dashboard():
         schwab_summary = None
         use_schwab_positions = False
 
-        if (
-            os.getenv("DAI_SCHWAB_LIVE_VIEW", "0") in {"1", "true", "True"}
-            or get_trading_mode() == "live"
-            or getattr(trading_interface, "schwab_enabled", False)
-        ):
+        if schwab_future is not None:
             try:
-                schwab_data = trading_interface.sync_schwab_positions()
+                schwab_data, schwab_fresh = schwab_future.result(timeout=SCHWAB_SYNC_TIMEOUT)
                 if schwab_data.get("status") == "success":
                     positions = schwab_data.get("positions", []) or []
                     # sync_schwab_positions just persisted holdings with real buy
@@ -1082,10 +1588,7 @@ def dashboard():
                     # the dashboard shows the actual reason, not a generic label.
                     provenance = {}
                     try:
-                        prov_rows = conn.execute(text("""
-                            SELECT ticker, reason, purchase_timestamp FROM holdings
-                            WHERE config_hash = :config_hash AND is_active = TRUE
-                        """), {"config_hash": config_hash}).fetchall()
+                        prov_rows = conn.execute(_SQL_SELECT_ACTIVE_PROVENANCE, {"config_hash": config_hash}).fetchall()
                         provenance = {r.ticker: (r.reason, r.purchase_timestamp) for r in prov_rows}
                     except Exception:
                         provenance = {}
@@ -1128,9 +1631,7 @@ def dashboard():
                     funds_components = schwab_data.get("funds_available_components", {})
                     ledger_comp = schwab_data.get("ledger_components", {})
 
-                    total_invested = sum(row["total_value"] for row in holdings)
-                    total_current_value = sum(row["current_value"] for row in holdings)
-                    total_profit_loss = sum(row["gain_loss"] for row in holdings)
+                    total_current_value, total_invested, total_profit_loss = _sum_position_totals(holdings)
                     settled_cash_guardrail = schwab_data.get("settled_funds_available")
                     if settled_cash_guardrail is None:
                         settled_cash_guardrail = max(raw_cash_balance - unsettled_cash, 0.0)
@@ -1154,7 +1655,11 @@ def dashboard():
                     cash_balance = funds_available_display
 
                     # Use account valuation relative to baseline (first snapshot) for net gain/loss
-                    baseline_value = _get_live_portfolio_baseline(config_hash, total_portfolio_value)
+                    try:
+                        baseline_value = _get_live_portfolio_baseline(config_hash, total_portfolio_value, conn=conn)
+                    except Exception as baseline_error:
+                        logger.warning("Could not load live portfolio baseline: %s", baseline_error)
+                        baseline_value = total_portfolio_value
                     net_gain_loss = total_portfolio_value - baseline_value
                     initial_investment = baseline_value
                     net_percentage_gain = (net_gain_loss / baseline_value * 100) if baseline_value else 0
@@ -1196,82 +1701,74 @@ def dashboard():
                     # position "📡 Synced from Schwab" with purchase_timestamp=now on
                     # EVERY page load, so the decider saw all inventory as anonymous
                     # "synced" positions aged 0 and churned it (sold within hours).
-                    _record_live_portfolio_snapshot(
-                        config_hash,
-                        total_portfolio_value,
-                        raw_cash_balance,
-                        total_invested,
-                        total_profit_loss,
-                        holdings,
-                    )
+                    if schwab_fresh:
+                        try:
+                            _record_live_portfolio_snapshot(
+                                config_hash,
+                                total_portfolio_value,
+                                raw_cash_balance,
+                                total_invested,
+                                total_profit_loss,
+                                holdings,
+                                conn=conn,
+                            )
+                        except Exception as snapshot_error:
+                            logger.warning("Could not record live portfolio snapshot: %s", snapshot_error)
                 else:
                     warning = schwab_data.get("message") or schwab_data.get("error")
                     if warning:
-                        print(f"⚠️ Schwab sync unavailable: {warning}")
+                        logger.warning("Schwab sync unavailable: %s", warning)
             except Exception as schwab_error:
-                print(f"Error syncing Schwab data for dashboard: {schwab_error}")
+                logger.error("Error syncing Schwab data for dashboard: %s", schwab_error)
 
         # Get current system configuration with prompt versions
         try:
-            tracker = TradeOutcomeTracker()
-            summarizer_prompt = tracker.get_active_prompt('SummarizerAgent')
-            decider_prompt = tracker.get_active_prompt('DeciderAgent')
+            tracker = _get_tracker()
+            active_prompts = tracker.get_active_prompts(['SummarizerAgent', 'DeciderAgent'])
+            summarizer_prompt = active_prompts['SummarizerAgent']
+            decider_prompt = active_prompts['DeciderAgent']
             
             prompt_versions = {
                 'summarizer_version': summarizer_prompt['version'] if summarizer_prompt else 0,
                 'decider_version': decider_prompt['version'] if decider_prompt else 0
             }
         except Exception as e:
-            print(f"Error getting prompt versions: {e}")
+            logger.error("Error getting prompt versions: %s", e)
             prompt_versions = {'summarizer_version': 0, 'decider_version': 0}
         
         current_config = {
             'gpt_model': get_gpt_model(),
             'prompt_config': get_prompt_version_config(),
-            'trading_mode': get_trading_mode(),
-            'config_hash': get_current_config_hash(),
+            'trading_mode': trading_mode,
+            'config_hash': config_hash,
             'prompt_versions': prompt_versions
         }
 
-        baseline_snapshot = conn.execute(text("""
-            SELECT total_portfolio_value, cash_balance, total_invested,
-                   total_profit_loss, percentage_gain
-            FROM portfolio_history
-            WHERE config_hash = :config_hash
-            ORDER BY timestamp ASC
-            LIMIT 1
-        """), {"config_hash": config_hash}).fetchone()
+        # Baseline snapshot and model history in one round trip; psycopg2
+        # decodes the json columns straight into a dict / list.
+        try:
+            extras = conn.execute(_SQL_DASHBOARD_BASELINE_AND_MODELS, {"config_hash": config_hash}).fetchone()
+            baseline_snapshot = extras.baseline
+            model_history = extras.model_history or []
+        except Exception as e:
+            logger.error("Error loading baseline snapshot/model history: %s", e)
+            baseline_snapshot = None
+            model_history = []
 
         baseline_total_value = baseline_cash = baseline_invested = None
         baseline_profit_loss = baseline_percentage = None
         if baseline_snapshot:
-            baseline_total_value = float(baseline_snapshot.total_portfolio_value or 0.0)
-            baseline_cash = float(baseline_snapshot.cash_balance or 0.0)
-            baseline_invested = float(baseline_snapshot.total_invested or 0.0)
-            baseline_profit_loss = float(baseline_snapshot.total_profit_loss or 0.0)
-            baseline_percentage = float(baseline_snapshot.percentage_gain or 0.0)
+            baseline_total_value = float(baseline_snapshot["total_portfolio_value"] or 0.0)
+            baseline_cash = float(baseline_snapshot["cash_balance"] or 0.0)
+            baseline_invested = float(baseline_snapshot["total_invested"] or 0.0)
+            baseline_profit_loss = float(baseline_snapshot["total_profit_loss"] or 0.0)
+            baseline_percentage = float(baseline_snapshot["percentage_gain"] or 0.0)
 
         if not use_schwab_positions and baseline_total_value:
             initial_investment = baseline_total_value
             net_gain_loss = total_portfolio_value - baseline_total_value
             net_percentage_gain = (net_gain_loss / baseline_total_value * 100) if baseline_total_value else 0
 
-        # Fetch model transitions for config panel
-        try:
-            model_transitions = conn.execute(text("""
-                SELECT model_name, started_at, ended_at
-                FROM model_transitions
-                WHERE config_hash = :config_hash
-                ORDER BY started_at ASC
-            """), {"config_hash": config_hash}).fetchall()
-            model_history = [{
-                "model_name": row.model_name,
-                "started_at": row.started_at.strftime('%b %d') if row.started_at else '?',
-                "ended_at": row.ended_at.strftime('%b %d') if row.ended_at else 'present'
-            } for row in model_transitions]
-        except Exception:
-            model_history = []
-
         return render_template(
             "dashboard.html",
             active_tab="dashboard",
@@ -1297,16 +1794,118 @@ def dashboard():
 @app.template_filter('from_json')
 def from_json_filter(s):
     try:
-        return json.loads(s)
+        return _json_loads(s)
     except Exception:
         return {}
 
 
+PACIFIC_TZ = pytz.timezone('US/Pacific')
+PACIFIC_TIMESTAMP_FORMAT = "%m/%d/%Y, %I:%M:%S %p %Z"
+
+
+def _format_pacific_timestamp(timestamp):
+    """Format a DB timestamp as Pacific time (PDT/PST); naive values are already Pacific."""
+    if timestamp.tzinfo is None:
+        timestamp = PACIFIC_TZ.localize(timestamp)
+    else:
+        timestamp = timestamp.astimezone(PACIFIC_TZ)
+    return timestamp.strftime(PACIFIC_TIMESTAMP_FORMAT)
+
+
+# Server-side projection of trade_decisions.data: each object element keeps only
+# the keys _prepare_trade_run reads (absent keys stay absent, so the Python
+# defaults still apply); non-array payloads and non-object elements pass through.
+_TRADE_DATA_KEYS = (
+    "ticker", "action", "amount_usd", "shares", "total_value", "reason",
+    "execution_status", "executed_shares", "executed_price", "executed_amount",
+    "order_id", "execution_error", "kind", "considered",
+)
+_TRADE_DATA_PROJECTION = """
+    CASE WHEN jsonb_typeof(data) = 'array' THEN COALESCE((
+        SELECT jsonb_agg(
+            CASE WHEN jsonb_typeof(e) = 'object' THEN COALESCE((
+                SELECT jsonb_object_agg(kv.key, kv.value)
+                FROM jsonb_each(e) kv
+                WHERE kv.key IN ({keys})
+            ), '{{}}'::jsonb) ELSE e END
+            ORDER BY ord)
+        FROM jsonb_array_elements(data) WITH ORDINALITY AS elems(e, ord)
+    ), '[]'::jsonb) ELSE data END
+""".format(keys=", ".join(f"'{key}'" for key in _TRADE_DATA_KEYS))
+
+
+_TRADES_BASE_WHERE = "config_hash = :config_hash AND NOT has_error"
+
+# Run-level filter conditions (CASE guards jsonb_array_elements against
+# non-array payloads — CASE guarantees evaluation order, plain AND doesn't).
+_TRADES_ACTION_FILTER = """
+    AND CASE WHEN jsonb_typeof(data) = 'array' THEN EXISTS (
+        SELECT 1 FROM jsonb_array_elements(data) e
+        WHERE lower(e->>'action') = :action_filter
+    ) ELSE FALSE END
+"""
+_TRADES_FILTER_SQL = {
+    "all": "",
+    "today": " AND timestamp::date = :today_pt",
+    "buy": _TRADES_ACTION_FILTER,
+    "sell": _TRADES_ACTION_FILTER,
+    "hold": _TRADES_ACTION_FILTER,
+    "market_closed": """
+        AND CASE WHEN jsonb_typeof(data) = 'array' THEN EXISTS (
+            SELECT 1 FROM jsonb_array_elements(data) e
+            WHERE (e->>'execution_status') ILIKE '%%market%%'
+               OR (e->>'execution_status') ILIKE '%%closed%%'
+               OR (e->>'reason') ILIKE '%%market closed%%'
+        ) ELSE FALSE END
+    """,
+}
+
+# (count, page) statements per /trades filter, built once at import.
+_SQL_TRADES_BY_FILTER = {
+    name: (
+        text(f"SELECT count(*) FROM trade_decisions WHERE {_TRADES_BASE_WHERE}{condition}"),
+        text(f"""
+            SELECT id, config_hash, run_id, timestamp,
+                   {_TRADE_DATA_PROJECTION} AS data
+            FROM trade_decisions WHERE {_TRADES_BASE_WHERE}{condition}
+            ORDER BY id DESC LIMIT :limit OFFSET :offset
+        """),
+    )
+    for name, condition in _TRADES_FILTER_SQL.items()
+}
+
+_SQL_ACTIVE_POSITION_COSTS = text("""
+    SELECT ticker, shares, purchase_price FROM holdings
+    WHERE config_hash = :ch AND is_active = TRUE AND ticker != 'CASH'
+""")
+
+_SQL_TODAY_TRADE_DATA = text(f"""
+    SELECT {_TRADE_DATA_PROJECTION} AS data FROM trade_decisions
+    WHERE {_TRADES_BASE_WHERE}
+      AND timestamp::date = :today_pt
+    ORDER BY id DESC
+""")
+
+_SQL_DECISION_RUN_USAGE = text("""
+    SELECT run_id, model,
+           COALESCE(SUM(prompt_tokens), 0) AS p,
+           COALESCE(SUM(completion_tokens), 0) AS c,
+           COALESCE(SUM(total_tokens), 0) AS tokens
+    FROM api_usage
+    WHERE run_id = ANY(:rids)
+      AND agent_type IN ('DeciderAgent', 'CompanyExtractionAgent')
+    GROUP BY run_id, model
+""")
+
+_SQL_DECISION_FEEDBACK_BY_RUN = text("""
+    SELECT run_id, rating FROM decision_feedback
+    WHERE config_hash = :ch AND run_id = ANY(:rids)
+""")
+
+
 @app.route("/trades")
 def trade_decisions():
-    import pytz
     config_hash = get_current_config_hash()
-    pacific_tz = pytz.timezone('US/Pacific')
     
     # Server-side pagination BY DECISION RUN (mirrors the Summaries tab).
     # Paginating whole runs keeps each run's trade rows and its RLHF feedback /
@@ -1324,58 +1923,29 @@ def trade_decisions():
     except (TypeError, ValueError):
         page = 1
 
-    base_where = """
-        config_hash = :config_hash
-        AND data::text NOT LIKE '%%Max retries reached%%'
-        AND data::text NOT LIKE '%%API error, no response%%'
-    """
     params = {"config_hash": config_hash}
-
-    # Run-level filter conditions (CASE guards jsonb_array_elements against
-    # non-array payloads — CASE guarantees evaluation order, plain AND doesn't).
     if active_filter == "today":
-        base_where += " AND timestamp::date = :today_pt"
-        params["today_pt"] = datetime.now(pacific_tz).date()
+        params["today_pt"] = datetime.now(PACIFIC_TZ).date()
     elif active_filter in ("buy", "sell", "hold"):
-        base_where += """
-            AND CASE WHEN jsonb_typeof(data) = 'array' THEN EXISTS (
-                SELECT 1 FROM jsonb_array_elements(data) e
-                WHERE lower(e->>'action') = :action_filter
-            ) ELSE FALSE END
-        """
         params["action_filter"] = active_filter
-    elif active_filter == "market_closed":
-        base_where += """
-            AND CASE WHEN jsonb_typeof(data) = 'array' THEN EXISTS (
-                SELECT 1 FROM jsonb_array_elements(data) e
-                WHERE (e->>'execution_status') ILIKE '%%market%%'
-                   OR (e->>'execution_status') ILIKE '%%closed%%'
-                   OR (e->>'reason') ILIKE '%%market closed%%'
-            ) ELSE FALSE END
-        """
+    count_statement, page_statement = _SQL_TRADES_BY_FILTER[active_filter]
 
     with engine.connect() as conn:
-        runs_total = conn.execute(text(
-            f"SELECT count(*) FROM trade_decisions WHERE {base_where}"
-        ), params).scalar() or 0
+        runs_total = conn.execute(count_statement, params).scalar() or 0
         browsable = min(runs_total, TRADES_MAX_BROWSABLE_RUNS)
         total_pages = max(1, -(-browsable // TRADES_RUNS_PER_PAGE))  # ceil
         page = min(page, total_pages)
 
-        result = conn.execute(text(f"""
-            SELECT * FROM trade_decisions WHERE {base_where}
-            ORDER BY id DESC LIMIT :limit OFFSET :offset
-        """), {**params, "limit": TRADES_RUNS_PER_PAGE,
-               "offset": (page - 1) * TRADES_RUNS_PER_PAGE}).fetchall()
+        result = conn.execute(page_statement, {
+            **params, "limit": TRADES_RUNS_PER_PAGE,
+            "offset": (page - 1) * TRADES_RUNS_PER_PAGE,
+        }).fetchall()
         
         # Active holdings — used to resolve a filled order whose broker confirmation
         # glitched (the position exists, so the buy really filled), and to gate out
         # trades that are not yet confirmed or rejected.
         hold_map = {}
-        for hr in conn.execute(text("""
-            SELECT ticker, shares, purchase_price FROM holdings
-            WHERE config_hash = :ch AND is_active = TRUE AND ticker != 'CASH'
-        """), {"ch": config_hash}).fetchall():
+        for hr in conn.execute(_SQL_ACTIVE_POSITION_COSTS, {"ch": config_hash}).fetchall():
             hold_map[hr.ticker] = (float(hr.shares or 0), float(hr.purchase_price or 0))
 
         def _prepare_trade_run(row):
@@ -1384,18 +1954,13 @@ def trade_decisions():
             # Format timestamp in Pacific time
             timestamp = trade_dict.get('timestamp')
             if timestamp:
-                if timestamp.tzinfo is None:
-                    timestamp = pacific_tz.localize(timestamp)
-                else:
-                    timestamp = timestamp.astimezone(pacific_tz)
-                # Format with correct timezone abbreviation (PDT or PST)
-                tz_abbr = timestamp.strftime("%Z")
-                trade_dict['timestamp'] = timestamp.strftime(f"%m/%d/%Y, %I:%M:%S %p {tz_abbr}")
+                trade_dict['timestamp'] = _format_pacific_timestamp(timestamp)
             
-            # Parse JSON if data is a string
+            # JSONB arrives decoded; only legacy rows stored as a JSON string
+            # scalar still need parsing here.
             if isinstance(trade_dict['data'], str):
                 try:
-                    parsed_data = json.loads(trade_dict['data'])
+                    parsed_data = _json_loads(trade_dict['data'])
                     trade_dict['data'] = parsed_data
                 except json.JSONDecodeError:
                     # If JSON parsing fails, create empty list
@@ -1467,22 +2032,24 @@ def trade_decisions():
                                     continue  # not yet confirmed/rejected — do not write it as a trade
                         cleaned_data.append(cleaned_decision)
                     elif isinstance(decision, str):
-                        # If decision is a string, try to parse it
+                        # Only a JSON object can yield a trade row; skip anything else unparsed
+                        if not decision.lstrip().startswith('{'):
+                            continue
                         try:
-                            parsed_decision = json.loads(decision)
-                            if isinstance(parsed_decision, dict):
-                                cleaned_decision = {
-                                    'ticker': parsed_decision.get('ticker', 'N/A'),
-                                    'action': parsed_decision.get('action', 'N/A'),
-                                    'amount_usd': parsed_decision.get('amount_usd', 0),
-                                    'shares': parsed_decision.get('shares'),  # ← ADDED
-                                    'total_value': parsed_decision.get('total_value'),  # ← ADDED
-                                    'reason': parsed_decision.get('reason', 'N/A')
-                                }
-                                cleaned_data.append(cleaned_decision)
-                        except:
-                            # If parsing fails, skip this decision
+                            parsed_decision = _json_loads(decision)
+                        except ValueError:
+                            # orjson/json decode errors both subclass ValueError
                             continue
+                        if isinstance(parsed_decision, dict):
+                            cleaned_decision = {
+                                'ticker': parsed_decision.get('ticker', 'N/A'),
+                                'action': parsed_decision.get('action', 'N/A'),
+                                'amount_usd': parsed_decision.get('amount_usd', 0),
+                                'shares': parsed_decision.get('shares'),  # ← ADDED
+                                'total_value': parsed_decision.get('total_value'),  # ← ADDED
+                                'reason': parsed_decision.get('reason', 'N/A')
+                            }
+                            cleaned_data.append(cleaned_decision)
                 
                 trade_dict['data'] = cleaned_data
 
@@ -1509,15 +2076,12 @@ def trade_decisions():
         today_buys = today_sells = 0
         _failed_substrings = ('rejected', 'working', 'error', 'failed',
                               'not_filled', 'market', 'closed')
-        today_rows = conn.execute(text("""
-            SELECT * FROM trade_decisions
-            WHERE config_hash = :config_hash
-              AND data::text NOT LIKE '%%Max retries reached%%'
-              AND data::text NOT LIKE '%%API error, no response%%'
-              AND timestamp::date = :today_pt
-            ORDER BY id DESC
-        """), {"config_hash": config_hash,
-               "today_pt": datetime.now(pacific_tz).date()}).fetchall()
+        # Only the JSONB payload is needed here; psycopg2 hands it back already
+        # decoded, so no timestamp formatting or json.loads per row.
+        today_rows = conn.execute(_SQL_TODAY_TRADE_DATA, {
+            "config_hash": config_hash,
+            "today_pt": datetime.now(PACIFIC_TZ).date(),
+        }).fetchall()
         for _r in today_rows:
             for _d in _prepare_trade_run(_r).get('data') or []:
                 _exec = (_d.get('execution_status') or '').lower()
@@ -1533,17 +2097,7 @@ def trade_decisions():
         # for that run) so the Trades tab shows the $ that produced the trades.
         run_ids = [t.get('run_id') for t in trades if t.get('run_id')]
         if run_ids:
-            from config import compute_api_cost
-            cost_rows = conn.execute(text("""
-                SELECT run_id, model,
-                       COALESCE(SUM(prompt_tokens), 0) AS p,
-                       COALESCE(SUM(completion_tokens), 0) AS c,
-                       COALESCE(SUM(total_tokens), 0) AS tokens
-                FROM api_usage
-                WHERE run_id = ANY(:rids)
-                  AND agent_type IN ('DeciderAgent', 'CompanyExtractionAgent')
-                GROUP BY run_id, model
-            """), {"rids": run_ids}).fetchall()
+            cost_rows = conn.execute(_SQL_DECISION_RUN_USAGE, {"rids": run_ids}).fetchall()
             cost_by_run = {}
             for r in cost_rows:
                 acc = cost_by_run.setdefault(r.run_id, {'cost': 0.0, 'tokens': 0})
@@ -1556,10 +2110,9 @@ def trade_decisions():
 
         # Attach any human 👍/👎 RLHF rating for each decision cycle (run_id).
         if run_ids:
-            fb_rows = conn.execute(text("""
-                SELECT run_id, rating FROM decision_feedback
-                WHERE config_hash = :ch AND run_id = ANY(:rids)
-            """), {"ch": config_hash, "rids": run_ids}).fetchall()
+            fb_rows = conn.execute(
+                _SQL_DECISION_FEEDBACK_BY_RUN, {"ch": config_hash, "rids": run_ids}
+            ).fetchall()
             fb_by_run = {r.run_id: r.rating for r in fb_rows}
             for t in trades:
                 t['feedback_rating'] = fb_by_run.get(t.get('run_id')) or 0
@@ -1621,10 +2174,10 @@ def serve_screenshot(subpath):
     return send_file(full, mimetype="image/png", max_age=3600)
 
 
-def _screenshot_urls(outer_json):
+def _screenshot_urls(screenshot_paths):
     """Map a summary row's absolute screenshot paths to served URLs (existing files only)."""
     urls = []
-    for p in outer_json.get("screenshot_paths") or []:
+    for p in screenshot_paths or []:
         try:
             real = os.path.realpath(str(p))
             if real.startswith(SCREENSHOTS_ROOT + os.sep) and os.path.isfile(real):
@@ -1639,12 +2192,35 @@ SUMMARIES_PER_PAGE = 20
 # at 10k rows the worst-case offset stays trivially cheap forever.
 SUMMARIES_MAX_BROWSABLE = 10000
 
+_SQL_COUNT_SUMMARIES = text("""
+    SELECT count(*) FROM summaries
+    WHERE config_hash = :config_hash AND NOT has_error
+""")
+
+# Project only the fields the page renders straight out of the JSONB column, so
+# the (large) raw summary payload is neither shipped nor re-parsed per row.
+# Object summaries come back as headlines/insights; only legacy non-object
+# summaries (usually a JSON string) are returned whole for Python to unpack.
+_SQL_SUMMARIES_PAGE = text("""
+    SELECT id, agent, timestamp, run_id,
+           CASE WHEN jsonb_typeof(data->'summary') = 'object'
+                THEN data->'summary'->'headlines' END AS headlines,
+           CASE WHEN jsonb_typeof(data->'summary') = 'object'
+                THEN data->'summary'->'insights' END AS insights,
+           CASE WHEN jsonb_typeof(data->'summary') <> 'object'
+                THEN data->'summary' END AS summary,
+           data->'cost_usd' AS cost_usd,
+           data->'screenshot_paths' AS screenshot_paths,
+           data->>'final_url' AS final_url
+    FROM summaries
+    WHERE config_hash = :config_hash AND NOT has_error
+    ORDER BY id DESC LIMIT :limit OFFSET :offset
+""")
+
 
 @app.route("/summaries")
 def summaries():
-    import pytz
     config_hash = get_current_config_hash()
-    pacific_tz = pytz.timezone('US/Pacific')
 
     try:
         page = max(1, int(request.args.get("page", 1)))
@@ -1652,21 +2228,12 @@ def summaries():
         page = 1
 
     with engine.connect() as conn:
-        total_count = conn.execute(text("""
-            SELECT count(*) FROM summaries
-            WHERE config_hash = :config_hash
-              AND data::text NOT LIKE '%%API error, no response%%'
-        """), {"config_hash": config_hash}).scalar() or 0
+        total_count = conn.execute(_SQL_COUNT_SUMMARIES, {"config_hash": config_hash}).scalar() or 0
         browsable = min(total_count, SUMMARIES_MAX_BROWSABLE)
         total_pages = max(1, -(-browsable // SUMMARIES_PER_PAGE))  # ceil
         page = min(page, total_pages)
 
-        result = conn.execute(text("""
-            SELECT * FROM summaries
-            WHERE config_hash = :config_hash
-              AND data::text NOT LIKE '%%API error, no response%%'
-            ORDER BY id DESC LIMIT :limit OFFSET :offset
-        """), {
+        result = conn.execute(_SQL_SUMMARIES_PAGE, {
             "config_hash": config_hash,
             "limit": SUMMARIES_PER_PAGE,
             "offset": (page - 1) * SUMMARIES_PER_PAGE,
@@ -1675,37 +2242,39 @@ def summaries():
         summaries = []
         for row in result:
             try:
-                # Parse the outer JSON structure
-                outer = json.loads(row.data)
-                summary_data = outer.get("summary", {})
-                
-                # Handle case where summary_data might be a string or dict
+                # Projected JSONB fields arrive decoded; only a summary stored as
+                # an embedded JSON string still needs a parse.
+                summary_data = row.summary
+                if summary_data is None:
+                    # Object (or missing) summary: already split out by the query
+                    summary_data = {
+                        "headlines": row.headlines if row.headlines is not None else [],
+                        "insights": row.insights if row.insights is not None else "",
+                    }
+
+                # Handle case where summary_data might be a string or dict; only
+                # strings that look like JSON go through the parser.
                 if isinstance(summary_data, str):
-                    try:
-                        summary_data = json.loads(summary_data)
-                    except json.JSONDecodeError:
+                    if summary_data.lstrip()[:1] in ("{", "["):
+                        try:
+                            summary_data = _json_loads(summary_data)
+                        except json.JSONDecodeError:
+                            pass
+                    if isinstance(summary_data, str):
                         # If it's not JSON, treat it as plain text
                         summary_data = {"headlines": [], "insights": summary_data}
-                elif not isinstance(summary_data, dict):
+                if not isinstance(summary_data, dict):
                     summary_data = {"headlines": [], "insights": str(summary_data)}
 
                 # Format timestamp in Pacific time
                 timestamp = row.timestamp
                 if timestamp:
-                    # If timestamp is naive, assume it's Pacific time
-                    if timestamp.tzinfo is None:
-                        timestamp = pacific_tz.localize(timestamp)
-                    else:
-                        # Convert to Pacific time if it's in another timezone
-                        timestamp = timestamp.astimezone(pacific_tz)
-                    # Format as readable Pacific time (PDT or PST depending on season)
-                    tz_abbr = timestamp.strftime("%Z")  # Gets PDT or PST automatically
-                    formatted_timestamp = timestamp.strftime(f"%m/%d/%Y, %I:%M:%S %p {tz_abbr}")
+                    formatted_timestamp = _format_pacific_timestamp(timestamp)
                 else:
                     formatted_timestamp = "Unknown"
 
                 # Exact per-source cost stamped at write time (newer summaries).
-                stamped_cost = outer.get("cost_usd")
+                stamped_cost = row.cost_usd
                 summaries.append({
                     "agent": row.agent,
                     "run_id": getattr(row, 'run_id', None),
@@ -1713,24 +2282,21 @@ def summaries():
                     "headlines": summary_data.get("headlines", []),
                     "insights": summary_data.get("insights", ""),
                     "summary_cost": float(stamped_cost) if stamped_cost else None,
-                    "screenshots": _screenshot_urls(outer),
-                    "final_url": outer.get("final_url"),
+                    "screenshots": _screenshot_urls(row.screenshot_paths),
+                    "final_url": row.final_url,
                 })
             except Exception as e:
-                print(f"Failed to parse summary row {row.id}: {e}")
-                print(f"Raw data: {row.data[:200]}...")
+                logger.warning("Failed to parse summary row %s: %s (raw summary: %.200s...)", row.id, e, row.summary)
                 continue
 
         # Per-summary cost: one summarizer call == one source summary. Summaries
         # and api_usage record run_ids that can drift by ~1s, so match each
         # summary to the NEAREST summarizer cycle by timestamp and use that
         # cycle's per-call cost (cycle summarizer spend ÷ calls in the cycle).
-        from config import compute_api_cost
-        from datetime import datetime as _dt
 
         def _parse_rid(rid):
             try:
-                return _dt.strptime(str(rid), "%Y%m%dT%H%M%S")
+                return datetime.strptime(str(rid), "%Y%m%dT%H%M%S")
             except (ValueError, TypeError):
                 return None
 
@@ -1768,46 +2334,88 @@ def summaries():
                                page=page, total_pages=total_pages,
                                total_count=total_count)
 
+def _load_prompt_versions():
+    """Active Summarizer/Decider prompt versions for /api/configuration."""
+    summarizer_prompt = get_active_prompt_emergency_patch('SummarizerAgent')
+    decider_prompt = get_active_prompt_emergency_patch('DeciderAgent')
+    return {
+        'summarizer_version': summarizer_prompt['version'] if summarizer_prompt else 0,
+        'decider_version': decider_prompt['version'] if decider_prompt else 0
+    }
+
 @app.route("/api/configuration")
 def api_configuration():
     """Get current system configuration"""
     try:
+        config_hash = get_current_config_hash()
         # Get current prompt versions
         try:
-            from prompt_manager import get_active_prompt_emergency_patch
-            summarizer_prompt = get_active_prompt_emergency_patch('SummarizerAgent')
-            decider_prompt = get_active_prompt_emergency_patch('DeciderAgent')
-            
-            prompt_versions = {
-                'summarizer_version': summarizer_prompt['version'] if summarizer_prompt else 0,
-                'decider_version': decider_prompt['version'] if decider_prompt else 0
-            }
+            prompt_versions = _get_cached_prompt_data("versions", config_hash, _load_prompt_versions)
         except Exception as e:
-            print(f"Error getting unified prompt versions: {e}")
+            logger.error("Error getting unified prompt versions: %s", e)
             prompt_versions = {'summarizer_version': 0, 'decider_version': 0}
         
         current_config = {
             'gpt_model': get_gpt_model(),
             'prompt_config': get_prompt_version_config(),
             'trading_mode': get_trading_mode(),
-            'config_hash': get_current_config_hash(),
+            'config_hash': config_hash,
             'prompt_versions': prompt_versions
         }
         return jsonify(current_config)
     except Exception as e:
         return jsonify({'error': str(e)})
 
+# Statements for the polled /api/* endpoints, built once at import so each
+# request reuses the same construct (and its compiled-cache entry).
+_SQL_MODEL_TRANSITIONS = text("""
+    SELECT model_name, started_at, ended_at, notes
+    FROM model_transitions
+    WHERE config_hash = :config_hash
+    ORDER BY started_at ASC
+""")
+
+_SQL_ACTIVE_HOLDINGS = text("""
+    SELECT * FROM holdings WHERE is_active = TRUE AND config_hash = :config_hash
+""")
+
+_SQL_ACTIVE_HOLDING_TICKERS = text("""
+    SELECT ticker FROM holdings
+    WHERE is_active = TRUE AND ticker != 'CASH' AND config_hash = :config_hash
+""")
+
+_SQL_TICKER_VALUE_HISTORY = text("""
+    SELECT current_price_timestamp, current_value FROM holdings
+    WHERE ticker = :ticker AND config_hash = :config_hash AND is_active = TRUE
+    ORDER BY current_price_timestamp ASC
+""")
+
+_SQL_TOTAL_VALUE_HISTORY = text("""
+    SELECT current_timestamp, SUM(current_value) AS total_value
+    FROM holdings
+    WHERE config_hash = :config_hash AND is_active = TRUE
+    GROUP BY current_timestamp ORDER BY current_timestamp ASC
+""")
+
+_SQL_PROFIT_LOSS = text("""
+    SELECT ticker, shares, purchase_price, current_price,
+           total_value, current_value, gain_loss,
+           CASE
+               WHEN total_value > 0 THEN (gain_loss / total_value * 100)
+               ELSE 0
+           END as percentage_gain
+    FROM holdings
+    WHERE is_active = TRUE AND ticker != 'CASH' AND config_hash = :config_hash
+    ORDER BY gain_loss DESC
+""")
+
+
 @app.route("/api/model-transitions")
 def api_model_transitions():
     config_hash = request.args.get("config_hash", get_current_config_hash())
     try:
         with engine.connect() as conn:
-            rows = conn.execute(text("""
-                SELECT model_name, started_at, ended_at, notes
-                FROM model_transitions
-                WHERE config_hash = :config_hash
-                ORDER BY started_at ASC
-            """), {"config_hash": config_hash}).fetchall()
+            rows = conn.execute(_SQL_MODEL_TRANSITIONS, {"config_hash": config_hash}).fetchall()
             return jsonify([{
                 "model_name": row.model_name,
                 "started_at": row.started_at.isoformat() if row.started_at else None,
@@ -1821,32 +2429,43 @@ def api_model_transitions():
 @app.route("/api/holdings")
 def api_holdings():
     config_hash = get_current_config_hash()
-    with engine.connect() as conn:
-        result = conn.execute(text("""
-            SELECT * FROM holdings WHERE is_active = TRUE AND config_hash = :config_hash
-        """), {"config_hash": config_hash}).fetchall()
-        return jsonify([dict(row._mapping) for row in result])
+
+    def load():
+        with engine.connect() as conn:
+            return conn.execute(_SQL_ACTIVE_HOLDINGS, {"config_hash": config_hash}).mappings().all()
+
+    return jsonify(_get_polled_result(("holdings", config_hash), load))
 
 @app.route('/api/sparklines')
 def api_sparklines():
     """Return 5-day price history for each active holding (for sparkline charts)."""
     config_hash = get_current_config_hash()
     with engine.connect() as conn:
-        result = conn.execute(text("""
-            SELECT ticker FROM holdings
-            WHERE is_active = TRUE AND ticker != 'CASH' AND config_hash = :config_hash
-        """), {"config_hash": config_hash}).fetchall()
+        result = conn.execute(_SQL_ACTIVE_HOLDING_TICKERS, {"config_hash": config_hash}).fetchall()
         tickers = [row.ticker for row in result if row.ticker]
 
     sparklines = {}
+    if not tickers:
+        return jsonify(sparklines)
+
+    # One batched download for every holding instead of a history() round trip per ticker.
+    try:
+        df = yf.download(
+            tickers, period="5d", group_by="ticker", auto_adjust=True,
+            progress=False, threads=True,
+        )
+    except Exception as e:
+        logger.warning("Sparkline download failed for %s: %s", tickers, e)
+        return jsonify(sparklines)
+
     for ticker in tickers:
         try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period="5d")
-            if hist is not None and not hist.empty:
-                sparklines[ticker] = [round(float(p), 2) for p in hist['Close'].tolist()]
+            sub = df[ticker] if df.columns.nlevels > 1 else df
+            closes = sub['Close'].dropna()
+            if len(closes) > 0:
+                sparklines[ticker] = [round(float(p), 2) for p in closes.tolist()]
         except Exception as e:
-            print(f"Sparkline error for {ticker}: {e}")
+            logger.warning("Sparkline error for %s: %s", ticker, e)
             continue
 
     return jsonify(sparklines)
@@ -1855,79 +2474,132 @@ def api_sparklines():
 def api_history():
     ticker = request.args.get("ticker")
     config_hash = get_current_config_hash()
+
+    def load():
+        with engine.connect() as conn:
+            if ticker:
+                result = conn.execute(
+                    _SQL_TICKER_VALUE_HISTORY, {"ticker": ticker, "config_hash": config_hash}
+                )
+            else:
+                result = conn.execute(_SQL_TOTAL_VALUE_HISTORY, {"config_hash": config_hash})
+            return result.mappings().all()
+
+    return jsonify(_get_polled_result(("history", config_hash, ticker), load))
+
+HISTORY_STREAM_BATCH_SIZE = 500
+
+# Both history endpoints have Postgres render each row as a finished JSON object
+# (timestamps in isoformat-compatible text), so Python only concatenates them.
+_ISO_TIMESTAMP = """to_char(timestamp, 'YYYY-MM-DD"T"HH24:MI:SS.US')"""
+
+_SQL_PORTFOLIO_HISTORY = text(f"""
+    SELECT json_build_object(
+               'timestamp', {_ISO_TIMESTAMP},
+               'total_portfolio_value', total_portfolio_value,
+               'total_invested', total_invested,
+               'total_profit_loss', total_profit_loss,
+               'percentage_gain', percentage_gain,
+               'cash_balance', cash_balance
+           )::text AS payload
+    FROM portfolio_history
+    WHERE config_hash = :config_hash
+    ORDER BY timestamp ASC
+""")
+
+
+# Gain/loss relative to the config's first snapshot, computed in one window pass
+_SQL_PORTFOLIO_PERFORMANCE = text(f"""
+    SELECT json_build_object(
+               'timestamp', {_ISO_TIMESTAMP},
+               'total_portfolio_value', total_value,
+               'cash_balance', cash_balance,
+               'net_gain_loss', total_value - base,
+               'net_percentage_gain',
+                   CASE WHEN base <> 0 THEN (total_value - base) / base * 100 ELSE 0 END
+           )::text AS payload
+    FROM (
+        SELECT timestamp,
+               COALESCE(total_portfolio_value, 0)::float8 AS total_value,
+               COALESCE(cash_balance, 0)::float8 AS cash_balance,
+               COALESCE(FIRST_VALUE(total_portfolio_value)
+                   OVER (ORDER BY timestamp ASC), 0)::float8 AS base
+        FROM portfolio_history
+        WHERE config_hash = :config_hash
+    ) h
+    ORDER BY timestamp ASC
+""")
+
+
+def _stream_json_payloads(statement, params):
+    """Yield each row's pre-rendered ``payload`` JSON text through a server-side cursor."""
     with engine.connect() as conn:
-        if ticker:
-            result = conn.execute(text("""
-                SELECT current_price_timestamp, current_value FROM holdings
-                WHERE ticker = :ticker AND config_hash = :config_hash 
-                ORDER BY current_price_timestamp ASC
-            """), {"ticker": ticker, "config_hash": config_hash}).fetchall()
-        else:
-            result = conn.execute(text("""
-                SELECT current_timestamp, SUM(current_value) AS total_value
-                FROM holdings
-                WHERE config_hash = :config_hash
-                GROUP BY current_timestamp ORDER BY current_timestamp ASC
-            """), {"config_hash": config_hash}).fetchall()
+        result = conn.execution_options(
+            stream_results=True, yield_per=HISTORY_STREAM_BATCH_SIZE
+        ).execute(statement, params)
+        for row in result:
+            yield row.payload
+
+
+def _json_array_response(payloads):
+    """Stream an iterable of JSON texts as a JSON array response."""
+    def generate():
+        separator = ""
+        yield "["
+        for payload in payloads:
+            yield separator + payload
+            separator = ","
+        yield "]\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
+
+
+def _cached_history_response(cache_key, statement, params):
+    """Serve a portfolio history array from _history_cache, streaming and filling it on a miss."""
+    with _history_cache_lock:
+        cached = _history_cache.get(cache_key)
+        generation = _history_cache_generation
+    if cached and time.monotonic() - cached[0] < HISTORY_CACHE_TTL:
+        return Response(cached[1], mimetype="application/json")
+
+    def fill(payloads):
+        # Keep the rendered rows while they stream out; cache the body once complete.
+        # Past HISTORY_CACHE_MAX_ROWS the buffer is dropped and the body isn't cached.
+        rows = []
+        for payload in payloads:
+            if rows is not None:
+                rows.append(payload)
+                if len(rows) > HISTORY_CACHE_MAX_ROWS:
+                    rows = None
+            yield payload
+        if rows is None:
+            return
+        body = "[" + ",".join(rows) + "]\n"
+        now = time.monotonic()
+        with _history_cache_lock:
+            if generation == _history_cache_generation:
+                for stale_key in [k for k, (ts, _) in _history_cache.items() if now - ts >= HISTORY_CACHE_TTL]:
+                    del _history_cache[stale_key]
+                _history_cache[cache_key] = (now, body)
+
+    return _json_array_response(fill(_stream_json_payloads(statement, params)))
 
-        return jsonify([dict(row._mapping) for row in result])
 
 @app.route("/api/portfolio-history")
 def api_portfolio_history():
     """Get portfolio performance over time - strictly filtered by current config"""
     config_hash = get_current_config_hash()
-    with engine.connect() as conn:
-        result = conn.execute(text("""
-            SELECT timestamp, total_portfolio_value, total_invested, 
-                   total_profit_loss, percentage_gain, cash_balance
-            FROM portfolio_history 
-            WHERE config_hash = :config_hash
-            ORDER BY timestamp ASC
-        """), {"config_hash": config_hash}).fetchall()
-
-    payload = []
-    for row in result:
-        record = dict(row._mapping)
-        ts = record.get("timestamp")
-        if isinstance(ts, datetime):
-            record["timestamp"] = ts.isoformat()
-        payload.append(record)
-
-    return jsonify(payload)
+    return _cached_history_response(
+        ("history", config_hash), _SQL_PORTFOLIO_HISTORY, {"config_hash": config_hash}
+    )
 
 @app.route("/api/portfolio-performance")
 def api_portfolio_performance():
     """Get portfolio performance relative to initial $10,000 investment - strictly filtered by current config"""
     config_hash = get_current_config_hash()
-
-    with engine.connect() as conn:
-        result = conn.execute(text("""
-            SELECT timestamp, total_portfolio_value, cash_balance,
-                   total_invested, total_profit_loss
-            FROM portfolio_history 
-            WHERE config_hash = :config_hash
-            ORDER BY timestamp ASC
-        """), {"config_hash": config_hash}).fetchall()
-
-    rows = [dict(row._mapping) for row in result]
-    if not rows:
-        return jsonify([])
-
-    base = rows[0]["total_portfolio_value"] or 0
-    output = []
-    for row in rows:
-        total_value = float(row.get("total_portfolio_value") or 0)
-        net_gain_loss = total_value - base
-        net_percentage = (net_gain_loss / base * 100) if base else 0
-        output.append({
-            "timestamp": row.get("timestamp").isoformat() if isinstance(row.get("timestamp"), datetime) else row.get("timestamp"),
-            "total_portfolio_value": total_value,
-            "cash_balance": float(row.get("cash_balance") or 0),
-            "net_gain_loss": net_gain_loss,
-            "net_percentage_gain": net_percentage,
-        })
-
-    return jsonify(output)
+    return _cached_history_response(
+        ("performance", config_hash), _SQL_PORTFOLIO_PERFORMANCE, {"config_hash": config_hash}
+    )
 
 
 @app.route("/api/prompts/reset", methods=["POST"])
@@ -1964,6 +2636,7 @@ def api_reset_prompts_to_baseline():
                 except ValueError as exc:
                     changes.append({"agent_type": agent, "error": str(exc), "changed": False})
 
+        _invalidate_prompt_caches()
         return jsonify({
             "status": "success",
             "batch_id": batch_id,
@@ -1983,6 +2656,7 @@ def api_undo_prompt_activation():
     """
     try:
         result = undo_last_prompt_activation(get_current_config_hash(), actor="dashboard")
+        _invalidate_prompt_caches()
         status_code = 200 if result.get("undone") else 404
         return jsonify({"status": "success" if result.get("undone") else "noop", **result}), status_code
     except Exception as exc:
@@ -2007,19 +2681,7 @@ def api_profit_loss():
     """Get current profit/loss breakdown by holding"""
     config_hash = get_current_config_hash()
     with engine.connect() as conn:
-        result = conn.execute(text("""
-            SELECT ticker, shares, purchase_price, current_price,
-                   total_value, current_value, gain_loss,
-                   CASE 
-                       WHEN total_value > 0 THEN (gain_loss / total_value * 100)
-                       ELSE 0 
-                   END as percentage_gain
-            FROM holdings
-            WHERE is_active = TRUE AND ticker != 'CASH' AND config_hash = :config_hash
-            ORDER BY gain_loss DESC
-        """), {"config_hash": config_hash}).fetchall()
-        
-        return jsonify([dict(row._mapping) for row in result])
+        return jsonify(conn.execute(_SQL_PROFIT_LOSS, {"config_hash": config_hash}).mappings().all())
 
 @app.route('/api/cost-usage')
 def get_cost_usage():
@@ -2036,7 +2698,6 @@ def get_cost_usage():
         except (TypeError, ValueError):
             days = 14
 
-        from config import load_model_pricing, compute_api_cost
         pricing = load_model_pricing()
         priced_models = [m for m, r in pricing.items()
                          if isinstance(r, dict) and (r.get('input') or r.get('output'))]
@@ -2056,8 +2717,7 @@ def get_cost_usage():
                 GROUP BY agent_type, model, ts::date
             """), {"h": config_hash, "days": days}).fetchall()
 
-        from datetime import date as _date
-        today_str = _date.today().isoformat()
+        today_str = date.today().isoformat()
         per_agent = {}
         daily_map = {}
         today_cost = today_tokens = today_calls = 0.0
@@ -2122,7 +2782,7 @@ def get_feedback_benchmarks():
 def get_feedback_data():
     """Get feedback analysis data"""
     try:
-        tracker = TradeOutcomeTracker()
+        tracker = _get_tracker()
         
         # Get recent feedback (gracefully handle missing AI key)
         try:
@@ -2143,9 +2803,10 @@ def get_feedback_data():
                 periods = parsed[:12]  # cap to keep the chart readable
         period_data = {}
 
+        # Compute metrics without AI call to avoid API failures impacting the dashboard
+        metrics_by_period = tracker.compute_outcomes_metrics_by_period(periods)
         for days in periods:
-            # Compute metrics without AI call to avoid API failures impacting the dashboard
-            metrics = tracker.compute_recent_outcomes_metrics(days_back=days)
+            metrics = metrics_by_period[days]
             period_data[f'{days}d'] = {
                 'total_trades': metrics['total_trades'],
                 'success_rate': metrics['success_rate'],
@@ -2199,55 +2860,58 @@ def get_trade_outcomes():
     except Exception as e:
         return jsonify({'error': str(e)})
 
+# Latest 100 feedback analyses and 50 instruction updates, merged newest-first
+_SQL_FEEDBACK_LOG = text("""
+    (SELECT 'feedback_analysis' AS type, analysis_timestamp AS ts,
+            lookback_period_days, total_trades_analyzed, success_rate,
+            avg_profit_percentage, summarizer_feedback, decider_feedback,
+            NULL AS agent_type, NULL AS reason_for_update, NULL AS performance_trigger
+     FROM agent_feedback
+     WHERE config_hash = :config_hash
+     ORDER BY analysis_timestamp DESC
+     LIMIT 100)
+    UNION ALL
+    (SELECT 'instruction_update', update_timestamp,
+            NULL, NULL, NULL, NULL, NULL, NULL,
+            agent_type, reason_for_update, performance_trigger
+     FROM agent_instruction_updates
+     WHERE config_hash = :config_hash
+     ORDER BY update_timestamp DESC
+     LIMIT 50)
+    ORDER BY ts DESC NULLS LAST
+""")
+
+
 @app.route('/api/feedback_log')
 def get_feedback_log():
     """Get feedback log with timestamps"""
     try:
         with engine.connect() as conn:
-            # Get agent feedback entries
             config_hash = get_current_config_hash()
-            feedback_result = conn.execute(text("""
-                SELECT analysis_timestamp, lookback_period_days, total_trades_analyzed,
-                       success_rate, avg_profit_percentage, summarizer_feedback, decider_feedback
-                FROM agent_feedback 
-                WHERE config_hash = :config_hash
-                ORDER BY analysis_timestamp DESC 
-                LIMIT 100
-            """), {"config_hash": config_hash}).fetchall()
-            
-            # Get instruction updates
-            instruction_result = conn.execute(text("""
-                SELECT agent_type, update_timestamp, reason_for_update, performance_trigger
-                FROM agent_instruction_updates 
-                WHERE config_hash = :config_hash
-                ORDER BY update_timestamp DESC 
-                LIMIT 50
-            """), {"config_hash": config_hash}).fetchall()
+            result = conn.execute(_SQL_FEEDBACK_LOG, {"config_hash": config_hash}).fetchall()
             
             feedback_log = []
-            for row in feedback_result:
-                feedback_log.append({
-                    'type': 'feedback_analysis',
-                    'timestamp': row.analysis_timestamp.isoformat() if row.analysis_timestamp else None,
-                    'lookback_days': row.lookback_period_days,
-                    'trades_analyzed': row.total_trades_analyzed,
-                    'success_rate': float(row.success_rate) * 100,
-                    'avg_profit': float(row.avg_profit_percentage) * 100,
-                    'summarizer_feedback': row.summarizer_feedback,
-                    'decider_feedback': row.decider_feedback
-                })
-            
-            for row in instruction_result:
-                feedback_log.append({
-                    'type': 'instruction_update',
-                    'timestamp': row.update_timestamp.isoformat() if row.update_timestamp else None,
-                    'agent_type': row.agent_type,
-                    'reason': row.reason_for_update,
-                    'performance_trigger': row.performance_trigger
-                })
-            
-            # Sort by timestamp descending
-            feedback_log.sort(key=lambda x: x['timestamp'], reverse=True)
+            for row in result:
+                timestamp = row.ts.isoformat() if row.ts else None
+                if row.type == 'feedback_analysis':
+                    feedback_log.append({
+                        'type': 'feedback_analysis',
+                        'timestamp': timestamp,
+                        'lookback_days': row.lookback_period_days,
+                        'trades_analyzed': row.total_trades_analyzed,
+                        'success_rate': float(row.success_rate) * 100,
+                        'avg_profit': float(row.avg_profit_percentage) * 100,
+                        'summarizer_feedback': row.summarizer_feedback,
+                        'decider_feedback': row.decider_feedback
+                    })
+                else:
+                    feedback_log.append({
+                        'type': 'instruction_update',
+                        'timestamp': timestamp,
+                        'agent_type': row.agent_type,
+                        'reason': row.reason_for_update,
+                        'performance_trigger': row.performance_trigger
+                    })
             
             return jsonify(feedback_log)
     except Exception as e:
@@ -2267,8 +2931,7 @@ def generate_ai_feedback():
             return jsonify({'error': 'agent_type is required'}), 400
         
         # Initialize feedback tracker
-        from feedback_agent import TradeOutcomeTracker
-        feedback_tracker = TradeOutcomeTracker()
+        feedback_tracker = _get_tracker()
         
         # Generate AI feedback
         result = feedback_tracker.generate_ai_feedback_response(
@@ -2286,8 +2949,7 @@ def generate_ai_feedback():
 def get_ai_feedback_responses():
     """Get recent AI feedback responses"""
     try:
-        from feedback_agent import TradeOutcomeTracker
-        feedback_tracker = TradeOutcomeTracker()
+        feedback_tracker = _get_tracker()
         
         limit = request.args.get('limit', 50, type=int)
         responses = feedback_tracker.get_recent_ai_feedback_responses(limit=limit)
@@ -2300,8 +2962,6 @@ def get_ai_feedback_responses():
 def get_prompts(agent_type):
     """Get prompt history for an agent type using UNIFIED approach"""
     try:
-        from prompt_manager import get_active_prompt_emergency_patch
-        from config import get_current_config_hash
         
         config_hash = get_current_config_hash()
         
@@ -2328,8 +2988,7 @@ def get_prompts(agent_type):
             print(f"Emergency patch failed: {e}")
         
         # Fallback to original method
-        from feedback_agent import TradeOutcomeTracker
-        feedback_tracker = TradeOutcomeTracker()
+        feedback_tracker = _get_tracker()
         
         limit = request.args.get('limit', 10, type=int)
         prompts = feedback_tracker.get_prompt_history(agent_type, limit=limit)
@@ -2342,7 +3001,6 @@ def get_prompts(agent_type):
 def get_active_prompt(agent_type):
     """Get the currently active prompt for an agent type using UNIFIED approach"""
     try:
-        from prompt_manager import get_active_prompt_emergency_patch
         
         prompt = get_active_prompt_emergency_patch(agent_type)
         
@@ -2369,8 +3027,7 @@ def get_active_prompt(agent_type):
 def save_prompt(agent_type):
     """Save a new prompt version for an agent type"""
     try:
-        from feedback_agent import TradeOutcomeTracker
-        feedback_tracker = TradeOutcomeTracker()
+        feedback_tracker = _get_tracker()
         
         data = request.get_json()
         user_prompt = data.get('user_prompt')
@@ -2405,6 +3062,7 @@ def save_prompt(agent_type):
                 save_kwargs.pop('strategy_directives', None)
                 version = feedback_tracker.save_prompt_version(**save_kwargs)
         
+        _invalidate_prompt_caches()
         return jsonify({
             'success': True,
             'version': version,
@@ -2455,10 +3113,6 @@ def trigger_summarizer():
                 orchestrator.run_summarizer_agents()
             except Exception as e:
                 print(f"Error in manual summarizer run: {e}")
-            finally:
-                # Clean up resources
-                import gc
-                gc.collect()
         
         thread = threading.Thread(target=run_summarizer, daemon=True, name="ManualSummarizer")
         thread.start()
@@ -2483,10 +3137,6 @@ def trigger_decider():
                 orchestrator.run_decider_agent(force=True)
             except Exception as e:
                 print(f"Error in manual decider run: {e}")
-            finally:
-                # Clean up resources
-                import gc
-                gc.collect()
         
         thread = threading.Thread(target=run_decider, daemon=True, name="ManualDecider")
         thread.start()
@@ -2510,10 +3160,6 @@ def trigger_feedback():
                 orchestrator.run_feedback_agent()
             except Exception as e:
                 print(f"Error in manual feedback run: {e}")
-            finally:
-                # Clean up resources
-                import gc
-                gc.collect()
         
         thread = threading.Thread(target=run_feedback, daemon=True, name="ManualFeedback")
         thread.start()
@@ -2525,6 +3171,21 @@ def trigger_feedback():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Concurrent per-ticker fallbacks when the manual price update's batched download misses.
+PRICE_FETCH_WORKERS = int(os.environ.get("DAI_PRICE_FETCH_WORKERS", "8"))
+
+# One statement for every refreshed ticker; psycopg2 adapts the lists to arrays.
+_SQL_BATCH_UPDATE_HOLDING_PRICES = text("""
+    UPDATE holdings AS h
+    SET current_price = v.price,
+        current_value = h.shares * v.price,
+        gain_loss = (h.shares * v.price) - h.total_value,
+        current_price_timestamp = :current_price_timestamp
+    FROM unnest(CAST(:tickers AS text[]), CAST(:prices AS float8[])) AS v(ticker, price)
+    WHERE h.ticker = v.ticker AND h.config_hash = :config_hash
+""")
+
+
 @app.route('/api/trigger/price-update', methods=['POST'])
 def trigger_price_update():
     """Manually trigger price updates for all holdings"""
@@ -2532,44 +3193,39 @@ def trigger_price_update():
         try:
             print("=== Manual Price Update Triggered ===")
             config_hash = get_current_config_hash()
-            with engine.begin() as conn:
-                result = conn.execute(text("SELECT ticker FROM holdings WHERE is_active = TRUE AND ticker != 'CASH' AND config_hash = :config_hash"), {"config_hash": config_hash})
+            with engine.connect() as conn:
+                result = conn.execute(_SQL_ACTIVE_HOLDING_TICKERS, {"config_hash": config_hash})
                 tickers = [row.ticker for row in result]
-                
-                updated_count = 0
-                for ticker in tickers:
-                    try:
-                        price = get_current_price_robust(ticker)
-                        if price is None:
-                            print(f"⚠️  Could not get price for {ticker}")
-                            continue
 
-                        now = datetime.utcnow()
-                        conn.execute(text("""
-                            UPDATE holdings
-                            SET current_price = :price,
-                                current_value = shares * :price,
-                                gain_loss = (shares * :price) - total_value,
-                                current_price_timestamp = :current_price_timestamp
-                            WHERE ticker = :ticker AND config_hash = :config_hash"""), {
-                                "price": price,
-                                "current_price_timestamp": now,
-                                "ticker": ticker,
-                                "config_hash": config_hash
-                            })
-                        print(f"✅ Updated {ticker}: ${price:.2f}")
-                        updated_count += 1
-                    except Exception as e:
-                        print(f"❌ Failed to update {ticker}: {e}")
-                
-                # Record portfolio snapshot after updates
-                try:
-                    record_portfolio_snapshot()
-                    print("📊 Portfolio snapshot recorded")
-                except Exception as e:
-                    print(f"❌ Failed to record portfolio snapshot: {e}")
-                
-                print(f"🎯 Manual price update completed: {updated_count} holdings updated")
+            # Fetch outside the transaction so no DB connection is held on network I/O
+            prices = {}
+            fetched = get_current_prices_bulk(tickers, fallback_workers=PRICE_FETCH_WORKERS)
+            for ticker, price in fetched.items():
+                if price is None:
+                    print(f"⚠️  Could not get price for {ticker}")
+                    continue
+                prices[ticker] = price
+
+            if prices:
+                with engine.begin() as conn:
+                    conn.execute(_SQL_BATCH_UPDATE_HOLDING_PRICES, {
+                        "tickers": list(prices),
+                        "prices": [float(price) for price in prices.values()],
+                        "current_price_timestamp": datetime.utcnow(),
+                        "config_hash": config_hash,
+                    })
+                for ticker, price in prices.items():
+                    print(f"✅ Updated {ticker}: ${price:.2f}")
+
+            # Record portfolio snapshot after updates
+            try:
+                record_portfolio_snapshot()
+                print("📊 Portfolio snapshot recorded")
+            except Exception as e:
+                print(f"❌ Failed to record portfolio snapshot: {e}")
+
+            print(f"🎯 Manual price update completed: {len(prices)} holdings updated")
+            _invalidate_dashboard_cache()
         except Exception as e:
             print(f"Error in manual price update: {e}")
     
@@ -2583,16 +3239,10 @@ def trigger_price_update():
 @app.route('/api/trigger/<agent_type>', methods=['POST'])
 def trigger_agent(agent_type):
     """Generic route to trigger different agent types"""
-    if agent_type == 'all':
-        return trigger_all()
-    elif agent_type == 'summarizer':
-        return trigger_summarizer()
-    elif agent_type == 'decider':
-        return trigger_decider()
-    elif agent_type == 'feedback':
-        return trigger_feedback()
-    else:
+    handler = _TRIGGER_HANDLERS.get(agent_type)
+    if handler is None:
         return jsonify({'error': f'Unknown agent type: {agent_type}'}), 400
+    return handler()
 
 @app.route('/api/trigger/all', methods=['POST'])
 def trigger_all():
@@ -2629,7 +3279,6 @@ def trigger_all():
                 thread_config_hash = config_hash  # Use the hash from the outer scope
 
                 # Ensure config hash is available in this thread
-                import os
                 os.environ['CURRENT_CONFIG_HASH'] = thread_config_hash
 
                 print("🚀 Starting manual run of all agents...")
@@ -2683,7 +3332,6 @@ def trigger_all():
 
             except Exception as e:
                 print(f"❌ Error in manual all agents run: {type(e).__name__}: {e}")
-                import traceback
                 traceback.print_exc()
 
                 # Mark as failed (may already be set by per-step handler above)
@@ -2700,7 +3348,7 @@ def trigger_all():
                             INSERT INTO system_runs (run_type, status, details)
                             VALUES ('run_all_agents', 'failed', :details)
                         """), {
-                            "details": json.dumps({
+                            "details": _json_dumps({
                                 "error": str(e),
                                 "config_hash": thread_config_hash,
                                 "timestamp": datetime.now().isoformat()
@@ -2708,10 +3356,6 @@ def trigger_all():
                         })
                 except:
                     pass  # Don't let error logging cause more errors
-            finally:
-                # Clean up resources to prevent semaphore leaks
-                import gc
-                gc.collect()
 
         thread = threading.Thread(target=run_all, daemon=True, name="ManualAllAgents")
         thread.start()
@@ -2729,39 +3373,55 @@ def trigger_all():
         return jsonify({'error': str(e)}), 500
 
 
+# Agent names accepted by /api/trigger/<agent_type>
+_TRIGGER_HANDLERS = {
+    'all': trigger_all,
+    'summarizer': trigger_summarizer,
+    'decider': trigger_decider,
+    'feedback': trigger_feedback,
+}
+
+
 @app.route('/api/trigger/all/status')
 def trigger_all_status():
     """Get the current status of the manual Run All operation"""
     with _manual_run_lock:
         return jsonify(dict(_manual_run_state))
 
+_SQL_RECENT_RUNS = text("""
+    SELECT run_type, start_time, end_time, status,
+           details->>'error' as error,
+           details->>'config_hash' as config_hash
+    FROM system_runs
+    WHERE start_time > CURRENT_TIMESTAMP - INTERVAL '1 hour'
+    ORDER BY start_time DESC
+    LIMIT 10
+""")
+
+
+def _load_recent_runs():
+    """Runs started in the last hour, newest first, for /api/run-status."""
+    with engine.connect() as conn:
+        result = conn.execute(_SQL_RECENT_RUNS)
+        
+        runs = []
+        for row in result:
+            runs.append({
+                'run_type': row.run_type,
+                'start_time': row.start_time.isoformat() if row.start_time else None,
+                'end_time': row.end_time.isoformat() if row.end_time else None,
+                'status': row.status,
+                'error': row.error,
+                'config_hash': row.config_hash
+            })
+        return runs
+
+
 @app.route('/api/run-status')
 def get_run_status():
     """Get status of recent runs to debug issues"""
     try:
-        with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT run_type, start_time, end_time, status, 
-                       details->>'error' as error,
-                       details->>'config_hash' as config_hash
-                FROM system_runs 
-                WHERE start_time > CURRENT_TIMESTAMP - INTERVAL '1 hour'
-                ORDER BY start_time DESC
-                LIMIT 10
-            """))
-            
-            runs = []
-            for row in result:
-                runs.append({
-                    'run_type': row.run_type,
-                    'start_time': row.start_time.isoformat() if row.start_time else None,
-                    'end_time': row.end_time.isoformat() if row.end_time else None,
-                    'status': row.status,
-                    'error': row.error,
-                    'config_hash': row.config_hash
-                })
-            
-            return jsonify(runs)
+        return jsonify(_get_polled_result(("run-status",), _load_recent_runs))
     except Exception as e:
         return jsonify({'error': str(e)})
 
@@ -2798,7 +3458,7 @@ def reset_prompts():
         except Exception as e:
             print(f"⚠️  Failed to sync v0 prompts with defaults: {e}")
 
-        # Reset prompt systems with proper error handling
+        # Reset prompt systems in one transaction
         try:
             batch_id = uuid.uuid4().hex
             with engine.begin() as conn:
@@ -2831,47 +3491,46 @@ def reset_prompts():
 
                 prompt_info = {row.agent_type: row.version for row in active_prompts}
 
-        except Exception as e:
-            print(f"❌ Main prompt reset failed: {e}")
-            return jsonify({'error': f'Failed to reset main prompts: {str(e)}'}), 500
-        
-        # Reset feedback system in separate transaction to avoid conflicts
-        try:
-            with engine.begin() as conn:
-                # Try config-isolated reset first (if schema has been updated)
-                feedback_reset = conn.execute(text("""
-                    UPDATE ai_agent_prompts 
-                    SET is_active = FALSE
-                    WHERE agent_type IN ('SummarizerAgent', 'DeciderAgent') 
-                    AND (config_hash = :config_hash OR config_hash IS NULL)
-                """), {"config_hash": config_hash})
-                
-                print(f"✅ Reset feedback system prompts ({feedback_reset.rowcount} affected)")
-                
-        except Exception as e:
-            print(f"⚠️  Feedback system reset failed: {e}")
-            # Don't fail the whole operation if feedback reset fails
-        
-        # Reset unified table in separate transaction
-        try:
-            with engine.begin() as conn:
-                unified_reset = conn.execute(text("""
-                    UPDATE unified_prompts
-                    SET is_active = FALSE
-                    WHERE config_hash = :config_hash
-                """), {"config_hash": config_hash})
+                # The legacy prompt tables are optional; each gets a savepoint so
+                # a failure there rolls back only its own step, not the reset.
+                try:
+                    with conn.begin_nested():
+                        # Try config-isolated reset first (if schema has been updated)
+                        feedback_reset = conn.execute(text("""
+                            UPDATE ai_agent_prompts 
+                            SET is_active = FALSE
+                            WHERE agent_type IN ('SummarizerAgent', 'DeciderAgent') 
+                            AND (config_hash = :config_hash OR config_hash IS NULL)
+                        """), {"config_hash": config_hash})
+                    print(f"✅ Reset feedback system prompts ({feedback_reset.rowcount} affected)")
+                except Exception as e:
+                    print(f"⚠️  Feedback system reset failed: {e}")
+                    # Don't fail the whole operation if feedback reset fails
 
-                if unified_reset.rowcount > 0:
-                    conn.execute(text("""
-                        UPDATE unified_prompts
-                        SET is_active = TRUE
-                        WHERE config_hash = :config_hash AND version = 0
-                    """), {"config_hash": config_hash})
-                    print(f"✅ Reset unified prompts table ({unified_reset.rowcount} prompts)")
+                try:
+                    with conn.begin_nested():
+                        unified_reset = conn.execute(text("""
+                            UPDATE unified_prompts
+                            SET is_active = FALSE
+                            WHERE config_hash = :config_hash
+                        """), {"config_hash": config_hash})
+
+                        if unified_reset.rowcount > 0:
+                            conn.execute(text("""
+                                UPDATE unified_prompts
+                                SET is_active = TRUE
+                                WHERE config_hash = :config_hash AND version = 0
+                            """), {"config_hash": config_hash})
+                    if unified_reset.rowcount > 0:
+                        print(f"✅ Reset unified prompts table ({unified_reset.rowcount} prompts)")
+                except Exception as e:
+                    print(f"⚠️  Unified table reset failed (table may not exist): {e}")
 
         except Exception as e:
-            print(f"⚠️  Unified table reset failed (table may not exist): {e}")
+            print(f"❌ Main prompt reset failed: {e}")
+            return jsonify({'error': f'Failed to reset main prompts: {str(e)}'}), 500
 
+        _invalidate_prompt_caches()
         return jsonify({
             'success': True,
             'message': f'Prompts reset to v0 baseline. Summarizer: v{prompt_info.get("SummarizerAgent", "?")}, Decider: v{prompt_info.get("DeciderAgent", "?")}',
@@ -2883,6 +3542,22 @@ def reset_prompts():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Deactivates every position and clears the config's feedback, outcomes and
+# history in one statement (each CTE targets a different table).
+_SQL_RESET_PORTFOLIO_STATE = text("""
+    WITH deactivated AS (
+        UPDATE holdings
+        SET is_active = FALSE, shares = 0, current_value = 0, gain_loss = 0
+        WHERE ticker != 'CASH' AND config_hash = :config_hash
+    ), cleared_feedback AS (
+        DELETE FROM agent_feedback WHERE config_hash = :config_hash
+    ), cleared_outcomes AS (
+        DELETE FROM trade_outcomes WHERE config_hash = :config_hash
+    )
+    DELETE FROM portfolio_history WHERE config_hash = :config_hash
+""")
+
+
 @app.route('/api/reset-portfolio', methods=['POST'])
 def reset_portfolio():
     """Reset portfolio to either the live Schwab snapshot or simulation baseline."""
@@ -2905,87 +3580,6 @@ def reset_portfolio():
             except Exception as e:
                 print(f"⚠️ Schwab reset snapshot error: {e}")
 
-        with engine.begin() as conn:
-            current_holdings = conn.execute(text("""
-                SELECT ticker, shares, purchase_price, current_price, total_value, current_value, gain_loss
-                FROM holdings
-                WHERE is_active = TRUE AND ticker != 'CASH' AND config_hash = :config_hash
-            """), {"config_hash": config_hash}).fetchall()
-
-            for holding in current_holdings:
-                if holding.shares > 0:
-                    conn.execute(text("""
-                        INSERT INTO trade_outcomes (
-                            ticker, sell_timestamp, purchase_price, sell_price,
-                            shares, gain_loss_amount, gain_loss_percentage,
-                            hold_duration_days, original_reason, sell_reason, outcome_category, config_hash
-                        ) VALUES (
-                            :ticker, CURRENT_TIMESTAMP, :purchase_price, :current_price,
-                            :shares, :gain_loss,
-                            CASE WHEN :total_value > 0 THEN (:gain_loss / :total_value * 100) ELSE 0 END,
-                            0, 'Portfolio reset', 'Portfolio reset', 'break_even', :config_hash
-                        )
-                    """), {
-                        "ticker": holding.ticker,
-                        "purchase_price": float(holding.purchase_price),
-                        "current_price": float(holding.current_price),
-                        "shares": float(holding.shares),
-                        "gain_loss": float(holding.gain_loss),
-                        "total_value": float(holding.total_value),
-                        "config_hash": config_hash
-                    })
-
-            conn.execute(text("""
-                UPDATE holdings
-                SET is_active = FALSE, shares = 0, current_value = 0, gain_loss = 0
-                WHERE ticker != 'CASH' AND config_hash = :config_hash
-            """), {"config_hash": config_hash})
-
-            if not schwab_snapshot:
-                conn.execute(text("""
-                    DELETE FROM holdings WHERE ticker = 'CASH' AND config_hash = :config_hash
-                """), {"config_hash": config_hash})
-                conn.execute(text("""
-                    INSERT INTO holdings (config_hash, ticker, shares, purchase_price, current_price,
-                                          purchase_timestamp, current_price_timestamp, total_value, current_value,
-                                          gain_loss, reason, is_active)
-                    VALUES (:config_hash, 'CASH', 1, 10000, 10000, now(), now(), 10000, 10000, 0, 'Reset to simulation cash', TRUE)
-                """), {"config_hash": config_hash})
-
-            conn.execute(text("""
-                DELETE FROM agent_feedback WHERE config_hash = :config_hash
-            """), {"config_hash": config_hash})
-
-            conn.execute(text("""
-                DELETE FROM trade_outcomes WHERE config_hash = :config_hash
-            """), {"config_hash": config_hash})
-
-            conn.execute(text("""
-                DELETE FROM portfolio_history WHERE config_hash = :config_hash
-            """), {"config_hash": config_hash})
-
-        message = "Portfolio reset to simulation baseline ($10,000)."
-
-        if not schwab_snapshot:
-            batch_id = uuid.uuid4().hex
-            with engine.begin() as conn:
-                agent_types = ['SummarizerAgent', 'DeciderAgent']
-                for agent_type in agent_types:
-                    # Scoped to the current config — the old unscoped flip
-                    # rewrote activation for every config in the table.
-                    v4_exists = conn.execute(text("""
-                        SELECT id FROM prompt_versions
-                        WHERE agent_type = :agent_type AND version = 4
-                          AND config_hash = :config_hash
-                    """), {"agent_type": agent_type, "config_hash": config_hash}).fetchone()
-
-                    if v4_exists:
-                        set_active_prompt_version(
-                            conn, agent_type, config_hash, 4,
-                            action="reset_portfolio", actor="dashboard",
-                            reason="Portfolio reset to simulation baseline", batch_id=batch_id,
-                        )
-
         if schwab_snapshot:
             positions = schwab_snapshot.get('positions', [])
             processed = []
@@ -3028,18 +3622,54 @@ def reset_portfolio():
             )
             total_profit_loss = total_current - total_invested
 
-            _sync_holdings_with_database(config_hash, processed, cash_balance)
-            _record_live_portfolio_snapshot(
-                config_hash,
-                total_portfolio_value,
-                cash_balance,
-                total_invested,
-                total_profit_loss,
-                processed,
-            )
+        # One transaction for the wipe and the re-seed, so a failure part-way
+        # never leaves the config with deactivated holdings and no baseline.
+        with engine.begin() as conn:
+            conn.execute(_SQL_RESET_PORTFOLIO_STATE, {"config_hash": config_hash})
 
-            message = "Portfolio reset to live Schwab snapshot."
+            if schwab_snapshot:
+                _sync_holdings_with_database(config_hash, processed, cash_balance, conn=conn)
+                _record_live_portfolio_snapshot(
+                    config_hash,
+                    total_portfolio_value,
+                    cash_balance,
+                    total_invested,
+                    total_profit_loss,
+                    processed,
+                    conn=conn,
+                )
+                message = "Portfolio reset to live Schwab snapshot."
+            else:
+                conn.execute(text("""
+                    DELETE FROM holdings WHERE ticker = 'CASH' AND config_hash = :config_hash
+                """), {"config_hash": config_hash})
+                conn.execute(text("""
+                    INSERT INTO holdings (config_hash, ticker, shares, purchase_price, current_price,
+                                          purchase_timestamp, current_price_timestamp, total_value, current_value,
+                                          gain_loss, reason, is_active)
+                    VALUES (:config_hash, 'CASH', 1, 10000, 10000, now(), now(), 10000, 10000, 0, 'Reset to simulation cash', TRUE)
+                """), {"config_hash": config_hash})
+
+                # Scoped to the current config — the old unscoped flip
+                # rewrote activation for every config in the table.
+                batch_id = uuid.uuid4().hex
+                v4_agents = conn.execute(text("""
+                    SELECT DISTINCT agent_type FROM prompt_versions
+                    WHERE agent_type = ANY(:agent_types) AND version = 4
+                      AND config_hash = :config_hash
+                """), {
+                    "agent_types": ['SummarizerAgent', 'DeciderAgent'],
+                    "config_hash": config_hash,
+                }).scalars().all()
+                for agent_type in sorted(v4_agents):
+                    set_active_prompt_version(
+                        conn, agent_type, config_hash, 4,
+                        action="reset_portfolio", actor="dashboard",
+                        reason="Portfolio reset to simulation baseline", batch_id=batch_id,
+                    )
+                message = "Portfolio reset to simulation baseline ($10,000)."
 
+        _invalidate_dashboard_cache()
         return jsonify({"success": True, "message": message})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -3047,7 +3677,6 @@ def reset_portfolio():
 @app.route('/api/schwab/holdings')
 def get_schwab_holdings():
     """Get current Schwab holdings and portfolio data (READ-ONLY)"""
-    import pytz
     
     # Check if we're in read-only test mode
     readonly_mode = os.environ.get('DAI_SCHWAB_READONLY', '0') == '1'
@@ -3075,8 +3704,7 @@ def get_schwab_holdings():
             schwab_data['warning'] = '🔒 READ-ONLY MODE: No trades will be executed'
         
         # Add timestamp
-        pacific_tz = pytz.timezone('US/Pacific')
-        now = datetime.now(pacific_tz)
+        now = datetime.now(PACIFIC_TZ)
         schwab_data['last_updated'] = now.strftime('%m/%d/%Y, %I:%M:%S %p %Z')
         
         return jsonify(schwab_data)
@@ -3098,7 +3726,6 @@ def get_schwab_account_info():
         })
     
     try:
-        from schwab_client import schwab_client
         account_info = schwab_client.get_account_info()
         if account_info:
             return jsonify({
@@ -3134,8 +3761,8 @@ def _extract_headline_from_summary_data(raw_data):
         if not stripped:
             return ""
         try:
-            payload = json.loads(stripped)
-        except (json.JSONDecodeError, TypeError):
+            payload = _json_loads(stripped)
+        except (ValueError, TypeError):
             return stripped[:200]
 
     summary_payload = payload.get('summary') if isinstance(payload, dict) else payload
@@ -3144,8 +3771,8 @@ def _extract_headline_from_summary_data(raw_data):
         if not stripped_summary:
             return ""
         try:
-            summary_payload = json.loads(stripped_summary)
-        except (json.JSONDecodeError, TypeError):
+            summary_payload = _json_loads(stripped_summary)
+        except (ValueError, TypeError):
             return stripped_summary[:200]
 
     if isinstance(summary_payload, dict):
@@ -3822,8 +4449,8 @@ def _record_candidate_review(candidate, config_hash):
                 'config_hash': config_hash,
                 'agent_type': candidate.get('agent_type'),
                 'from_version': candidate.get('current_version'),
-                'change_summary': json.dumps(summary),
-                'changes': json.dumps(candidate.get('changes') or []),
+                'change_summary': _json_dumps(summary),
+                'changes': _json_dumps(candidate.get('changes') or []),
                 'is_substantive': bool(summary.get('is_substantive')),
                 'critic_verdict': critic.get('verdict'),
                 'critic_reason': critic.get('reason'),
@@ -4129,11 +4756,11 @@ def refresh_feedback_for_prompt_lab():
     /api/prompt-evolution/generate will see the fresh feedback row.
     """
     try:
-        from config import get_current_config_hash
         config_hash = get_current_config_hash()
 
-        tracker = TradeOutcomeTracker()
+        tracker = _get_tracker()
         result = tracker.analyze_recent_outcomes(skip_auto_prompts=True) or {}
+        _invalidate_prompt_caches()
 
         # Normalize the response — analyze_recent_outcomes can return
         # different shapes depending on which branch ran (outcomes vs
@@ -4164,7 +4791,6 @@ def refresh_feedback_for_prompt_lab():
             )
         return jsonify(payload)
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
@@ -4237,8 +4863,6 @@ def _reap_stale_batch_jobs():
 
 def _run_batch_generation(job_id, config_hash):
     """Background worker. Updates _BATCH_JOBS in place."""
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    from feedback_agent import TradeOutcomeTracker
 
     def _set(state):
         state['updated_at'] = time.time()
@@ -4252,7 +4876,7 @@ def _run_batch_generation(job_id, config_hash):
             'config_hash': config_hash, 'started_at': time.time(),
             'message': 'Running FeedbackAgent against the latest trade outcomes…',
         })
-        tracker = TradeOutcomeTracker()
+        tracker = _get_tracker()
         feedback_result = tracker.analyze_recent_outcomes(skip_auto_prompts=True) or {}
         feedback_payload = feedback_result.get('feedback') or feedback_result.get('feedback_content') or {}
         feedback_summary = {
@@ -4333,7 +4957,6 @@ def _run_batch_generation(job_id, config_hash):
             'finished_at': datetime.utcnow().isoformat() + 'Z',
         })
     except Exception as e:
-        import traceback
         traceback.print_exc()
         _set({
             'status': 'failed',
@@ -4374,7 +4997,6 @@ def refresh_feedback_and_generate_all():
 
         return jsonify({'job_id': job_id, 'status': 'running'})
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
@@ -4507,6 +5129,7 @@ def apply_prompt_evolution_candidate():
                 reason=description or None,
             )
 
+        _invalidate_prompt_caches()
         return jsonify({
             'success': True,
             'version': new_version,
@@ -4562,7 +5185,7 @@ def record_prompt_review_decision():
                 'verdict': verdict,
                 'now': datetime.utcnow(),
                 'to_version': to_version,
-                'sections': json.dumps(sections) if sections else None,
+                'sections': _json_dumps(sections) if sections else None,
                 'id': review_id,
             })
         return jsonify({'success': True, 'review_id': review_id, 'verdict': verdict})
@@ -4623,4 +5246,7 @@ def schwab_dashboard():
 if __name__ == "__main__":
     port = int(os.environ.get('DAI_PORT', 8080))
     print(f"🚀 Starting dashboard server on port {port} (trading_mode={get_trading_mode()})")
+    # Move the long-lived import-time objects (modules, engine, SQL constructs)
+    # out of the cyclic collector's generations so later collections stay small.
+    gc.freeze()
     app.run(debug=True, port=port)
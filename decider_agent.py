@@ -606,20 +606,20 @@ def get_unprocessed_summaries():
         return [row._mapping for row in result]
 
 def mark_summaries_processed(summary_ids):
-    """Mark summaries as processed by the decider"""
+    """Mark summaries as processed by the decider (idempotent: already-marked rows are skipped)"""
+    if not summary_ids:
+        return
+    # Use Pacific time for run_id consistency
+    run_id_timestamp = datetime.now(PACIFIC_TIMEZONE).strftime("%Y%m%dT%H%M%S")
     with engine.begin() as conn:
-        for summary_id in summary_ids:
-            # Use Pacific time for run_id consistency
-            pacific_now = datetime.now(PACIFIC_TIMEZONE)
-            run_id_timestamp = pacific_now.strftime("%Y%m%dT%H%M%S")
-
-            conn.execute(text("""
-                INSERT INTO processed_summaries (summary_id, processed_by, run_id)
-                VALUES (:summary_id, 'decider', :run_id)
-            """), {
-                "summary_id": summary_id,
-                "run_id": run_id_timestamp
-            })
+        conn.execute(text("""
+            INSERT INTO processed_summaries (summary_id, processed_by, run_id)
+            VALUES (:summary_id, 'decider', :run_id)
+            ON CONFLICT (summary_id, processed_by) DO NOTHING
+        """), [
+            {"summary_id": summary_id, "run_id": run_id_timestamp}
+            for summary_id in summary_ids
+        ])
 
 def update_all_current_prices():
     """Update current prices for all active holdings before decision making"""
@@ -633,9 +633,10 @@ def update_all_current_prices():
     else:
         print("✅ Market is OPEN - fetching real-time prices")
 
-    with engine.begin() as conn:
-        # Get all active holdings
-        config_hash = get_current_config_hash()
+    # Read holdings, then release the connection: the price fetches below are
+    # network-bound and must not pin a pooled connection for their duration.
+    config_hash = get_current_config_hash()
+    with engine.connect() as conn:
         result = conn.execute(text("""
             SELECT ticker, shares, total_value, current_price
             FROM holdings
@@ -644,59 +645,62 @@ def update_all_current_prices():
 
         holdings = [dict(row._mapping) for row in result]
 
-        if not holdings:
-            print("No active holdings to update.")
-            return
+    if not holdings:
+        print("No active holdings to update.")
+        return
 
-        price_fetcher.prefetch_prices([holding["ticker"] for holding in holdings])
+    price_fetcher.prefetch_prices([holding["ticker"] for holding in holdings])
 
-        updated_count = 0
-        api_failures = []
+    updated_count = 0
+    api_failures = []
+    new_prices = {}
 
-        for holding in holdings:
-            ticker = holding['ticker']
-            shares = holding['shares']
-            old_price = holding['current_price']
+    for holding in holdings:
+        ticker = holding['ticker']
+        shares = holding['shares']
+        old_price = holding['current_price']
 
-            # Get new price
-            new_price = get_current_price(ticker)
+        # Get new price
+        new_price = get_current_price(ticker)
 
-            if new_price is None:
-                print(f"⚠️  Could not get price for {ticker}, using last known price: ${old_price:.2f}")
-                api_failures.append(ticker)
-                continue
+        if new_price is None:
+            print(f"⚠️  Could not get price for {ticker}, using last known price: ${old_price:.2f}")
+            api_failures.append(ticker)
+            continue
 
-            # Calculate new values
-            new_current_value = shares * new_price
-            new_gain_loss = new_current_value - holding['total_value']
+        # Calculate new values
+        new_current_value = shares * new_price
+        new_gain_loss = new_current_value - holding['total_value']
+        new_prices[ticker] = float(new_price)
 
-            # Update the database
+        print(f"✅ Updated {ticker}: ${old_price:.2f} → ${new_price:.2f} (Gain/Loss: ${new_gain_loss:.2f})")
+        updated_count += 1
+
+    if new_prices:
+        # One short transaction applies every fetched price.
+        with engine.begin() as conn:
             conn.execute(text("""
-                UPDATE holdings
-                SET current_price = :price,
-                    current_value = :current_value,
-                    gain_loss = :gain_loss,
+                UPDATE holdings AS h
+                SET current_price = v.price,
+                    current_value = h.shares * v.price,
+                    gain_loss = (h.shares * v.price) - h.total_value,
                     current_price_timestamp = :timestamp
-                WHERE ticker = :ticker AND config_hash = :config_hash
+                FROM unnest(CAST(:tickers AS text[]), CAST(:prices AS float8[])) AS v(ticker, price)
+                WHERE h.ticker = v.ticker AND h.config_hash = :config_hash
             """), {
-                "price": new_price,
-                "current_value": new_current_value,
-                "gain_loss": new_gain_loss,
+                "tickers": list(new_prices),
+                "prices": list(new_prices.values()),
                 "timestamp": datetime.utcnow(),
-                "ticker": ticker,
-                "config_hash": config_hash
+                "config_hash": config_hash,
             })
 
-            print(f"✅ Updated {ticker}: ${old_price:.2f} → ${new_price:.2f} (Gain/Loss: ${new_gain_loss:.2f})")
-            updated_count += 1
+    print(f"Updated {updated_count} out of {len(holdings)} holdings")
 
-        print(f"Updated {updated_count} out of {len(holdings)} holdings")
-
-        # If API failures occurred, provide manual update option
-        if api_failures:
-            print(f"\n🚨 API failures detected for: {', '.join(api_failures)}")
-            print("💡 To manually update prices, run: python manual_price_update.py --interactive")
-            print("💡 Or use: python manual_price_update.py --show (to view current holdings)")
+    # If API failures occurred, provide manual update option
+    if api_failures:
+        print(f"\n🚨 API failures detected for: {', '.join(api_failures)}")
+        print("💡 To manually update prices, run: python manual_price_update.py --interactive")
+        print("💡 Or use: python manual_price_update.py --show (to view current holdings)")
 
 def fetch_holdings():
     with engine.begin() as conn:
@@ -2188,43 +2192,32 @@ def record_portfolio_snapshot():
             )
         """))
 
-        # Get current holdings
-        result = conn.execute(text("""
-            SELECT ticker, shares, purchase_price, current_price,
-                   total_value, current_value, gain_loss
-            FROM holdings
-            WHERE is_active = TRUE AND config_hash = :config_hash
-        """), {"config_hash": config_hash}).fetchall()
-
-        holdings = [dict(row._mapping) for row in result]
-
-        # Calculate portfolio metrics
-        cash_balance = next((h["current_value"] for h in holdings if h["ticker"] == "CASH"), 0)
-        stock_holdings = [h for h in holdings if h["ticker"] != "CASH"]
-
-        total_current_value = sum(h["current_value"] for h in stock_holdings)
-        total_invested = sum(h["total_value"] for h in stock_holdings)
-        total_profit_loss = sum(h["gain_loss"] for h in stock_holdings)
-        total_portfolio_value = total_current_value + cash_balance
-
-        percentage_gain = (total_profit_loss / total_invested * 100) if total_invested > 0 else 0
-
-        # Record snapshot
+        # Aggregate the active holdings and build the JSONB snapshot in the same
+        # statement that records it; no holdings rows round-trip through Python.
         conn.execute(text("""
+            WITH totals AS (
+                SELECT
+                    COALESCE(SUM(current_value) FILTER (WHERE ticker = 'CASH'), 0) AS cash_balance,
+                    COALESCE(SUM(current_value) FILTER (WHERE ticker <> 'CASH'), 0) AS equity_value,
+                    COALESCE(SUM(total_value) FILTER (WHERE ticker <> 'CASH'), 0) AS total_invested,
+                    COALESCE(SUM(gain_loss) FILTER (WHERE ticker <> 'CASH'), 0) AS total_profit_loss,
+                    COALESCE(jsonb_agg(jsonb_build_object(
+                        'ticker', ticker, 'shares', shares, 'purchase_price', purchase_price,
+                        'current_price', current_price, 'total_value', total_value,
+                        'current_value', current_value, 'gain_loss', gain_loss
+                    )), '[]'::jsonb) AS holdings_snapshot
+                FROM holdings
+                WHERE is_active = TRUE AND config_hash = :config_hash
+            )
             INSERT INTO portfolio_history
             (total_portfolio_value, cash_balance, total_invested,
              total_profit_loss, percentage_gain, holdings_snapshot, config_hash)
-            VALUES (:total_portfolio_value, :cash_balance, :total_invested,
-                    :total_profit_loss, :percentage_gain, :holdings_snapshot, :config_hash)
-        """), {
-            "total_portfolio_value": total_portfolio_value,
-            "cash_balance": cash_balance,
-            "total_invested": total_invested,
-            "total_profit_loss": total_profit_loss,
-            "percentage_gain": percentage_gain,
-            "holdings_snapshot": json.dumps(holdings),
-            "config_hash": config_hash
-        })
+            SELECT equity_value + cash_balance, cash_balance, total_invested,
+                   total_profit_loss,
+                   CASE WHEN total_invested > 0 THEN total_profit_loss / total_invested * 100 ELSE 0 END,
+                   holdings_snapshot, :config_hash
+            FROM totals
+        """), {"config_hash": config_hash})
 
 def ask_decision_agent(summaries, run_id, holdings, run_context: Optional[RunContext] = None):
     config_hash = get_current_config_hash()
@@ -3186,6 +3179,18 @@ def store_trade_decisions(decisions, run_id):
                 data JSONB
             )
         """))
+        # Failed-run flag the dashboard's /trades filters on (see init_database.py)
+        conn.execute(text("""
+            ALTER TABLE trade_decisions ADD COLUMN IF NOT EXISTS has_error BOOLEAN
+            GENERATED ALWAYS AS (COALESCE(
+                data::text LIKE '%Max retries reached%'
+                OR data::text LIKE '%API error, no response%', FALSE)) STORED
+        """))
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_trade_decisions_cfg_id_ok
+            ON trade_decisions(config_hash, id DESC)
+            WHERE NOT has_error
+        """))
         conn.execute(text("""
             INSERT INTO trade_decisions (run_id, timestamp, data, config_hash) VALUES (:run_id, :timestamp, :data, :config_hash)
         """), {
@@ -12,6 +12,7 @@ except Exception:
 # --- end bootstrap ---
 
 import json
+import threading
 from datetime import datetime, timedelta
 from sqlalchemy import text
 from config import engine, PromptManager, session, openai, GPT_MODEL, get_agent_model, get_model_token_params, get_model_temperature_params, get_current_config_hash, MODEL_TEMPERATURE, append_reasoning_guidance, get_agent_reasoning_level, get_reasoning_token_cap, get_reasoning_params
@@ -64,6 +65,11 @@ def categorize_outcome(gain_loss_amount, gain_loss_percentage):
 # PromptManager instance
 prompt_manager = PromptManager(client=openai, session=session)
 
+# Prompt writes for a specific config temporarily swap CURRENT_CONFIG_HASH in
+# os.environ; feedback triggered from different threads (dashboard requests,
+# the orchestrator) must not interleave those swaps.
+_CONFIG_HASH_OVERRIDE_LOCK = threading.RLock()
+
 
 def _canonical_agent_type(agent_type):
     """Normalize legacy agent names to canonical prompt_versions keys."""
@@ -479,6 +485,45 @@ class TradeOutcomeTracker:
             "avg_profit": avg_profit,
         }
     
+    def compute_outcomes_metrics_by_period(self, periods):
+        """compute_recent_outcomes_metrics() for several lookbacks in one query.
+
+        Returns a dict keyed by each requested day count.
+        """
+        from config import get_current_config_hash
+        config_hash = get_current_config_hash()
+        periods = sorted({int(days) for days in periods})
+        if not periods:
+            return {}
+
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT p.days,
+                       COUNT(t.sell_timestamp) AS total_trades,
+                       COUNT(*) FILTER (WHERE t.gain_loss_percentage > 0) AS profitable,
+                       COALESCE(SUM(t.gain_loss_percentage), 0) AS total_gain
+                FROM unnest(CAST(:periods AS integer[])) AS p(days)
+                LEFT JOIN trade_outcomes t
+                  ON t.config_hash = :config_hash
+                 AND t.sell_timestamp >= CAST(:now AS timestamp) - p.days * INTERVAL '1 day'
+                GROUP BY p.days
+            """), {"periods": periods, "config_hash": config_hash, "now": datetime.utcnow()})
+            rows = {row.days: row for row in result}
+
+        metrics = {}
+        for days in periods:
+            row = rows.get(days)
+            total_trades = int(row.total_trades) if row else 0
+            if total_trades == 0:
+                metrics[days] = {"total_trades": 0, "success_rate": 0.0, "avg_profit": 0.0}
+                continue
+            metrics[days] = {
+                "total_trades": total_trades,
+                "success_rate": row.profitable / total_trades,
+                "avg_profit": float(row.total_gain) / total_trades,
+            }
+        return metrics
+
     def _analyze_patterns(self, outcomes):
         """Analyze patterns in trading outcomes"""
         # Group by outcome category
@@ -504,10 +549,8 @@ class TradeOutcomeTracker:
             "avg_hold_duration_unprofitable": sum(o['hold_duration_days'] for o in bad_outcomes) / len(bad_outcomes) if bad_outcomes else 0
         }
     
-    def _get_detailed_trade_analysis(self):
+    def _get_detailed_trade_analysis(self, config_hash):
         """Get detailed individual trade data for pattern analysis"""
-        from config import get_current_config_hash
-        config_hash = get_current_config_hash()
         
         with engine.begin() as conn:
             result = conn.execute(text("""
@@ -550,7 +593,7 @@ class TradeOutcomeTracker:
 
     def _generate_ai_feedback_for_config(self, outcomes, success_rate, avg_profit, analysis, config_hash):
         """Generate AI feedback for a specific config without changing global state"""
-        return self._generate_ai_feedback(outcomes, success_rate, avg_profit, analysis)
+        return self._generate_ai_feedback(outcomes, success_rate, avg_profit, analysis, config_hash)
     
     def _store_feedback_for_config(self, lookback_days, total_trades, success_rate, avg_profit, analysis, feedback, config_hash):
         """Store feedback for a specific config"""
@@ -711,41 +754,42 @@ class TradeOutcomeTracker:
         """Update only strategy_directives while keeping structural template intact"""
         try:
             import os
-            original_hash = os.environ.get('CURRENT_CONFIG_HASH')
-            os.environ['CURRENT_CONFIG_HASH'] = config_hash
+            with _CONFIG_HASH_OVERRIDE_LOCK:
+                original_hash = os.environ.get('CURRENT_CONFIG_HASH')
+                os.environ['CURRENT_CONFIG_HASH'] = config_hash
 
-            try:
-                # Get current active prompt to preserve structure
-                from prompt_manager import get_active_prompt
-                current = get_active_prompt(agent_type)
-
-                if not current:
-                    print(f"⚠️ No active prompt found for {agent_type}, skipping strategy update")
-                    return
-
-                # Create new version with same structural template but updated strategy
-                from prompt_manager import create_new_prompt_version
-                prompt_id = create_new_prompt_version(
-                    agent_type,
-                    current["system_prompt"],
-                    current["user_prompt_template"],
-                    description,
-                    strategy_directives=new_strategy_directives
-                )
+                try:
+                    # Get current active prompt to preserve structure
+                    from prompt_manager import get_active_prompt
+                    current = get_active_prompt(agent_type)
+
+                    if not current:
+                        print(f"⚠️ No active prompt found for {agent_type}, skipping strategy update")
+                        return
+
+                    # Create new version with same structural template but updated strategy
+                    from prompt_manager import create_new_prompt_version
+                    prompt_id = create_new_prompt_version(
+                        agent_type,
+                        current["system_prompt"],
+                        current["user_prompt_template"],
+                        description,
+                        strategy_directives=new_strategy_directives
+                    )
 
-                with engine.connect() as conn:
-                    result = conn.execute(text("""
-                        SELECT version FROM prompt_versions WHERE id = :id
-                    """), {"id": prompt_id}).fetchone()
-                    version = result.version if result else "?"
-
-                print(f"✅ Updated {agent_type} strategy_directives → v{version} for config {config_hash}")
-                return version
-            finally:
-                if original_hash is not None:
-                    os.environ['CURRENT_CONFIG_HASH'] = original_hash
-                elif 'CURRENT_CONFIG_HASH' in os.environ:
-                    del os.environ['CURRENT_CONFIG_HASH']
+                    with engine.connect() as conn:
+                        result = conn.execute(text("""
+                            SELECT version FROM prompt_versions WHERE id = :id
+                        """), {"id": prompt_id}).fetchone()
+                        version = result.version if result else "?"
+
+                    print(f"✅ Updated {agent_type} strategy_directives → v{version} for config {config_hash}")
+                    return version
+                finally:
+                    if original_hash is not None:
+                        os.environ['CURRENT_CONFIG_HASH'] = original_hash
+                    elif 'CURRENT_CONFIG_HASH' in os.environ:
+                        del os.environ['CURRENT_CONFIG_HASH']
         except Exception as e:
             print(f"❌ Error updating strategy_directives for {agent_type}: {e}")
             import traceback
@@ -767,31 +811,32 @@ class TradeOutcomeTracker:
 
         try:
             import os
-            original_hash = os.environ.get('CURRENT_CONFIG_HASH')
-            os.environ['CURRENT_CONFIG_HASH'] = config_hash
+            with _CONFIG_HASH_OVERRIDE_LOCK:
+                original_hash = os.environ.get('CURRENT_CONFIG_HASH')
+                os.environ['CURRENT_CONFIG_HASH'] = config_hash
 
-            try:
-                from prompt_manager import get_active_prompt
-                prompt_data = get_active_prompt(agent_type)
-                current_memory = prompt_data.get("memory", "")
-
-                # Append new lessons
-                from datetime import datetime
-                timestamp = datetime.now().strftime("%Y-%m-%d")
-                updated_memory = f"{current_memory}\n\n## {timestamp}\n{new_lessons}".strip()
-
-                # If over limit, compress
-                if len(updated_memory) > MAX_MEMORY_CHARS:
-                    updated_memory = self._compress_memory(updated_memory, MAX_MEMORY_CHARS)
-
-                # Save updated memory
-                self._update_memory_field(agent_type, updated_memory, config_hash)
-                print(f"🧠 Updated {agent_type} memory for config {config_hash[:8]}")
-            finally:
-                if original_hash is not None:
-                    os.environ['CURRENT_CONFIG_HASH'] = original_hash
-                elif 'CURRENT_CONFIG_HASH' in os.environ:
-                    del os.environ['CURRENT_CONFIG_HASH']
+                try:
+                    from prompt_manager import get_active_prompt
+                    prompt_data = get_active_prompt(agent_type)
+                    current_memory = prompt_data.get("memory", "")
+
+                    # Append new lessons
+                    from datetime import datetime
+                    timestamp = datetime.now().strftime("%Y-%m-%d")
+                    updated_memory = f"{current_memory}\n\n## {timestamp}\n{new_lessons}".strip()
+
+                    # If over limit, compress
+                    if len(updated_memory) > MAX_MEMORY_CHARS:
+                        updated_memory = self._compress_memory(updated_memory, MAX_MEMORY_CHARS)
+
+                    # Save updated memory
+                    self._update_memory_field(agent_type, updated_memory, config_hash)
+                    print(f"🧠 Updated {agent_type} memory for config {config_hash[:8]}")
+                finally:
+                    if original_hash is not None:
+                        os.environ['CURRENT_CONFIG_HASH'] = original_hash
+                    elif 'CURRENT_CONFIG_HASH' in os.environ:
+                        del os.environ['CURRENT_CONFIG_HASH']
         except Exception as e:
             print(f"⚠️ Failed to update {agent_type} memory: {e}")
             import traceback
@@ -855,6 +900,8 @@ class TradeOutcomeTracker:
                     "agent_type": agent_type,
                     "config_hash": config_hash,
                 })
+            from prompt_manager import invalidate_active_prompt_cache
+            invalidate_active_prompt_cache()
         except Exception as e:
             print(f"⚠️ Failed to update memory field for {agent_type}: {e}")
 
@@ -866,22 +913,23 @@ class TradeOutcomeTracker:
             
             # Temporarily set the config hash in environment
             import os
-            original_hash = os.environ.get('CURRENT_CONFIG_HASH')
-            os.environ['CURRENT_CONFIG_HASH'] = config_hash
+            with _CONFIG_HASH_OVERRIDE_LOCK:
+                original_hash = os.environ.get('CURRENT_CONFIG_HASH')
+                os.environ['CURRENT_CONFIG_HASH'] = config_hash
             
-            try:
-                prompt_id = create_new_prompt_version(agent_type, user_prompt, system_prompt, description)
-                with engine.connect() as conn:
-                    result = conn.execute(text("""
-                        SELECT version FROM prompt_versions WHERE id = :id
-                    """), {"id": prompt_id}).fetchone()
-                return result.version if result else 0
-            finally:
-                # Restore original hash
-                if original_hash:
-                    os.environ['CURRENT_CONFIG_HASH'] = original_hash
-                elif 'CURRENT_CONFIG_HASH' in os.environ:
-                    del os.environ['CURRENT_CONFIG_HASH']
+                try:
+                    prompt_id = create_new_prompt_version(agent_type, user_prompt, system_prompt, description)
+                    with engine.connect() as conn:
+                        result = conn.execute(text("""
+                            SELECT version FROM prompt_versions WHERE id = :id
+                        """), {"id": prompt_id}).fetchone()
+                    return result.version if result else 0
+                finally:
+                    # Restore original hash
+                    if original_hash:
+                        os.environ['CURRENT_CONFIG_HASH'] = original_hash
+                    elif 'CURRENT_CONFIG_HASH' in os.environ:
+                        del os.environ['CURRENT_CONFIG_HASH']
                     
         except Exception as e:
             print(f"❌ Error creating prompt version for {agent_type} in config {config_hash}: {e}")
@@ -891,12 +939,11 @@ class TradeOutcomeTracker:
         """Analyze decision patterns for a specific config"""
         return self._analyze_decision_patterns(days_back, config_hash)
 
-    def _get_prompt_review_lessons(self, limit=8):
+    def _get_prompt_review_lessons(self, config_hash, limit=8):
         """Recent prompt-change reviews as compact lesson lines: the critic's
         verdict/objection and the human's RLHF response (agree/override), plus
         realized outcome when measured. Empty string when none exist."""
         try:
-            config_hash = get_current_config_hash()
             with engine.connect() as conn:
                 # Human-labeled rows first so unreviewed batches can't evict
                 # the RLHF signal; drop outage rows (confidence 0, non-auto) —
@@ -942,8 +989,10 @@ class TradeOutcomeTracker:
             print(f"⚠️ Could not load prompt review lessons: {exc}")
             return ""
 
-    def _generate_ai_feedback(self, outcomes, success_rate, avg_profit, analysis):
+    def _generate_ai_feedback(self, outcomes, success_rate, avg_profit, analysis, config_hash=None):
         """Use AI to generate feedback for improving agent performance"""
+        # Resolved once up front so every read below is scoped to the same config
+        config_hash = config_hash or get_current_config_hash()
         outcomes_summary = json.dumps({
             "total_trades": len(outcomes),
             "success_rate": success_rate,
@@ -958,12 +1007,12 @@ class TradeOutcomeTracker:
         }, indent=2)
         
         # Get recent individual trades for detailed analysis
-        recent_trades = self._get_detailed_trade_analysis()
+        recent_trades = self._get_detailed_trade_analysis(config_hash)
 
         # RLHF loop-closure: what happened to past prompt-change proposals —
         # the critic's verdicts and the human's response. Guidance that ignores
         # these objections produces proposals that get rejected again.
-        critic_lessons = self._get_prompt_review_lessons()
+        critic_lessons = self._get_prompt_review_lessons(config_hash)
 
         # FIXED TEMPLATE COMPONENTS (never change)
         FEEDBACK_BASE_INSTRUCTIONS = '''Analyze the following trading performance data and provide specific feedback to improve the performance of our AI trading agents.
@@ -1036,7 +1085,7 @@ Return ONLY valid JSON in this EXACT format:
         feedback_soul = ""
         try:
             from prompt_manager import get_active_prompt
-            feedback_prompt_data = get_active_prompt("FeedbackAgent")
+            feedback_prompt_data = get_active_prompt("FeedbackAgent", config_hash=config_hash)
             feedback_soul = feedback_prompt_data.get("soul", "")
         except Exception:
             pass
@@ -1356,62 +1405,69 @@ Your analysis should be thorough, data-driven, and provide actionable insights f
     
     def get_active_prompt(self, agent_type):
         """Get the currently active prompt for an agent type"""
-        agent_type = _canonical_agent_type(agent_type)
+        return self.get_active_prompts([agent_type])[agent_type]
+
+    def get_active_prompts(self, agent_types):
+        """Get the currently active prompts for several agent types in one pass.
+
+        Returns a dict keyed by each requested agent type; agents with no
+        prompt map to None.
+        """
+        canonical = {agent_type: _canonical_agent_type(agent_type) for agent_type in agent_types}
+        wanted = sorted(set(canonical.values()))
 
         # Import here to avoid circular imports
-        from config import should_use_specific_prompt_version, get_prompt_version_config
-        
+        from config import should_use_specific_prompt_version, get_prompt_version_config, get_current_config_hash
+
+        found = {}
+        use_fixed = should_use_specific_prompt_version()
         with engine.connect() as conn:
             # Check if we should use a specific version instead of the latest
-            if should_use_specific_prompt_version():
-                config = get_prompt_version_config()
-                forced_version = config["forced_version"]
-                
-                # Try to get the specific version first
-                result = conn.execute(text("""
-                    SELECT user_prompt_template as user_prompt, system_prompt, version as prompt_version, description
+            if use_fixed:
+                forced_version = get_prompt_version_config()["forced_version"]
+                rows = conn.execute(text("""
+                    SELECT DISTINCT ON (agent_type)
+                           agent_type, user_prompt_template as user_prompt, system_prompt,
+                           version as prompt_version, description
                     FROM prompt_versions
-                    WHERE agent_type = :agent_type AND version = :version
-                    LIMIT 1
-                """), {"agent_type": agent_type, "version": forced_version})
-                
-                row = result.fetchone()
-                if row:
-                    print(f"🔒 Using FIXED prompt version {forced_version} for {agent_type}")
-                    return {
-                        "user_prompt": row.user_prompt,
-                        "system_prompt": row.system_prompt,
-                        "prompt_version": row.prompt_version,
-                        "version": row.prompt_version,  # Add both for compatibility
-                        "description": row.description
-                    }
-                else:
-                    print(f"⚠️  Version {forced_version} not found for {agent_type}, falling back to latest")
-            
-            # Get the active prompt from the prompt_versions table for current config
-            from config import get_current_config_hash
-            config_hash = get_current_config_hash()
-            
-            result = conn.execute(text("""
-                SELECT user_prompt_template as user_prompt, system_prompt, version as prompt_version, description
-                FROM prompt_versions
-                WHERE agent_type = :agent_type AND is_active = TRUE AND config_hash = :config_hash
-                ORDER BY version DESC
-                LIMIT 1
-            """), {"agent_type": agent_type, "config_hash": config_hash})
-            
-            row = result.fetchone()
-            if row:
-                if not should_use_specific_prompt_version():
-                    print(f"🔄 Using LATEST prompt version {row.prompt_version} for {agent_type}")
-                return {
-                    "user_prompt": row.user_prompt,
-                    "system_prompt": row.system_prompt,
-                    "prompt_version": row.prompt_version,
-                    "version": row.prompt_version,  # Add both for compatibility
-                    "description": row.description
-                }
-            return None
+                    WHERE agent_type = ANY(:agent_types) AND version = :version
+                    ORDER BY agent_type
+                """), {"agent_types": wanted, "version": forced_version}).fetchall()
+                for row in rows:
+                    print(f"🔒 Using FIXED prompt version {forced_version} for {row.agent_type}")
+                    found[row.agent_type] = row
+                for agent_type in wanted:
+                    if agent_type not in found:
+                        print(f"⚠️  Version {forced_version} not found for {agent_type}, falling back to latest")
+
+            # Get the active prompts from the prompt_versions table for current config
+            remaining = [agent_type for agent_type in wanted if agent_type not in found]
+            if remaining:
+                config_hash = get_current_config_hash()
+                rows = conn.execute(text("""
+                    SELECT DISTINCT ON (agent_type)
+                           agent_type, user_prompt_template as user_prompt, system_prompt,
+                           version as prompt_version, description
+                    FROM prompt_versions
+                    WHERE agent_type = ANY(:agent_types) AND is_active = TRUE AND config_hash = :config_hash
+                    ORDER BY agent_type, version DESC
+                """), {"agent_types": remaining, "config_hash": config_hash}).fetchall()
+                for row in rows:
+                    if not use_fixed:
+                        print(f"🔄 Using LATEST prompt version {row.prompt_version} for {row.agent_type}")
+                    found[row.agent_type] = row
+
+        prompts = {}
+        for agent_type, canonical_type in canonical.items():
+            row = found.get(canonical_type)
+            prompts[agent_type] = {
+                "user_prompt": row.user_prompt,
+                "system_prompt": row.system_prompt,
+                "prompt_version": row.prompt_version,
+                "version": row.prompt_version,  # Add both for compatibility
+                "description": row.description
+            } if row else None
+        return prompts
     
     def save_prompt_version(self, agent_type, user_prompt, system_prompt, description="", created_by="system", triggered_by_feedback_id=None, strategy_directives=None):
         """Save a new version of prompts for an agent type"""
@@ -390,6 +390,10 @@ def initialize_database() -> None:
             )
             """,
         )
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_run_configurations_last_used
+            ON run_configurations(last_used)
+        """))
 
         # 2) Context/summaries tables
         ensure_table(
@@ -442,6 +446,29 @@ def initialize_database() -> None:
             "data",
             "ALTER TABLE summaries ADD COLUMN IF NOT EXISTS data JSONB",
         )
+        # Supports the orchestrator's recent-activity (active config) lookup
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_summaries_ts_cfg
+            ON summaries(timestamp, config_hash)
+            WHERE config_hash IS NOT NULL
+        """))
+        # Failed summarizer calls are flagged once at write time so the dashboard
+        # can filter them by index instead of casting every payload to text.
+        ensure_column(
+            conn,
+            stats,
+            "summaries",
+            "has_error",
+            """
+            ALTER TABLE summaries ADD COLUMN IF NOT EXISTS has_error BOOLEAN
+            GENERATED ALWAYS AS (COALESCE(data::text LIKE '%API error, no response%', FALSE)) STORED
+            """,
+        )
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_summaries_cfg_id_ok
+            ON summaries(config_hash, id DESC)
+            WHERE NOT has_error
+        """))
 
         # 3) Process/run tracking
         ensure_table(
@@ -466,6 +493,20 @@ def initialize_database() -> None:
             "config_hash",
             "ALTER TABLE processed_summaries ADD COLUMN IF NOT EXISTS config_hash TEXT",
         )
+        # Drop duplicate markers left by earlier non-idempotent retries, then
+        # enforce one marker per (summary, agent) for ON CONFLICT DO NOTHING.
+        if not table_exists(conn, "uq_processed_summaries"):  # to_regclass resolves indexes too
+            conn.execute(text("""
+                DELETE FROM processed_summaries a
+                USING processed_summaries b
+                WHERE a.summary_id = b.summary_id
+                  AND a.processed_by = b.processed_by
+                  AND a.id > b.id
+            """))
+        conn.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS uq_processed_summaries
+            ON processed_summaries(summary_id, processed_by)
+        """))
 
         ensure_table(
             conn,
@@ -527,6 +568,16 @@ def initialize_database() -> None:
             "holdings_config_ticker_unique",
             "ALTER TABLE holdings ADD CONSTRAINT holdings_config_ticker_unique UNIQUE (config_hash, ticker)",
         )
+        # Dashboard/decider reads only ever look at a config's active rows.
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_holdings_hash_active
+            ON holdings(config_hash) WHERE is_active
+        """))
+        # The price updaters refresh a ticker across every config at once.
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_holdings_ticker
+            ON holdings(ticker)
+        """))
 
         ensure_table(
             conn,
@@ -553,6 +604,11 @@ def initialize_database() -> None:
             "config_hash",
             "ALTER TABLE portfolio_history ADD COLUMN IF NOT EXISTS config_hash VARCHAR(50)",
         )
+        # Baseline (first) and latest snapshot lookups per config.
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_ph_hash_ts
+            ON portfolio_history(config_hash, timestamp DESC)
+        """))
 
         ensure_table(
             conn,
@@ -582,6 +638,30 @@ def initialize_database() -> None:
             "run_id",
             "ALTER TABLE trade_decisions ADD COLUMN IF NOT EXISTS run_id TEXT",
         )
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_trade_decisions_ts_cfg
+            ON trade_decisions(timestamp, config_hash)
+            WHERE config_hash IS NOT NULL
+        """))
+        # Same write-time failure flag as summaries.has_error: /trades filters
+        # failed decider runs through the partial index instead of a text scan.
+        ensure_column(
+            conn,
+            stats,
+            "trade_decisions",
+            "has_error",
+            """
+            ALTER TABLE trade_decisions ADD COLUMN IF NOT EXISTS has_error BOOLEAN
+            GENERATED ALWAYS AS (COALESCE(
+                data::text LIKE '%Max retries reached%'
+                OR data::text LIKE '%API error, no response%', FALSE)) STORED
+            """,
+        )
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_trade_decisions_cfg_id_ok
+            ON trade_decisions(config_hash, id DESC)
+            WHERE NOT has_error
+        """))
 
         ensure_table(
             conn,
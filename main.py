@@ -348,6 +348,16 @@ def initialize_database():
                 data JSONB
             )
         '''))
+        # Failed-call flag the dashboard's /summaries filters on (see init_database.py)
+        conn.execute(text('''
+            ALTER TABLE summaries ADD COLUMN IF NOT EXISTS has_error BOOLEAN
+            GENERATED ALWAYS AS (COALESCE(data::text LIKE '%API error, no response%', FALSE)) STORED
+        '''))
+        conn.execute(text('''
+            CREATE INDEX IF NOT EXISTS idx_summaries_cfg_id_ok
+            ON summaries(config_hash, id DESC)
+            WHERE NOT has_error
+        '''))
 
 def get_openai_summary(agent_name, html_content, image_paths):
     def _safe_format_template(template, values):
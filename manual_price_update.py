@@ -81,17 +81,17 @@ def update_price_manually(ticker, new_price):
         new_gain_loss = new_current_value - total_value
         
         # Update the database
+        # Derive value/P&L per row in SQL: the ticker may be held under several
+        # configs, each with its own shares and cost basis.
         conn.execute(text("""
             UPDATE holdings
             SET current_price = :price,
-                current_value = :current_value,
-                gain_loss = :gain_loss,
+                current_value = shares * :price,
+                gain_loss = (shares * :price) - total_value,
                 current_price_timestamp = :timestamp
             WHERE ticker = :ticker
         """), {
             "price": new_price,
-            "current_value": new_current_value,
-            "gain_loss": new_gain_loss,
             "timestamp": datetime.utcnow(),
             "ticker": ticker
         })
@@ -2,12 +2,53 @@
 Prompt management utilities for using versioned prompts
 """
 
+import os
+import threading
+import time
 import uuid
 
-from sqlalchemy import text
+from sqlalchemy import event as sa_event, text
 from config import engine
 
 
+# Active prompts are read on every agent call but change only when a version is
+# activated. Cache them per (agent_type, config_hash) for a short TTL; activation
+# changes made in this process clear the cache once their transaction ends, and
+# the TTL bounds how long a change made by another process (e.g. the dashboard)
+# can go unseen.
+ACTIVE_PROMPT_CACHE_TTL = float(os.environ.get("DAI_PROMPT_CACHE_TTL", "30"))
+_active_prompt_cache = {}
+_active_prompt_cache_lock = threading.Lock()
+_PENDING_INVALIDATION_KEY = "dai_invalidate_active_prompts"
+
+
+def invalidate_active_prompt_cache():
+    """Drop all cached active prompts so the next read goes to the database."""
+    with _active_prompt_cache_lock:
+        _active_prompt_cache.clear()
+
+
+def _invalidate_on_checkin(dbapi_connection, connection_record):
+    if connection_record is not None and connection_record.info.pop(_PENDING_INVALIDATION_KEY, False):
+        invalidate_active_prompt_cache()
+
+
+def _invalidate_active_prompt_cache_after_commit(conn):
+    """Clear the cache once conn's transaction has committed.
+
+    Clearing inside the transaction lets a concurrent reader refill the cache
+    with the old active row before the commit lands. Connection events fire
+    before the DBAPI commit, so the clear is deferred to pool checkin, which
+    follows the commit (or rollback, where the extra clear is harmless).
+    """
+    if not conn.in_transaction():
+        invalidate_active_prompt_cache()
+        return
+    if not sa_event.contains(conn.engine, "checkin", _invalidate_on_checkin):
+        sa_event.listen(conn.engine, "checkin", _invalidate_on_checkin)
+    conn.connection.info[_PENDING_INVALIDATION_KEY] = True
+
+
 _AGENT_DIR_MAP = {
     "DeciderAgent": "decider",
     "SummarizerAgent": "summarizer",
@@ -101,12 +142,29 @@ def initialize_config_prompts(config_hash):
         
         return True
 
-def get_active_prompt(agent_type):
-    """Get the currently active prompt for an agent type and config"""
+def get_active_prompt(agent_type, config_hash=None):
+    """Get the currently active prompt for an agent type and config (default: the current one)"""
     agent_type = _canonical_agent_type(agent_type)
-    from config import get_current_config_hash
-    config_hash = get_current_config_hash()
-    
+    if config_hash is None:
+        from config import get_current_config_hash
+        config_hash = get_current_config_hash()
+    cache_key = (agent_type, config_hash)
+
+    now = time.monotonic()
+    with _active_prompt_cache_lock:
+        cached = _active_prompt_cache.get(cache_key)
+    if cached and now - cached[0] < ACTIVE_PROMPT_CACHE_TTL:
+        return dict(cached[1])
+
+    payload = _fetch_active_prompt(agent_type, config_hash)
+    if payload:
+        with _active_prompt_cache_lock:
+            _active_prompt_cache[cache_key] = (now, payload)
+        return dict(payload)
+    return payload
+
+def _fetch_active_prompt(agent_type, config_hash):
+    """Load the active prompt from prompt_versions, auto-initializing the config if needed"""
     with engine.connect() as conn:
         # First try to get config-specific prompt
         result = conn.execute(text("""
@@ -314,6 +372,7 @@ def set_active_prompt_version(conn, agent_type, config_hash, version, *,
         from_version=from_version, to_version=version, action=action, actor=actor,
         reason=reason,
     )
+    _invalidate_active_prompt_cache_after_commit(conn)
     return {"agent_type": agent_type, "from_version": from_version,
             "to_version": version, "changed": True, "batch_id": batch_id}
 
@@ -484,4 +543,6 @@ def create_new_prompt_version(agent_type, system_prompt, user_prompt_template, d
             conn, agent_type, config_hash, target_version,
             action="save", actor=created_by, reason=description,
         )
+        # The overwritten row may already have been the active one
+        _invalidate_active_prompt_cache_after_commit(conn)
         return prompt_id
@@ -16,6 +16,7 @@ def dashboard_server_module(monkeypatch):
     class _DummyFlaskApp:
         def __init__(self, *args, **kwargs):
             self.routes = []
+            self.debug = True
 
         def route(self, *args, **kwargs):
             def _decorator(func):
@@ -34,8 +35,24 @@ def dashboard_server_module(monkeypatch):
     flask_stub.render_template = lambda *args, **kwargs: {"template": args[0] if args else None}
     flask_stub.jsonify = lambda *args, **kwargs: {"args": args, "kwargs": kwargs}
     flask_stub.request = types.SimpleNamespace(args={}, json=None, method="GET")
+    flask_stub.Response = lambda *args, **kwargs: {"args": args, "kwargs": kwargs}
+    flask_stub.stream_with_context = lambda generator: generator
     monkeypatch.setitem(sys.modules, "flask", flask_stub)
 
+    flask_json_provider_stub = types.ModuleType("flask.json.provider")
+
+    class _DummyJSONProvider:
+        def __init__(self, app):
+            self._app = app
+
+        @staticmethod
+        def default(obj):
+            raise TypeError(type(obj).__name__)
+
+    flask_json_provider_stub.DefaultJSONProvider = _DummyJSONProvider
+    monkeypatch.setitem(sys.modules, "flask.json", types.ModuleType("flask.json"))
+    monkeypatch.setitem(sys.modules, "flask.json.provider", flask_json_provider_stub)
+
     sqlalchemy_stub = types.ModuleType("sqlalchemy")
     sqlalchemy_stub.text = lambda sql: sql
     monkeypatch.setitem(sys.modules, "sqlalchemy", sqlalchemy_stub)
@@ -48,6 +65,10 @@ def dashboard_server_module(monkeypatch):
     sqlalchemy_exc_stub.IntegrityError = _IntegrityError
     monkeypatch.setitem(sys.modules, "sqlalchemy.exc", sqlalchemy_exc_stub)
 
+    class _DummyResult:
+        def scalar(self):
+            return None
+
     class _DummyConn:
         def __enter__(self):
             return self
@@ -56,7 +77,7 @@ def dashboard_server_module(monkeypatch):
             return False
 
         def execute(self, *_args, **_kwargs):
-            return None
+            return _DummyResult()
 
     class _DummyEngine:
         def begin(self):
@@ -80,6 +101,8 @@ def dashboard_server_module(monkeypatch):
     config_stub.get_prompt_version_config = lambda *_args, **_kwargs: {}
     config_stub.get_trading_mode = lambda: "simulation"
     config_stub.get_current_config_hash = lambda: "test-config-hash"
+    config_stub.load_model_pricing = lambda *_args, **_kwargs: {}
+    config_stub.compute_api_cost = lambda *_args, **_kwargs: 0.0
     config_stub.set_gpt_model = lambda *_args, **_kwargs: None
     config_stub.SCHWAB_ACCOUNT_HASH = "acct-hash"
     config_stub.IS_MARGIN_ACCOUNT = False
@@ -96,6 +119,7 @@ def dashboard_server_module(monkeypatch):
     monkeypatch.setitem(sys.modules, "initialize_prompts", init_prompts_stub)
 
     prompt_manager_stub = types.ModuleType("prompt_manager")
+    prompt_manager_stub.get_active_prompt_emergency_patch = lambda *_args, **_kwargs: None
     prompt_manager_stub.initialize_config_prompts = lambda *_args, **_kwargs: None
     prompt_manager_stub.set_active_prompt_version = lambda *_args, **_kwargs: {}
     prompt_manager_stub.undo_last_prompt_activation = lambda *_args, **_kwargs: {}
@@ -148,6 +172,7 @@ def dashboard_server_module(monkeypatch):
 
     update_prices_stub = types.ModuleType("update_prices")
     update_prices_stub.get_current_price_robust = lambda *_args, **_kwargs: None
+    update_prices_stub.get_current_prices_bulk = lambda *_args, **_kwargs: {}
     monkeypatch.setitem(sys.modules, "update_prices", update_prices_stub)
 
     orchestrator_stub = types.ModuleType("d_ai_trader")
@@ -178,3 +203,101 @@ def test_dashboard_decider_import_bindings(dashboard_server_module):
     assert module.fetch_holdings is decider_stub.fetch_holdings
     assert module.store_momentum_snapshot is decider_stub.store_momentum_snapshot
     assert module.SUMMARY_MAX_CHARS == 7777
+
+
+def test_render_prompt_text_keeps_literal_braces(dashboard_server_module):
+    module, _ = dashboard_server_module
+
+    template = 'Holdings: {holdings}\nReturn {"action": "BUY"} for {ticker} {unknown}'
+    rendered = module._render_prompt_text(template, {"holdings": "AAPL x2", "ticker": "{holdings}"})
+
+    assert rendered == 'Holdings: AAPL x2\nReturn {"action": "BUY"} for {holdings} {unknown}'
+    assert module._render_prompt_text("", {"holdings": "x"}) is None
+
+
+def test_sum_position_totals_skips_cash(dashboard_server_module):
+    module, _ = dashboard_server_module
+
+    positions = [
+        {"ticker": "AAPL", "current_value": 120.0, "total_value": 100.0, "gain_loss": 20.0},
+        {"ticker": "MSFT", "current_value": 45.0, "total_value": 50.0, "gain_loss": -5.0},
+        {"ticker": "CASH", "current_value": 1000.0, "total_value": 1000.0, "gain_loss": 0.0},
+    ]
+
+    assert module._sum_position_totals(positions) == (165.0, 150.0, 15.0)
+    assert module._sum_position_totals([]) == (0.0, 0.0, 0.0)
+
+
+def test_polled_result_reuses_cached_value(dashboard_server_module):
+    module, _ = dashboard_server_module
+    calls = []
+
+    def load():
+        calls.append(1)
+        return ["row"]
+
+    assert module._get_polled_result(("test-key",), load) == ["row"]
+    assert module._get_polled_result(("test-key",), load) == ["row"]
+    assert len(calls) == 1
+
+    module._invalidate_dashboard_cache()
+    module._get_polled_result(("test-key",), load)
+    assert len(calls) == 2
+
+
+def test_polled_result_cache_is_bounded(dashboard_server_module, monkeypatch):
+    module, _ = dashboard_server_module
+    monkeypatch.setattr(module, "POLL_CACHE_MAX_ENTRIES", 3)
+    module._invalidate_dashboard_cache()
+
+    for ticker in ("A", "B", "C", "D", "E"):
+        module._get_polled_result(("history", "cfg", ticker), lambda: [ticker])
+
+    assert list(module._poll_cache) == [
+        ("history", "cfg", "C"),
+        ("history", "cfg", "D"),
+        ("history", "cfg", "E"),
+    ]
+
+
+def test_history_response_cached_after_stream(dashboard_server_module, monkeypatch):
+    module, _ = dashboard_server_module
+    calls = []
+
+    def fake_stream(_statement, _params):
+        calls.append(1)
+        yield '{"a":1}'
+        yield '{"a":2}'
+
+    monkeypatch.setattr(module, "_stream_json_payloads", fake_stream)
+
+    first = module._cached_history_response(("history", "cfg"), None, {})
+    body = "".join(first["args"][0])
+    assert body == '[{"a":1},{"a":2}]\n'
+
+    second = module._cached_history_response(("history", "cfg"), None, {})
+    assert second["args"][0] == body
+    assert len(calls) == 1
+
+    module._invalidate_history_cache()
+    "".join(module._cached_history_response(("history", "cfg"), None, {})["args"][0])
+    assert len(calls) == 2
+
+
+def test_history_response_not_cached_above_row_cap(dashboard_server_module, monkeypatch):
+    module, _ = dashboard_server_module
+    calls = []
+
+    def fake_stream(_statement, _params):
+        calls.append(1)
+        yield from ('{"a":%d}' % i for i in range(3))
+
+    monkeypatch.setattr(module, "_stream_json_payloads", fake_stream)
+    monkeypatch.setattr(module, "HISTORY_CACHE_MAX_ROWS", 2)
+    module._invalidate_history_cache()
+
+    for _ in range(2):
+        body = "".join(module._cached_history_response(("history", "big"), None, {})["args"][0])
+        assert body == '[{"a":0},{"a":1},{"a":2}]\n'
+    assert len(calls) == 2
+    assert ("history", "big") not in module._history_cache
@@ -34,6 +34,10 @@ def _install_config_import_stubs(monkeypatch, *, dotenv_data=None):
             return _DummyConn()
 
     sqlalchemy_stub.create_engine = lambda *_args, **_kwargs: _DummyEngine()
+    sqlalchemy_stub.event = types.SimpleNamespace(listen=lambda *_args, **_kwargs: None)
+    sqlalchemy_stub.make_url = lambda _url: types.SimpleNamespace(
+        get_dialect=lambda: types.SimpleNamespace(driver="psycopg2")
+    )
     sqlalchemy_stub.Column = lambda *_args, **_kwargs: None
     sqlalchemy_stub.Integer = object
     sqlalchemy_stub.String = object
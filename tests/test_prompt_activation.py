@@ -283,3 +283,43 @@ def test_create_new_prompt_version_records_activation_event(pm_env):
     assert len(events) == 1
     assert (events[0].from_version, events[0].to_version) == (12, 13)
     assert events[0].action == "save"
+
+
+def test_get_active_prompt_is_cached_until_activation_changes(pm_env):
+    """Repeat reads come from memory; an activation switch drops the cache."""
+    pm, engine = pm_env
+    _add_version(engine, "DeciderAgent", 0, active=True)
+    _add_version(engine, "DeciderAgent", 13)
+
+    assert pm.get_active_prompt("DeciderAgent")["version"] == 0
+
+    # A write that bypasses the switchboard is not seen while the entry is fresh.
+    with engine.begin() as conn:
+        conn.execute(text("""
+            UPDATE prompt_versions SET system_prompt = 'edited'
+            WHERE agent_type = 'DeciderAgent' AND version = 0
+        """))
+    assert pm.get_active_prompt("DeciderAgent")["system_prompt"] == "sys"
+
+    with engine.begin() as conn:
+        pm.set_active_prompt_version(
+            conn, "DeciderAgent", CFG, 13, action="save", actor="system")
+        # Not cleared until the activation commits, so a concurrent read can't
+        # refill the cache with the old active row.
+        assert pm._active_prompt_cache
+
+    assert pm.get_active_prompt("DeciderAgent")["version"] == 13
+
+
+def test_get_active_prompt_cache_expires_after_ttl(pm_env, monkeypatch):
+    pm, engine = pm_env
+    _add_version(engine, "DeciderAgent", 0, active=True)
+    monkeypatch.setattr(pm, "ACTIVE_PROMPT_CACHE_TTL", 0)
+
+    assert pm.get_active_prompt("DeciderAgent")["system_prompt"] == "sys"
+    with engine.begin() as conn:
+        conn.execute(text("""
+            UPDATE prompt_versions SET system_prompt = 'edited'
+            WHERE agent_type = 'DeciderAgent' AND version = 0
+        """))
+    assert pm.get_active_prompt("DeciderAgent")["system_prompt"] == "edited"
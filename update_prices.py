@@ -9,6 +9,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config import engine
 from sqlalchemy import text
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import yfinance as yf
 
@@ -125,81 +126,129 @@ def get_current_price_robust(ticker):
         print(f"Failed to fetch price for {clean_ticker} (original: {ticker}): {e}")
         return None
 
+def get_current_prices_bulk(tickers, fallback_workers=8):
+    """Fetch last prices for many tickers with one batched yf.download call.
+
+    Returns {ticker: price or None} keyed by the tickers passed in. Symbols the
+    batch comes back without fall back to get_current_price_robust(), run on a
+    small thread pool since each of those is its own round trip.
+    """
+    tickers = list(dict.fromkeys(t for t in tickers if t))
+    symbols = {ticker: clean_ticker_symbol(ticker) for ticker in tickers}
+    download_list = sorted({symbol for symbol in symbols.values() if symbol})
+    prices = {}
+
+    if download_list:
+        try:
+            df = yf.download(
+                download_list, period="5d", interval="1d", prepost=True,
+                group_by="ticker", auto_adjust=True, progress=False, threads=True,
+            )
+            for ticker, symbol in symbols.items():
+                try:
+                    # Multi-symbol (and newer single-symbol) frames are keyed by ticker first
+                    sub = df[symbol] if df.columns.nlevels > 1 else df
+                    closes = sub["Close"].dropna()
+                    if len(closes) > 0 and float(closes.iloc[-1]) > 0:
+                        prices[ticker] = float(closes.iloc[-1])
+                except Exception:
+                    continue
+        except Exception as e:
+            print(f"⚠️  Batched price download failed ({e}); falling back per ticker")
+
+    missing = [ticker for ticker in tickers if ticker not in prices]
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, min(fallback_workers, len(missing)))) as pool:
+            for ticker, price in zip(missing, pool.map(get_current_price_robust, missing)):
+                prices[ticker] = price
+    return prices
+
+
+_SQL_SELECT_ACTIVE_HOLDINGS = text("""
+    SELECT ticker, shares, purchase_price, current_price, total_value
+    FROM holdings
+    WHERE is_active = TRUE AND ticker != 'CASH'
+""")
+
+# Applies every fetched price in one statement. Values are computed per row so a
+# ticker held under several configs gets each row's own shares/cost basis.
+_SQL_BATCH_UPDATE_PRICES = text("""
+    UPDATE holdings AS h
+    SET current_price = v.price,
+        current_value = h.shares * v.price,
+        gain_loss = (h.shares * v.price) - h.total_value,
+        current_price_timestamp = :timestamp
+    FROM unnest(CAST(:tickers AS text[]), CAST(:prices AS float8[])) AS v(ticker, price)
+    WHERE h.ticker = v.ticker
+""")
+
+
 def update_all_prices():
     """Update prices for all active holdings"""
     print("=== Updating Current Prices ===")
     
-    with engine.begin() as conn:
+    with engine.connect() as conn:
         # Get all active holdings
-        result = conn.execute(text("""
-            SELECT ticker, shares, purchase_price, current_price, total_value 
-            FROM holdings 
-            WHERE is_active = TRUE AND ticker != 'CASH'
-        """))
+        result = conn.execute(_SQL_SELECT_ACTIVE_HOLDINGS)
         
         holdings = [dict(row._mapping) for row in result]
         
-        if not holdings:
-            print("No active holdings found to update.")
-            return
+    if not holdings:
+        print("No active holdings found to update.")
+        return
+    
+    print(f"Found {len(holdings)} active holdings to update:")
+    
+    # Fetch outside any transaction, all tickers in one batched download
+    new_prices = get_current_prices_bulk(holding['ticker'] for holding in holdings)
+    updated_count = 0
+    for holding in holdings:
+        ticker = holding['ticker']
+        shares = holding['shares']
+        old_price = holding['current_price']
         
-        print(f"Found {len(holdings)} active holdings to update:")
+        print(f"\nUpdating {ticker}...")
+        print(f"  Current price: ${old_price:.2f}")
         
-        updated_count = 0
-        for holding in holdings:
-            ticker = holding['ticker']
-            shares = holding['shares']
-            old_price = holding['current_price']
-            
-            print(f"\nUpdating {ticker}...")
-            print(f"  Current price: ${old_price:.2f}")
-            
-            # Get new price
-            new_price = get_current_price_robust(ticker)
-            
-            if new_price is None:
-                print(f"  ❌ Could not get price for {ticker}")
-                continue
-            
-            print(f"  New price: ${new_price:.2f}")
-            
-            # Calculate new values
-            new_current_value = shares * new_price
-            new_gain_loss = new_current_value - holding['total_value']
-            
-            # Update the database
-            conn.execute(text("""
-                UPDATE holdings
-                SET current_price = :price,
-                    current_value = :current_value,
-                    gain_loss = :gain_loss,
-                    current_price_timestamp = :timestamp
-                WHERE ticker = :ticker
-            """), {
-                "price": new_price,
-                "current_value": new_current_value,
-                "gain_loss": new_gain_loss,
-                "timestamp": datetime.utcnow(),
-                "ticker": ticker
-            })
-            
-            print(f"  ✅ Updated {ticker}: ${old_price:.2f} → ${new_price:.2f}")
-            print(f"  Current Value: ${new_current_value:.2f}")
-            print(f"  Gain/Loss: ${new_gain_loss:.2f}")
-            
-            updated_count += 1
+        new_price = new_prices.get(ticker)
+        
+        if new_price is None:
+            print(f"  ❌ Could not get price for {ticker}")
+            continue
+        
+        print(f"  New price: ${new_price:.2f}")
         
-        print(f"\n=== Summary ===")
-        print(f"Successfully updated {updated_count} out of {len(holdings)} holdings")
+        # Calculate new values
+        new_current_value = shares * new_price
+        new_gain_loss = new_current_value - holding['total_value']
         
-        if updated_count > 0:
-            # Record portfolio snapshot after price updates
-            try:
-                from dashboard_server import record_portfolio_snapshot
-                record_portfolio_snapshot()
-                print("Portfolio snapshot recorded")
-            except Exception as e:
-                print(f"Failed to record portfolio snapshot: {e}")
+        print(f"  ✅ Updated {ticker}: ${old_price:.2f} → ${new_price:.2f}")
+        print(f"  Current Value: ${new_current_value:.2f}")
+        print(f"  Gain/Loss: ${new_gain_loss:.2f}")
+        
+        updated_count += 1
+    
+    prices = {ticker: price for ticker, price in new_prices.items() if price is not None}
+    if prices:
+        # Update the database
+        with engine.begin() as conn:
+            conn.execute(_SQL_BATCH_UPDATE_PRICES, {
+                "tickers": list(prices),
+                "prices": [float(price) for price in prices.values()],
+                "timestamp": datetime.utcnow(),
+            })
+    
+    print(f"\n=== Summary ===")
+    print(f"Successfully updated {updated_count} out of {len(holdings)} holdings")
+    
+    if updated_count > 0:
+        # Record portfolio snapshot after price updates
+        try:
+            from dashboard_server import record_portfolio_snapshot
+            record_portfolio_snapshot()
+            print("Portfolio snapshot recorded")
+        except Exception as e:
+            print(f"Failed to record portfolio snapshot: {e}")
 
 def show_current_holdings():
     """Show current holdings and their prices"""